@@ -4,10 +4,17 @@ from typing import Generator
 
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.core.metrics import DB_POOL_CHECKOUT_SECONDS
+from app.db.session import SessionLocal, get_engine
 
 
 def get_db() -> Generator[Session, None, None]:
+    """Yield a session that connects on first use rather than up front.
+
+    Price routes wait for an admission slot before touching the database, and a queued
+    request must not sit on a pool connection meanwhile; they call ``checkout`` once admitted.
+    """
+    get_engine()
     db = SessionLocal()
     try:
         yield db
@@ -15,4 +22,10 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-__all__ = ["get_db"]
+def checkout(db: Session) -> None:
+    """Take the session's pool connection now, recording how long the pool made us wait."""
+    with DB_POOL_CHECKOUT_SECONDS.time():
+        db.connection()
+
+
+__all__ = ["checkout", "get_db"]
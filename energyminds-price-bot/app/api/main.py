@@ -1,17 +1,45 @@
 from __future__ import annotations
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from time import perf_counter
+from typing import AsyncIterator, Awaitable, Callable
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
-from app.core.logging import configure_logging
+from app.core.logging import configure_logging, logger, shutdown_logging
+from app.core.metrics import HTTP_REQUEST_SECONDS
+from app.core.profiling import install_profiling
+from app.core.security import correlation_context
+from app.core.timing import install_db_timing, track_request
+from app.db.data_version import start_data_version_watcher
+from app.db.session import dispose_engine, get_engine
 
-from .routers import health, ingest, prices
+from .routers import health, metrics, prices
 
-configure_logging()
+# Cheap listener registration; kept at import so every engine, including test ones, is timed.
+install_db_timing()
 settings = get_settings()
+API_ROLES = ("all", "query")
+if settings.api_role not in API_ROLES:
+    raise ValueError(f"Unknown API_ROLE {settings.api_role!r}; expected one of {API_ROLES}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    configure_logging()
+    watcher = start_data_version_watcher(get_engine())
+    try:
+        yield
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        dispose_engine()
+        shutdown_logging()
+
 
-app = FastAPI(title="EnergyMinds Price Bot", version="1.0.0")
+app = FastAPI(title="EnergyMinds Price Bot", version="1.0.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,11 +49,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+_MARKET_LABELS = {market.value for market in prices.Market}
+
+
+@app.middleware("http")
+async def request_timing(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    with correlation_context(request) as correlation_id, track_request() as timings:
+        start = perf_counter()
+        response = await call_next(request)
+        total_ms = (perf_counter() - start) * 1000
+
+    route = request.scope.get("route")
+    market = request.query_params.get("market", "").upper()
+    HTTP_REQUEST_SECONDS.observe(
+        total_ms / 1000,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        market=market if market in _MARKET_LABELS else "",
+        status=str(response.status_code),
+    )
+
+    response.headers["Server-Timing"] = timings.server_timing(total_ms)
+    response.headers["X-Correlation-ID"] = correlation_id
+    logger.bind(correlation_id=correlation_id, **timings.as_log_fields()).info(
+        "{method} {path} -> {status} in {total_ms:.2f}ms",
+        method=request.method,
+        path=request.url.path,
+        status=response.status_code,
+        total_ms=total_ms,
+    )
+    return response
+
+
 app.include_router(health.router, prefix="/api")
 app.include_router(prices.router, prefix="/api")
-app.include_router(ingest.router, prefix="/api")
+app.include_router(metrics.router, prefix="/api")
+# Query-only replicas (API_ROLE=query) never import or mount the ingest routes.
+if settings.api_role == "all":
+    from .routers import ingest
+
+    app.include_router(ingest.router, prefix="/api")
 
 
 @app.get("/")
 def root() -> dict[str, str]:
     return {"status": "ok"}
+
+
+# Last, so it wraps every route above; a no-op unless PROFILE_TOKEN or PROFILE_SAMPLE_EVERY is set.
+install_profiling(app, settings)
@@ -1,10 +1,26 @@
 from __future__ import annotations
 
+from typing import Any, Dict
+
 from fastapi import APIRouter
 
+from app.core.data_version import data_versions, version_token, versions_watched
+
 router = APIRouter()
 
 
 @router.get("/health")
 def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@router.get("/data-version")
+def data_version() -> Dict[str, Any]:
+    """Cheap poll target for clients that cache answers; served from memory, not the database.
+
+    ``version`` changes after every ingest; ``keys`` maps ``"MARKET:YYYY-MM"`` to its version
+    so clients can drop only the answers for the months that changed. ``watched`` is false when
+    no watcher runs here, so ingests by other workers or ETL jobs will not show up.
+    """
+    versions = data_versions()
+    return {"version": version_token(versions), "keys": versions, "watched": versions_watched()}
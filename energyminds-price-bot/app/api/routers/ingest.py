@@ -2,23 +2,40 @@ from __future__ import annotations
 
 import shutil
 import tempfile
+from importlib import import_module
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List
 
-import pandas as pd
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db
-from app.etl.ingest_dam_snapshot import ingest_dam_snapshot
-from app.etl.ingest_damgdam import ingest_damgdam
-from app.etl.ingest_gdam_snapshot import ingest_gdam_snapshot
-from app.etl.ingest_rtm_snapshot import ingest_rtm_snapshot
+from app.core.config import get_settings
+from app.core.logging import logger
+from app.core.metrics import INGEST_FAILURES
+from app.db.data_version import sync_data_versions
 
 router = APIRouter(tags=["ingest"])
 
+# pandas, openpyxl and the ETL modules load on the first ingest request, not at API import.
+_LOADERS = {
+    "damgdam": "app.etl.ingest_damgdam",
+    "dam_snapshot": "app.etl.ingest_dam_snapshot",
+    "gdam_snapshot": "app.etl.ingest_gdam_snapshot",
+    "rtm_snapshot": "app.etl.ingest_rtm_snapshot",
+}
+
+
+def _loader(ingest_type: str) -> Callable[[Session, Path], None]:
+    module_name = _LOADERS.get(ingest_type)
+    if module_name is None:  # pragma: no cover - defensive
+        raise ValueError(f"Unknown ingest type {ingest_type}")
+    return getattr(import_module(module_name), f"ingest_{ingest_type}")
+
 
 def _detect_ingest_type(path: Path) -> str:
+    import pandas as pd
+
     xls = pd.ExcelFile(path)
     sheets = set(xls.sheet_names)
     if {"DAM", "GDAM"}.issubset(sheets):
@@ -37,17 +54,38 @@ def _detect_ingest_type(path: Path) -> str:
     raise ValueError("Unable to detect workbook type")
 
 
+def _detect_or_count_failure(path: Path) -> str:
+    try:
+        return _detect_ingest_type(path)
+    except Exception:
+        INGEST_FAILURES.inc(file_type="unknown")
+        raise
+
+
 def _ingest(session: Session, path: Path, ingest_type: str) -> None:
-    if ingest_type == "damgdam":
-        ingest_damgdam(session, path)
-    elif ingest_type == "dam_snapshot":
-        ingest_dam_snapshot(session, path)
-    elif ingest_type == "gdam_snapshot":
-        ingest_gdam_snapshot(session, path)
-    elif ingest_type == "rtm_snapshot":
-        ingest_rtm_snapshot(session, path)
-    else:  # pragma: no cover - defensive
-        raise ValueError(f"Unknown ingest type {ingest_type}")
+    _loader(ingest_type)(session, path)
+
+
+def _invalidate_price_cube() -> None:
+    directory = get_settings().price_cube_dir
+    if directory:
+        from app.db.price_cube import invalidate_price_cube
+
+        invalidate_price_cube(directory)
+
+
+def _rebuild_price_cube(session: Session) -> Dict[str, Any]:
+    """Republish the price cube; on failure it stays invalid and queries use the database."""
+    settings = get_settings()
+    if not settings.price_cube_dir:
+        return {}
+    from app.db.price_cube import write_price_cube
+
+    try:
+        return write_price_cube(session, settings.price_cube_dir, settings.price_cube_days)
+    except Exception:
+        logger.exception("Price cube rebuild failed; queries fall back to the database")
+        return {}
 
 
 @router.post("/ingest/file")
@@ -59,13 +97,20 @@ def ingest_file(upload: UploadFile = File(...), db: Session = Depends(get_db)) -
     finally:
         upload.file.close()
 
+    _invalidate_price_cube()
     try:
-        ingest_type = _detect_ingest_type(tmp_path)
+        ingest_type = _detect_or_count_failure(tmp_path)
         _ingest(db, tmp_path, ingest_type)
+        db.commit()
     except Exception as exc:
+        db.rollback()
         raise HTTPException(status_code=400, detail=str(exc))
     finally:
         tmp_path.unlink(missing_ok=True)
+        _rebuild_price_cube(db)
+
+    # Other workers pick the new versions up from their watcher; this one needn't wait.
+    sync_data_versions(db)
 
     return {"status": "ok", "type": ingest_type}
 
@@ -79,12 +124,52 @@ def ingest_batch(path: str, db: Session = Depends(get_db)) -> dict[str, List[str
     processed: List[str] = []
     errors: List[str] = []
 
+    _invalidate_price_cube()
     for file_path in sorted(directory.glob("*.xlsx")):
         try:
-            ingest_type = _detect_ingest_type(file_path)
+            ingest_type = _detect_or_count_failure(file_path)
             _ingest(db, file_path, ingest_type)
+            db.commit()
             processed.append(f"{file_path.name}:{ingest_type}")
         except Exception as exc:  # pragma: no cover - logged at API layer
+            db.rollback()
             errors.append(f"{file_path.name}:{exc}")
 
+    _rebuild_price_cube(db)
+    if processed:
+        sync_data_versions(db)
     return {"processed": processed, "errors": errors}
+
+
+@router.post("/ingest/holidays")
+def ingest_holiday_calendar(path: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Load a holiday calendar (CSV or Excel) from a mounted path for the ``day_type`` price filters."""
+    from app.etl.ingest_holidays import ingest_holidays
+
+    file_path = Path(path)
+    if not file_path.is_file():
+        raise HTTPException(status_code=400, detail="Provided path is not a file")
+    _invalidate_price_cube()
+    try:
+        loaded = ingest_holidays(db, file_path)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        # The cube records the versions it was built at; republish it so the bump doesn't mark it stale.
+        _rebuild_price_cube(db)
+
+    sync_data_versions(db)
+    return {"status": "ok", "holidays": loaded}
+
+
+@router.post("/ingest/price-cube")
+def rebuild_price_cube(db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """Rebuild the memory-mapped price cube from the database, e.g. after a manual load."""
+    if not get_settings().price_cube_dir:
+        raise HTTPException(status_code=400, detail="PRICE_CUBE_DIR is not configured")
+    manifest = _rebuild_price_cube(db)
+    if not manifest:
+        raise HTTPException(status_code=500, detail="Price cube rebuild failed")
+    return manifest
@@ -3,20 +3,58 @@ from __future__ import annotations
 from calendar import monthrange
 from collections import defaultdict
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Sequence, Tuple
+from math import ceil, fsum, sqrt
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import orjson
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Row, Select, and_, extract, func, or_, select
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
+from app.api.deps import checkout, get_db
+from app.core.admission import AdmissionTimeout, QueryTooExpensive, estimate_cost, get_admission_controller
+from app.core.config import get_settings
+from app.core.data_version import month_keys, newer_than
+from app.core.metrics import COALESCED_REQUESTS, PRICE_CUBE_LOOKUPS, PRICE_QUERIES, STATEMENT_TIMEOUTS
+from app.core.singleflight import SingleFlight
+from app.core.timing import current_timings, record_rows, timed
 from app.db import models
+from app.db.resolution import expand_quarters, quarter_slot
+from app.db.session import is_statement_timeout, set_statement_timeout
+from app.db.types import rupees
 
 router = APIRouter(tags=["prices"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _db_with_timeout(setting: str) -> Callable[..., Session]:
+    """``get_db`` with the route's ``statement_timeout`` from the named setting.
+
+    The timeout is only sent once the session connects, i.e. after admission.
+    """
+
+    def dependency(db: Session = Depends(get_db)) -> Session:
+        set_statement_timeout(db, getattr(get_settings(), setting))
+        return db
+
+    return dependency
+
+
+# Interactive lookups (the chatbot's traffic) get a tight limit; range analytics a looser one.
+interactive_db = _db_with_timeout("statement_timeout_ms")
+analytics_db = _db_with_timeout("analytics_statement_timeout_ms")
+
+# ``PriceInputs.date`` shadows the ``date`` type inside the class body.
+DateType = date
+
 
 class Market(str, Enum):
     DAM = "DAM"
@@ -30,31 +68,138 @@ class Aggregate(str, Enum):
     MAX = "max"
 
 
+class DayType(str, Enum):
+    ALL = "all"
+    WEEKDAY = "weekday"
+    WEEKEND = "weekend"
+    HOLIDAY = "holiday"
+
+
 class PriceInputs(BaseModel):
     market: Market
-    date: Optional[date] = None
+    date: Optional[DateType] = None
     month: Optional[str] = None
     start_hour: int
     end_hour: int
     weighted: bool
     aggregate: Aggregate
+    day_type: DayType = DayType.ALL
+    exclude_holidays: bool = False
 
 
 class DailyPriceStat(BaseModel):
     trade_date: date
     price_rs_per_mwh: float
     price_rs_per_kwh: float
-    count: int
+    # Price slots aggregated; ``None`` for exchange-published summaries, which carry no count.
+    count: Optional[int] = None
+
+
+class PriceSource(str, Enum):
+    RAW = "raw"
+    SUMMARY = "summary"
 
 
 class PriceResponse(BaseModel):
     inputs: PriceInputs
     price_rs_per_mwh: float
     price_rs_per_kwh: float
-    count: int
+    # ``None`` when ``source`` is ``summary``: published averages do not say how many slots they cover.
+    count: Optional[int] = None
+    source: PriceSource = PriceSource.RAW
     daily: Optional[List[DailyPriceStat]] = None
 
 
+class RollingInputs(BaseModel):
+    market: Market
+    start: DateType
+    end: DateType
+    window: int
+    start_hour: int
+    end_hour: int
+    weighted: bool
+    aggregate: Aggregate
+
+
+class RollingPriceStat(BaseModel):
+    trade_date: date
+    price_rs_per_mwh: float
+    count: int
+    observations: int
+    rolling_mean_rs_per_mwh: float
+    rolling_std_rs_per_mwh: float
+    rolling_min_rs_per_mwh: float
+    rolling_max_rs_per_mwh: float
+
+
+class RollingResponse(BaseModel):
+    inputs: RollingInputs
+    points: List[RollingPriceStat]
+
+
+class CompareMode(str, Enum):
+    YOY = "yoy"
+    PREVIOUS = "previous"
+
+
+class CompareInputs(BaseModel):
+    market: Market
+    month: str
+    mode: CompareMode
+    periods: int
+    start_hour: int
+    end_hour: int
+    weighted: bool
+    aggregate: Aggregate
+    day_type: DayType = DayType.ALL
+    exclude_holidays: bool = False
+
+
+class ComparisonPoint(BaseModel):
+    month: str
+    offset: int
+    price_rs_per_mwh: Optional[float] = None
+    price_rs_per_kwh: Optional[float] = None
+    # Price slots aggregated; ``None`` for months answered from published summaries (see ``days``).
+    count: Optional[int] = None
+    days: int
+    source: Optional[PriceSource] = None
+    change_rs_per_mwh: Optional[float] = None
+    change_pct: Optional[float] = None
+
+
+class CompareResponse(BaseModel):
+    inputs: CompareInputs
+    points: List[ComparisonPoint]
+
+
+class ResampleInputs(BaseModel):
+    market: Market
+    start: DateType
+    end: DateType
+    minutes: int
+    start_hour: int
+    end_hour: int
+    weighted: bool
+    aggregate: Aggregate
+    day_type: DayType = DayType.ALL
+    exclude_holidays: bool = False
+
+
+class ResampledPoint(BaseModel):
+    trade_date: date
+    block: int
+    start_time: str
+    price_rs_per_mwh: float
+    price_rs_per_kwh: float
+    count: int
+
+
+class ResampleResponse(BaseModel):
+    inputs: ResampleInputs
+    points: List[ResampledPoint]
+
+
 @dataclass
 class PricePoint:
     trade_date: date
@@ -62,12 +207,34 @@ class PricePoint:
     weight: Optional[float]
 
 
+def _daily_stat(trade_date: date, value: float, count: Optional[int]) -> Dict[str, Any]:
+    """Plain-dict ``DailyPriceStat``; responses are serialised directly with orjson."""
+    return {
+        "trade_date": trade_date,
+        "price_rs_per_mwh": round(value, 4),
+        "price_rs_per_kwh": round(value / 1000, 6),
+        "count": count,
+    }
+
+
 def _parse_date(value: Optional[str]) -> Optional[date]:
     if not value:
         return None
     return datetime.strptime(value, "%Y-%m-%d").date()
 
 
+def _parse_range(start_str: str, end_str: str) -> Tuple[date, date]:
+    """Parse a ``start``/``end`` query pair, raising 400 for bad dates or an inverted range."""
+    try:
+        start = _parse_date(start_str)
+        end = _parse_date(end_str)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be YYYY-MM-DD dates")
+    if start is None or end is None or start > end:
+        raise HTTPException(status_code=400, detail="start must be on or before end")
+    return start, end
+
+
 def _parse_month(value: Optional[str]) -> Optional[Tuple[date, date]]:
     if not value:
         return None
@@ -113,58 +280,114 @@ def _aggregate(values: Sequence[float], aggregate: Aggregate, weights: Optional[
     raise HTTPException(status_code=400, detail=f"Unsupported aggregate {aggregate}")
 
 
-def _collect_dam_points(session: Session, start: date, end: date, start_hour: int, end_hour: int) -> List[PricePoint]:
+# ``extract("dow")`` numbers days from 0 (Sunday) to 6 on Postgres and SQLite alike.
+WEEKEND_DOW = (0, 6)
+
+
+def _calendar_filters(day_type: DayType, exclude_holidays: bool) -> List[Any]:
+    """Conditions on ``market_day.trade_date`` so only matching days are read and aggregated."""
+    trade_date = models.MarketDay.trade_date
+    holidays = select(models.Holiday.holiday_date)
+    filters: List[Any] = []
+    if day_type == DayType.WEEKDAY:
+        filters.append(extract("dow", trade_date).not_in(WEEKEND_DOW))
+    elif day_type == DayType.WEEKEND:
+        filters.append(extract("dow", trade_date).in_(WEEKEND_DOW))
+    elif day_type == DayType.HOLIDAY:
+        filters.append(trade_date.in_(holidays))
+    if exclude_holidays:
+        filters.append(trade_date.not_in(holidays))
+    return filters
+
+
+def _fetch_rows(session: Session, stmt: Select) -> Sequence[Row]:
+    try:
+        result = session.execute(stmt)
+        with timed("fetch"):
+            rows = result.all()
+    except OperationalError as exc:
+        if not is_statement_timeout(exc):
+            raise
+        STATEMENT_TIMEOUTS.inc()
+        # 504 rather than 503: the same query would be cancelled again, so clients must not retry it.
+        raise HTTPException(status_code=504, detail="Query exceeded its time limit; narrow the date range or hours")
+    record_rows(len(rows))
+    return rows
+
+
+def _collect_dam_points(
+    session: Session, start: date, end: date, start_hour: int, end_hour: int, day_filters: Sequence[Any] = ()
+) -> List[PricePoint]:
     stmt = (
-        select(models.MarketDay.trade_date, models.DamPrice.hour_block, models.DamPrice.mcp_rs_per_mwh)
+        select(models.MarketDay.trade_date, models.DamPrice.hour_block, rupees(models.DamPrice.mcp_rs_per_mwh))
         .join(models.DamPrice)
         .where(
             models.MarketDay.market == Market.DAM.value,
             models.MarketDay.trade_date.between(start, end),
             models.DamPrice.hour_block >= start_hour,
             models.DamPrice.hour_block < end_hour,
+            *day_filters,
         )
         .order_by(models.MarketDay.trade_date, models.DamPrice.hour_block)
     )
     results = []
-    for trade_date, _, value in session.execute(stmt):
-        results.append(PricePoint(trade_date=trade_date, value=float(value), weight=None))
+    for trade_date, _, value in _fetch_rows(session, stmt):
+        results.append(PricePoint(trade_date=trade_date, value=value, weight=None))
     return results
 
 
-def _collect_gdam_points(session: Session, start: date, end: date, start_hour: int, end_hour: int, weighted: bool) -> List[PricePoint]:
+def _collect_gdam_points(
+    session: Session,
+    start: date,
+    end: date,
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    day_filters: Sequence[Any] = (),
+) -> List[PricePoint]:
     quarter_range = _hour_range_to_quarters(start_hour, end_hour)
+    quarter = quarter_slot(models.GdamPrice)
+    stmt = select(
+        models.MarketDay.trade_date,
+        quarter,
+        rupees(models.GdamPrice.mcp_rs_per_mwh),
+        models.GdamPrice.scheduled_volume_mw,
+        models.GdamPrice.hydro_fsv_mw,
+    )
     stmt = (
-        select(
-            models.MarketDay.trade_date,
-            models.GdamPrice.quarter_index,
-            models.GdamPrice.mcp_rs_per_mwh,
-            models.GdamPrice.scheduled_volume_mw,
-            models.GdamPrice.hydro_fsv_mw,
-        )
-        .join(models.GdamPrice)
+        _join_market_slots(stmt, Market.GDAM)
         .where(
             models.MarketDay.market == Market.GDAM.value,
             models.MarketDay.trade_date.between(start, end),
-            models.GdamPrice.quarter_index.in_(list(quarter_range)),
+            quarter.in_(list(quarter_range)),
+            *day_filters,
         )
-        .order_by(models.MarketDay.trade_date, models.GdamPrice.quarter_index)
+        .order_by(models.MarketDay.trade_date, quarter)
     )
     points: List[PricePoint] = []
-    for trade_date, _, value, scheduled, hydro in session.execute(stmt):
+    for trade_date, _, value, scheduled, hydro in _fetch_rows(session, stmt):
         weight = None
         if weighted:
-            weight = float(scheduled) if scheduled is not None else float(hydro) if hydro is not None else None
-        points.append(PricePoint(trade_date=trade_date, value=float(value), weight=weight))
+            weight = scheduled if scheduled is not None else hydro
+        points.append(PricePoint(trade_date=trade_date, value=value, weight=weight))
     return points
 
 
-def _collect_rtm_points(session: Session, start: date, end: date, start_hour: int, end_hour: int, weighted: bool) -> List[PricePoint]:
+def _collect_rtm_points(
+    session: Session,
+    start: date,
+    end: date,
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    day_filters: Sequence[Any] = (),
+) -> List[PricePoint]:
     quarter_range = _hour_range_to_quarters(start_hour, end_hour)
     stmt = (
         select(
             models.MarketDay.trade_date,
             models.RtmPrice.quarter_index,
-            models.RtmPrice.mcp_rs_per_mwh,
+            rupees(models.RtmPrice.mcp_rs_per_mwh),
             models.RtmPrice.fsv_mw,
         )
         .join(models.RtmPrice)
@@ -172,13 +395,14 @@ def _collect_rtm_points(session: Session, start: date, end: date, start_hour: in
             models.MarketDay.market == Market.RTM.value,
             models.MarketDay.trade_date.between(start, end),
             models.RtmPrice.quarter_index.in_(list(quarter_range)),
+            *day_filters,
         )
         .order_by(models.MarketDay.trade_date, models.RtmPrice.quarter_index)
     )
     points: List[PricePoint] = []
-    for trade_date, _, value, fsv in session.execute(stmt):
-        weight = float(fsv) if weighted and fsv is not None else None
-        points.append(PricePoint(trade_date=trade_date, value=float(value), weight=weight))
+    for trade_date, _, value, fsv in _fetch_rows(session, stmt):
+        weight = fsv if weighted else None
+        points.append(PricePoint(trade_date=trade_date, value=value, weight=weight))
     return points
 
 
@@ -190,16 +414,281 @@ def _collect_points(
     start_hour: int,
     end_hour: int,
     weighted: bool,
+    day_filters: Sequence[Any] = (),
 ) -> List[PricePoint]:
     if market == Market.DAM:
-        return _collect_dam_points(session, start, end, start_hour, end_hour)
+        return _collect_dam_points(session, start, end, start_hour, end_hour, day_filters)
     if market == Market.GDAM:
-        return _collect_gdam_points(session, start, end, start_hour, end_hour, weighted)
+        return _collect_gdam_points(session, start, end, start_hour, end_hour, weighted, day_filters)
     if market == Market.RTM:
-        return _collect_rtm_points(session, start, end, start_hour, end_hour, weighted)
+        return _collect_rtm_points(session, start, end, start_hour, end_hour, weighted, day_filters)
     raise HTTPException(status_code=400, detail=f"Unsupported market {market}")
 
 
+# Markets whose workbooks carry exchange-published window averages.
+SUMMARY_MARKETS = frozenset({Market.DAM, Market.GDAM})
+
+
+def _summary_label(start_hour: int, end_hour: int) -> str:
+    """Label ``ingest_damgdam`` stores for the exchange-published average of a window."""
+    if start_hour == 0 and end_hour == 24:
+        return "RTC"
+    return f"Avg.({start_hour:02d}-{end_hour:02d})"
+
+
+def _collect_summary_stats(
+    session: Session,
+    market: Market,
+    start: date,
+    end: date,
+    start_hour: int,
+    end_hour: int,
+    day_filters: Sequence[Any] = (),
+) -> Optional[List[Dict[str, Any]]]:
+    """Return published window averages for every trading day in range, or ``None``.
+
+    A range is only answered from summaries when each trading day carries the label, so
+    partially covered months still go through raw aggregation.
+    """
+    if market not in SUMMARY_MARKETS:
+        return None
+    stmt = (
+        select(models.MarketDay.trade_date, models.MarketSummary.value)
+        .outerjoin(
+            models.MarketSummary,
+            and_(
+                models.MarketSummary.market_day_id == models.MarketDay.id,
+                models.MarketSummary.label == _summary_label(start_hour, end_hour),
+            ),
+        )
+        .where(
+            models.MarketDay.market == market.value,
+            models.MarketDay.trade_date.between(start, end),
+            *day_filters,
+        )
+        .order_by(models.MarketDay.trade_date)
+    )
+    rows = _fetch_rows(session, stmt)
+    if not rows or any(value is None for _, value in rows):
+        return None
+    return [_daily_stat(trade_date, value, None) for trade_date, value in rows]
+
+
+def _cube_stats(
+    market: Market,
+    start: date,
+    end: date,
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    aggregate: Aggregate,
+) -> Optional[Tuple[PriceSource, List[Dict[str, Any]]]]:
+    """Answer from the memory-mapped price cube when ``PRICE_CUBE_DIR`` is set and it covers the range."""
+    directory = get_settings().price_cube_dir
+    if not directory:
+        return None
+    # numpy and the cube module load on first use, so API startup does not pay for them.
+    from app.db.price_cube import get_price_cube_store
+
+    cube = get_price_cube_store(directory).get()
+    if cube is None:
+        return None
+    if newer_than(cube.versions, month_keys(market.value, start, end)):
+        # Only months written since the cube was built go to the database.
+        PRICE_CUBE_LOOKUPS.inc(result="stale")
+        return None
+    with timed("cube"):
+        label = None
+        if aggregate == Aggregate.AVG and not weighted and market in SUMMARY_MARKETS:
+            label = _summary_label(start_hour, end_hour)
+        window = cube.window(market.value, start, end, start_hour, end_hour, weighted, aggregate.value, label)
+    if window is None:
+        PRICE_CUBE_LOOKUPS.inc(result="uncovered")
+        return None
+    PRICE_CUBE_LOOKUPS.inc(result="hit")
+    source = PriceSource.SUMMARY if window.summary else PriceSource.RAW
+    return source, [_daily_stat(*stat) for stat in zip(window.dates, window.values, window.counts)]
+
+
+def _shift_month(month_start: date, months: int) -> date:
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _comparison_months(anchor: date, mode: CompareMode, periods: int) -> List[date]:
+    """First day of the anchor month, then of each month it is compared against."""
+    step = -12 if mode == CompareMode.YOY else -1
+    return [_shift_month(anchor, step * offset) for offset in range(periods + 1)]
+
+
+def _month_stat(value: float, count: Optional[int], days: int, source: PriceSource) -> Dict[str, Any]:
+    return {
+        "price_rs_per_mwh": round(value, 4),
+        "price_rs_per_kwh": round(value / 1000, 6),
+        "count": count,
+        "days": days,
+        "source": source,
+    }
+
+
+def _in_months(months: Sequence[date]) -> Any:
+    """``trade_date`` falls in one of ``months`` (given by their first day)."""
+    trade_date = models.MarketDay.trade_date
+    return or_(*(trade_date.between(month, _shift_month(month, 1) - timedelta(days=1)) for month in months))
+
+
+def _summary_month_stats(
+    session: Session,
+    market: Market,
+    months: Sequence[date],
+    start_hour: int,
+    end_hour: int,
+    day_filters: Sequence[Any],
+) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """Months of ``months`` where every trading day has the window's published summary.
+
+    Driven from ``market_day`` and ``market_summary`` alone, so covered months never read
+    price rows and months without raw rows in the window are still answered.
+    """
+    trade_date = models.MarketDay.trade_date
+    year = extract("year", trade_date)
+    month = extract("month", trade_date)
+    stmt = (
+        select(
+            year.label("year"),
+            month.label("month"),
+            func.avg(models.MarketSummary.value).label("value"),
+            func.count().label("days"),
+            func.count(models.MarketSummary.value).label("summary_days"),
+        )
+        .outerjoin(
+            models.MarketSummary,
+            and_(
+                models.MarketSummary.market_day_id == models.MarketDay.id,
+                models.MarketSummary.label == _summary_label(start_hour, end_hour),
+            ),
+        )
+        .where(models.MarketDay.market == market.value, _in_months(months), *day_filters)
+        .group_by(year, month)
+    )
+    stats: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for row in _fetch_rows(session, stmt):
+        days = int(row.days)
+        if row.summary_days == days:
+            stats[(int(row.year), int(row.month))] = _month_stat(float(row.value), None, days, PriceSource.SUMMARY)
+    return stats
+
+
+def _comparison_stats(
+    session: Session,
+    market: Market,
+    months: Sequence[date],
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    aggregate: Aggregate,
+    day_filters: Sequence[Any],
+) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """Per-month ``/api/prices`` figures for ``months``, keyed by ``(year, month)``.
+
+    Unweighted DAM/GDAM averages come from published summaries for every month whose days all
+    have one, like a month query does. Only the remaining months are aggregated from raw rows,
+    in one grouped query that combines daily values the same way.
+    """
+    stats: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    if aggregate == Aggregate.AVG and not weighted and market in SUMMARY_MARKETS:
+        stats = _summary_month_stats(session, market, months, start_hour, end_hour, day_filters)
+    raw_months = [month for month in months if (month.year, month.month) not in stats]
+    if not raw_months:
+        return stats
+
+    start = min(raw_months)
+    end = _shift_month(max(raw_months), 1) - timedelta(days=1)
+    filters = [*day_filters, _in_months(raw_months)]
+    daily = _daily_window_stmt(
+        market, start, end, start_hour, end_hour, weighted, aggregate, filters
+    ).subquery("daily")
+    if aggregate == Aggregate.MIN:
+        value_expr = func.min(daily.c.value)
+    elif aggregate == Aggregate.MAX:
+        value_expr = func.max(daily.c.value)
+    else:
+        value_expr = func.avg(daily.c.value)
+    year = extract("year", daily.c.trade_date)
+    month = extract("month", daily.c.trade_date)
+    stmt = select(
+        year.label("year"),
+        month.label("month"),
+        value_expr.label("value"),
+        func.sum(daily.c.count).label("count"),
+        func.count().label("days"),
+    ).group_by(year, month)
+    for row in _fetch_rows(session, stmt):
+        stats[(int(row.year), int(row.month))] = _month_stat(
+            float(row.value), int(row.count), int(row.days), PriceSource.RAW
+        )
+    return stats
+
+
+# Months without trading days stay in the series so offsets line up across markets.
+_NO_COMPARISON_DATA: Dict[str, Any] = {
+    "price_rs_per_mwh": None,
+    "price_rs_per_kwh": None,
+    "count": 0,
+    "days": 0,
+    "source": None,
+}
+
+
+def _compare_payload(
+    session: Session,
+    market: Market,
+    month_str: str,
+    anchor: date,
+    mode: CompareMode,
+    periods: int,
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    aggregate: Aggregate,
+    day_type: DayType,
+    exclude_holidays: bool,
+) -> Dict[str, Any]:
+    months = _comparison_months(anchor, mode, periods)
+    day_filters = _calendar_filters(day_type, exclude_holidays)
+    stats = _comparison_stats(session, market, months, start_hour, end_hour, weighted, aggregate, day_filters)
+    if not stats:
+        raise HTTPException(status_code=404, detail="No data found for requested window")
+
+    anchor_price = stats.get((anchor.year, anchor.month), _NO_COMPARISON_DATA)["price_rs_per_mwh"]
+    points: List[Dict[str, Any]] = []
+    for offset, month_start in enumerate(months):
+        stat = stats.get((month_start.year, month_start.month), _NO_COMPARISON_DATA)
+        point = {"month": f"{month_start:%Y-%m}", "offset": -offset, **stat}
+        price = stat["price_rs_per_mwh"]
+        point["change_rs_per_mwh"] = point["change_pct"] = None
+        if offset and anchor_price is not None and price is not None:
+            point["change_rs_per_mwh"] = round(anchor_price - price, 4)
+            point["change_pct"] = round((anchor_price - price) / price * 100, 4) if price else None
+        points.append(point)
+
+    return {
+        "inputs": {
+            "market": market,
+            "month": month_str,
+            "mode": mode,
+            "periods": periods,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+            "weighted": weighted,
+            "aggregate": aggregate,
+            "day_type": day_type,
+            "exclude_holidays": exclude_holidays,
+        },
+        "points": points,
+    }
+
+
 def _group_by_date(points: Sequence[PricePoint]) -> Dict[date, List[PricePoint]]:
     grouped: Dict[date, List[PricePoint]] = defaultdict(list)
     for point in points:
@@ -213,84 +702,665 @@ def _summarise_day(points: Sequence[PricePoint], aggregate: Aggregate, weighted:
     return _aggregate(values, aggregate, weights), len(values)
 
 
-@router.get("/prices", response_model=PriceResponse)
-def get_prices(
-    market: Market = Query(..., description="Market type"),
-    date_str: Optional[str] = Query(None, alias="date"),
-    month_str: Optional[str] = Query(None, alias="month"),
-    start_hour: int = Query(0, ge=0, le=23),
-    end_hour: int = Query(24, ge=1, le=24),
-    weighted: bool = Query(False),
-    aggregate: Aggregate = Query(Aggregate.AVG),
-    db: Session = Depends(get_db),
-) -> PriceResponse:
-    _validate_hours(start_hour, end_hour)
+def _market_slot_columns(
+    market: Market, start_hour: int, end_hour: int
+) -> Tuple[Any, Any, Any, List[Any], Optional[Any]]:
+    """Return the price table, slot index, value column, slot filters and weight column for ``market``.
 
-    if date_str and month_str:
-        raise HTTPException(status_code=400, detail="Provide either date or month, not both")
+    GDAM slots are the expanded quarters of ``_join_market_slots``.
+    """
+    if market == Market.DAM:
+        table = models.DamPrice
+        filters = [table.hour_block >= start_hour, table.hour_block < end_hour]
+        return table, table.hour_block, rupees(table.mcp_rs_per_mwh), filters, None
+    if market == Market.GDAM:
+        table = models.GdamPrice
+        slot = quarter_slot(table)
+        filters = [slot.in_(list(_hour_range_to_quarters(start_hour, end_hour)))]
+        weight = func.coalesce(table.scheduled_volume_mw, table.hydro_fsv_mw)
+        return table, slot, rupees(table.mcp_rs_per_mwh), filters, weight
+    if market == Market.RTM:
+        table = models.RtmPrice
+        filters = [table.quarter_index.in_(list(_hour_range_to_quarters(start_hour, end_hour)))]
+        return table, table.quarter_index, rupees(table.mcp_rs_per_mwh), filters, table.fsv_mw
+    raise HTTPException(status_code=400, detail=f"Unsupported market {market}")
 
-    date_value = _parse_date(date_str)
-    month_range = _parse_month(month_str)
 
-    if not date_value and not month_range:
-        raise HTTPException(status_code=400, detail="date or month is required")
+def _join_market_slots(stmt: Select, market: Market) -> Select:
+    """Join ``market``'s price table, expanding hourly-stored GDAM days into quarters."""
+    table, *_ = _market_slot_columns(market, 0, 24)
+    stmt = stmt.join(table)
+    return expand_quarters(stmt) if market == Market.GDAM else stmt
 
-    if date_value:
-        start = end = date_value
-    else:
-        start, end = month_range  # type: ignore[misc]
 
-    points = _collect_points(db, market, start, end, start_hour, end_hour, weighted)
-    if not points:
+def _slot_aggregate(value_col: Any, weight_col: Optional[Any], weighted: bool, aggregate: Aggregate) -> Any:
+    """SQL aggregate of price slots in a group.
+
+    Mirrors ``_summarise_day``: weighted averages treat missing weights as zero and fall back
+    to the plain mean when a group carries no weight at all.
+    """
+    if aggregate == Aggregate.MIN:
+        return func.min(value_col)
+    if aggregate == Aggregate.MAX:
+        return func.max(value_col)
+    if weighted and weight_col is not None:
+        weight = func.coalesce(weight_col, 0)
+        return func.coalesce(func.sum(value_col * weight) / func.nullif(func.sum(weight), 0), func.avg(value_col))
+    return func.avg(value_col)
+
+
+def _daily_window_stmt(
+    market: Market,
+    start: date,
+    end: date,
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    aggregate: Aggregate,
+    day_filters: Sequence[Any] = (),
+) -> Select:
+    """Build a ``(trade_date, value, count)`` select with one row per trading day."""
+    _, _, value_col, slot_filters, weight_col = _market_slot_columns(market, start_hour, end_hour)
+    stmt = select(
+        models.MarketDay.trade_date.label("trade_date"),
+        _slot_aggregate(value_col, weight_col, weighted, aggregate).label("value"),
+        func.count(value_col).label("count"),
+    )
+    return (
+        _join_market_slots(stmt, market)
+        .where(
+            models.MarketDay.market == market.value,
+            models.MarketDay.trade_date.between(start, end),
+            *slot_filters,
+            *day_filters,
+        )
+        .group_by(models.MarketDay.trade_date)
+    )
+
+
+# Minutes per stored slot: DAM rows are hours, GDAM/RTM rows are quarter-hours.
+NATIVE_MINUTES = {Market.DAM: 60, Market.GDAM: 15, Market.RTM: 15}
+
+
+def _validate_resolution(market: Market, minutes: int) -> None:
+    if minutes % 15 or 1440 % minutes:
+        raise HTTPException(
+            status_code=400, detail="minutes must be a multiple of 15 that divides the day, e.g. 15, 30, 60, 240"
+        )
+    native = NATIVE_MINUTES[market]
+    if native % minutes and minutes % native:
+        # A block would split a stored slot between two blocks.
+        detail = f"{market.value} blocks must divide or span whole {native}-minute slots"
+        raise HTTPException(status_code=400, detail=detail)
+
+
+def _validate_block_window(minutes: int, start_hour: int, end_hour: int) -> None:
+    """Reject hour windows that would cut the first or last block short."""
+    if (start_hour * 60) % minutes or (end_hour * 60) % minutes:
+        detail = f"start_hour and end_hour must fall on {minutes}-minute block boundaries"
+        raise HTTPException(status_code=400, detail=detail)
+
+
+def _resample_stmt(
+    market: Market,
+    start: date,
+    end: date,
+    minutes: int,
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    aggregate: Aggregate,
+    day_filters: Sequence[Any] = (),
+) -> Select:
+    """``(trade_date, block, value, count)`` rows on a grid of ``max(minutes, native)`` blocks.
+
+    Integer division of the slot's start minute maps quarters (or DAM hours) to their block, so
+    every block is aggregated in one grouped pass.
+    """
+    _, slot_col, value_col, slot_filters, weight_col = _market_slot_columns(market, start_hour, end_hour)
+    native = NATIVE_MINUTES[market]
+    block = (slot_col * native // max(minutes, native)).label("block")
+    stmt = select(
+        models.MarketDay.trade_date.label("trade_date"),
+        block,
+        _slot_aggregate(value_col, weight_col, weighted, aggregate).label("value"),
+        func.count(value_col).label("count"),
+    )
+    return (
+        _join_market_slots(stmt, market)
+        .where(
+            models.MarketDay.market == market.value,
+            models.MarketDay.trade_date.between(start, end),
+            *slot_filters,
+            *day_filters,
+        )
+        .group_by(models.MarketDay.trade_date, block)
+        .order_by(models.MarketDay.trade_date, block)
+    )
+
+
+def _resample_payload(
+    session: Session,
+    market: Market,
+    start: date,
+    end: date,
+    minutes: int,
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    aggregate: Aggregate,
+    day_type: DayType,
+    exclude_holidays: bool,
+) -> Dict[str, Any]:
+    day_filters = _calendar_filters(day_type, exclude_holidays)
+    stmt = _resample_stmt(market, start, end, minutes, start_hour, end_hour, weighted, aggregate, day_filters)
+    rows = _fetch_rows(session, stmt)
+    if not rows:
         raise HTTPException(status_code=404, detail="No data found for requested window")
 
-    grouped = _group_by_date(points)
-    daily_stats: List[DailyPriceStat] = []
-    for trade_date, items in sorted(grouped.items()):
-        agg_value, count = _summarise_day(items, aggregate, weighted)
-        daily_stats.append(
-            DailyPriceStat(
-                trade_date=trade_date,
-                price_rs_per_mwh=round(agg_value, 4),
-                price_rs_per_kwh=round(agg_value / 1000, 6),
-                count=count,
-            )
+    # Finer than the stored resolution (DAM below an hour): each block repeats its hour's price.
+    repeat = max(NATIVE_MINUTES[market] // minutes, 1)
+    points: List[Dict[str, Any]] = []
+    with timed("aggregate"):
+        for trade_date, stored_block, value, count in rows:
+            stat = _daily_stat(trade_date, value, count)
+            for block in range(stored_block * repeat, (stored_block + 1) * repeat):
+                start_minute = block * minutes
+                points.append(
+                    {
+                        "trade_date": trade_date,
+                        "block": block,
+                        "start_time": f"{start_minute // 60:02d}:{start_minute % 60:02d}",
+                        "price_rs_per_mwh": stat["price_rs_per_mwh"],
+                        "price_rs_per_kwh": stat["price_rs_per_kwh"],
+                        "count": count,
+                    }
+                )
+
+    return {
+        "inputs": {
+            "market": market,
+            "start": start,
+            "end": end,
+            "minutes": minutes,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+            "weighted": weighted,
+            "aggregate": aggregate,
+            "day_type": day_type,
+            "exclude_holidays": exclude_holidays,
+        },
+        "points": points,
+    }
+
+
+# Calendar days scanned per trading day of rolling lookback. Markets trade daily, so three
+# times the window tolerates long gaps; a sparser history only shortens the first windows,
+# which their ``observations`` report.
+LOOKBACK_DAYS_PER_TRADING_DAY = 3
+
+
+def _lookback_start(start: date, window: int) -> date:
+    """Earliest date whose rows can fall inside the first window ending on or after ``start``."""
+    return start - timedelta(days=(window - 1) * LOOKBACK_DAYS_PER_TRADING_DAY)
+
+
+def _sample_std(values: Sequence[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+    mean = fsum(values) / len(values)
+    return sqrt(fsum((value - mean) ** 2 for value in values) / (len(values) - 1))
+
+
+def _rolling_stats(
+    session: Session,
+    market: Market,
+    start: date,
+    end: date,
+    window: int,
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    aggregate: Aggregate,
+) -> List[Dict[str, Any]]:
+    # Windows count trading-day rows; one statement reads a bounded lookback before ``start``
+    # and the frames reach back into it, then rows before ``start`` are dropped here.
+    lookback = _lookback_start(start, window)
+    daily = _daily_window_stmt(market, lookback, end, start_hour, end_hour, weighted, aggregate).cte("daily")
+    frame = {"order_by": daily.c.trade_date, "rows": (-(window - 1), 0)}
+    stmt = select(
+        daily.c.trade_date,
+        daily.c.value,
+        daily.c.count,
+        func.count(daily.c.value).over(**frame).label("observations"),
+        func.avg(daily.c.value).over(**frame).label("mean"),
+        func.min(daily.c.value).over(**frame).label("min"),
+        func.max(daily.c.value).over(**frame).label("max"),
+    ).order_by(daily.c.trade_date)
+
+    rows = _fetch_rows(session, stmt)
+    values = [float(row.value) for row in rows]
+    stats: List[Dict[str, Any]] = []
+    for index, row in enumerate(rows):
+        if row.trade_date < start:
+            continue
+        # Two-pass deviation in Python: SQLite has no stddev_samp, and avg(x*x) - avg(x)^2
+        # cancels catastrophically at MCP magnitudes.
+        std = _sample_std(values[max(index - window + 1, 0) : index + 1])
+        stats.append(
+            {
+                "trade_date": row.trade_date,
+                "price_rs_per_mwh": round(values[index], 4),
+                "count": int(row.count),
+                "observations": int(row.observations),
+                "rolling_mean_rs_per_mwh": round(float(row.mean), 4),
+                "rolling_std_rs_per_mwh": round(std, 4),
+                "rolling_min_rs_per_mwh": round(float(row.min), 4),
+                "rolling_max_rs_per_mwh": round(float(row.max), 4),
+            }
         )
+    return stats
+
+
+def _price_payload(
+    session: Session,
+    market: Market,
+    date_value: Optional[date],
+    month_str: Optional[str],
+    start: date,
+    end: date,
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    aggregate: Aggregate,
+    day_type: DayType = DayType.ALL,
+    exclude_holidays: bool = False,
+) -> Dict[str, Any]:
+    """Compute the ``PriceResponse`` body for an already validated query."""
+    source = PriceSource.RAW
+    summary_stats: Optional[List[Dict[str, Any]]] = None
+    day_filters = _calendar_filters(day_type, exclude_holidays)
+    cube_stats = None
+    if not day_filters:
+        # The cube has no calendar; filtered queries go to the database.
+        cube_stats = _cube_stats(market, start, end, start_hour, end_hour, weighted, aggregate)
+    if cube_stats is None and aggregate == Aggregate.AVG and not weighted:
+        summary_stats = _collect_summary_stats(session, market, start, end, start_hour, end_hour, day_filters)
+
+    if cube_stats is not None:
+        source, daily_stats = cube_stats
+        if not daily_stats:
+            raise HTTPException(status_code=404, detail="No data found for requested window")
+    elif summary_stats:
+        source = PriceSource.SUMMARY
+        daily_stats = summary_stats
+    else:
+        points = _collect_points(session, market, start, end, start_hour, end_hour, weighted, day_filters)
+        if not points:
+            raise HTTPException(status_code=404, detail="No data found for requested window")
+
+        with timed("aggregate"):
+            grouped = _group_by_date(points)
+            daily_stats = []
+            for trade_date, items in sorted(grouped.items()):
+                agg_value, count = _summarise_day(items, aggregate, weighted)
+                daily_stats.append(_daily_stat(trade_date, agg_value, count))
+
+    PRICE_QUERIES.inc(market=market.value, source=source.value)
 
     if date_value:
         overall = daily_stats[0]
     else:
-        overall_values = [stat.price_rs_per_mwh for stat in daily_stats]
+        overall_values = [stat["price_rs_per_mwh"] for stat in daily_stats]
         if aggregate == Aggregate.AVG:
             overall_value = sum(overall_values) / len(overall_values)
         elif aggregate == Aggregate.MIN:
             overall_value = min(overall_values)
         else:
             overall_value = max(overall_values)
-        overall_count = sum(stat.count for stat in daily_stats)
-        overall = DailyPriceStat(
-            trade_date=end,
-            price_rs_per_mwh=round(overall_value, 4),
-            price_rs_per_kwh=round(overall_value / 1000, 6),
-            count=overall_count,
-        )
+        counts = [stat["count"] for stat in daily_stats]
+        overall_count = None if None in counts else sum(counts)
+        overall = _daily_stat(end, overall_value, overall_count)
+
+    return {
+        "inputs": {
+            "market": market,
+            "date": date_value,
+            "month": month_str,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+            "weighted": weighted,
+            "aggregate": aggregate,
+            "day_type": day_type,
+            "exclude_holidays": exclude_holidays,
+        },
+        "price_rs_per_mwh": overall["price_rs_per_mwh"],
+        "price_rs_per_kwh": overall["price_rs_per_kwh"],
+        "count": overall["count"],
+        "source": source,
+        "daily": daily_stats if not date_value else None,
+    }
+
+
+def _rolling_payload(
+    session: Session,
+    market: Market,
+    start: date,
+    end: date,
+    window: int,
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    aggregate: Aggregate,
+) -> Dict[str, Any]:
+    points = _rolling_stats(session, market, start, end, window, start_hour, end_hour, weighted, aggregate)
+    if not points:
+        raise HTTPException(status_code=404, detail="No data found for requested window")
+
+    return {
+        "inputs": {
+            "market": market,
+            "start": start,
+            "end": end,
+            "window": window,
+            "start_hour": start_hour,
+            "end_hour": end_hour,
+            "weighted": weighted,
+            "aggregate": aggregate,
+        },
+        "points": points,
+    }
+
+
+# Identical concurrent queries (e.g. dashboards polling right after an ingest) share one
+# computation; followers get the leader's payload or exception.
+_price_flight: SingleFlight[Dict[str, Any]] = SingleFlight()
+
+
+def _admitted(route: str, cost: int, session: Session, compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        with get_admission_controller().admit(route, cost):
+            # The session has not connected yet, so a queued request held no pool connection.
+            checkout(session)
+            return compute()
+    except QueryTooExpensive as exc:
+        detail = f"Query too expensive ({exc}); narrow the date range or hours"
+        raise HTTPException(status_code=400, detail=detail)
+    except AdmissionTimeout as exc:
+        headers = {"Retry-After": str(ceil(exc.waited_seconds))}
+        raise HTTPException(status_code=503, detail=f"Too many heavy queries ({exc}); retry later", headers=headers)
+
+
+def _coalesced(
+    key: Tuple[Any, ...], session: Session, compute: Callable[[], Dict[str, Any]], cost: int
+) -> Dict[str, Any]:
+    """Run ``compute`` on ``session`` once for concurrent identical ``key``s, after admission for its ``cost``."""
+    started = perf_counter()
+    # Only the leader is admitted and connects; followers wait on its result without a slot or connection.
+    payload, shared = _price_flight.do(key, lambda: _admitted(key[0], cost, session, compute))
+    if shared:
+        COALESCED_REQUESTS.inc(endpoint=key[0])
+        timings = current_timings()
+        if timings is not None:
+            timings.add("coalesced", (perf_counter() - started) * 1000)
+    return payload
+
+
+def query_prices(
+    session: Session,
+    market: Market,
+    date_str: Optional[str],
+    month_str: Optional[str],
+    start_hour: int,
+    end_hour: int,
+    weighted: bool,
+    aggregate: Aggregate,
+    day_type: DayType = DayType.ALL,
+    exclude_holidays: bool = False,
+) -> Dict[str, Any]:
+    """Validate a price query and return the ``PriceResponse`` body.
+
+    Used by ``GET /api/prices`` and by in-process callers such as the chatbot; errors are
+    raised as ``HTTPException`` either way.
+    """
+    _validate_hours(start_hour, end_hour)
+
+    if date_str and month_str:
+        raise HTTPException(status_code=400, detail="Provide either date or month, not both")
+    if day_type == DayType.HOLIDAY and exclude_holidays:
+        raise HTTPException(status_code=400, detail="day_type=holiday cannot be combined with exclude_holidays")
+
+    date_value = _parse_date(date_str)
+    month_range = _parse_month(month_str)
+
+    if not date_value and not month_range:
+        raise HTTPException(status_code=400, detail="date or month is required")
+
+    if date_value:
+        start = end = date_value
+    else:
+        start, end = month_range  # type: ignore[misc]
+
+    key = ("prices", market, start, end, date_value, month_str, start_hour, end_hour, weighted, aggregate)
+    key += (day_type, exclude_holidays)
+    cost = estimate_cost(market.value, (end - start).days + 1, start_hour, end_hour)
+    return _coalesced(
+        key,
+        session,
+        lambda: _price_payload(
+            session,
+            market,
+            date_value,
+            month_str,
+            start,
+            end,
+            start_hour,
+            end_hour,
+            weighted,
+            aggregate,
+            day_type,
+            exclude_holidays,
+        ),
+        cost,
+    )
+
+
+# Handlers build plain dicts and return ``ORJSONResponse`` directly, so FastAPI skips the
+# ``response_model`` round-trip; the models still document the schema in OpenAPI.
+@router.get("/prices", response_model=PriceResponse, response_class=ORJSONResponse)
+def get_prices(
+    market: Market = Query(..., description="Market type"),
+    date_str: Optional[str] = Query(None, alias="date"),
+    month_str: Optional[str] = Query(None, alias="month"),
+    start_hour: int = Query(0, ge=0, le=23),
+    end_hour: int = Query(24, ge=1, le=24),
+    weighted: bool = Query(False),
+    aggregate: Aggregate = Query(Aggregate.AVG),
+    day_type: DayType = Query(DayType.ALL, description="Only aggregate weekdays, weekends or holidays"),
+    exclude_holidays: bool = Query(False, description="Skip days in the holiday calendar"),
+    db: Session = Depends(interactive_db),
+) -> ORJSONResponse:
+    response = query_prices(
+        db, market, date_str, month_str, start_hour, end_hour, weighted, aggregate, day_type, exclude_holidays
+    )
+    with timed("serialize"):
+        return ORJSONResponse(response)
+
+
+def price_stream_events(payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Split a ``PriceResponse`` body into stream events.
+
+    The first event is ``summary`` (the body without ``daily``, plus a ``days`` count) so
+    clients can render the headline first; one ``daily`` event per day follows. The payload is
+    already complete, so this splits delivery, not computation.
+    """
+    daily = payload.get("daily") or []
+    yield {"type": "summary", **{key: value for key, value in payload.items() if key != "daily"}, "days": len(daily)}
+    for stat in daily:
+        yield {"type": "daily", **stat}
+
+
+def _ndjson(events: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    for event in events:
+        yield orjson.dumps(event) + b"\n"
+
+
+@router.get(
+    "/prices/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}, "description": "NDJSON: one summary line, then one line per day"}},
+)
+def stream_prices(
+    market: Market = Query(..., description="Market type"),
+    date_str: Optional[str] = Query(None, alias="date"),
+    month_str: Optional[str] = Query(None, alias="month"),
+    start_hour: int = Query(0, ge=0, le=23),
+    end_hour: int = Query(24, ge=1, le=24),
+    weighted: bool = Query(False),
+    aggregate: Aggregate = Query(Aggregate.AVG),
+    day_type: DayType = Query(DayType.ALL, description="Only aggregate weekdays, weekends or holidays"),
+    exclude_holidays: bool = Query(False, description="Skip days in the holiday calendar"),
+    db: Session = Depends(interactive_db),
+) -> StreamingResponse:
+    # Validation and the whole query run before the first byte, so errors still get a JSON
+    # status; only the body is streamed. The session closes before the body is sent, so the
+    # daily rows cannot come from a cursor here.
+    payload = query_prices(
+        db, market, date_str, month_str, start_hour, end_hour, weighted, aggregate, day_type, exclude_holidays
+    )
+    return StreamingResponse(_ndjson(price_stream_events(payload)), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/prices/rolling", response_model=RollingResponse, response_class=ORJSONResponse)
+def get_rolling_prices(
+    market: Market = Query(..., description="Market type"),
+    start_str: str = Query(..., alias="start"),
+    end_str: str = Query(..., alias="end"),
+    window: int = Query(7, ge=2, le=366, description="Window length in trading days"),
+    start_hour: int = Query(0, ge=0, le=23),
+    end_hour: int = Query(24, ge=1, le=24),
+    weighted: bool = Query(False),
+    aggregate: Aggregate = Query(Aggregate.AVG),
+    db: Session = Depends(analytics_db),
+) -> ORJSONResponse:
+    _validate_hours(start_hour, end_hour)
+    start, end = _parse_range(start_str, end_str)
+
+    key = ("rolling", market, start, end, window, start_hour, end_hour, weighted, aggregate)
+    cost = estimate_cost(market.value, (end - _lookback_start(start, window)).days + 1, start_hour, end_hour)
+    response = _coalesced(
+        key,
+        db,
+        lambda: _rolling_payload(db, market, start, end, window, start_hour, end_hour, weighted, aggregate),
+        cost,
+    )
+    with timed("serialize"):
+        return ORJSONResponse(response)
+
+
+@router.get("/prices/resample", response_model=ResampleResponse, response_class=ORJSONResponse)
+def resample_prices(
+    market: Market = Query(..., description="Market type"),
+    start_str: str = Query(..., alias="start"),
+    end_str: str = Query(..., alias="end"),
+    minutes: int = Query(60, ge=15, le=1440, description="Block length: 15, 30, 60 or any multiple of 15 dividing the day"),
+    start_hour: int = Query(0, ge=0, le=23),
+    end_hour: int = Query(24, ge=1, le=24),
+    weighted: bool = Query(False),
+    aggregate: Aggregate = Query(Aggregate.AVG),
+    day_type: DayType = Query(DayType.ALL, description="Only aggregate weekdays, weekends or holidays"),
+    exclude_holidays: bool = Query(False, description="Skip days in the holiday calendar"),
+    db: Session = Depends(analytics_db),
+) -> ORJSONResponse:
+    _validate_hours(start_hour, end_hour)
+    _validate_resolution(market, minutes)
+    _validate_block_window(minutes, start_hour, end_hour)
+    if day_type == DayType.HOLIDAY and exclude_holidays:
+        raise HTTPException(status_code=400, detail="day_type=holiday cannot be combined with exclude_holidays")
+    start, end = _parse_range(start_str, end_str)
+
+    key = ("resample", market, start, end, minutes, start_hour, end_hour, weighted, aggregate)
+    key += (day_type, exclude_holidays)
+    cost = estimate_cost(market.value, (end - start).days + 1, start_hour, end_hour)
+    response = _coalesced(
+        key,
+        db,
+        lambda: _resample_payload(
+            db,
+            market,
+            start,
+            end,
+            minutes,
+            start_hour,
+            end_hour,
+            weighted,
+            aggregate,
+            day_type,
+            exclude_holidays,
+        ),
+        cost,
+    )
+    with timed("serialize"):
+        return ORJSONResponse(response)
+
+
+@router.get("/prices/compare", response_model=CompareResponse, response_class=ORJSONResponse)
+def compare_prices(
+    market: Market = Query(..., description="Market type"),
+    month_str: str = Query(..., alias="month", description="Anchor month (YYYY-MM)"),
+    mode: CompareMode = Query(CompareMode.YOY, description="Same month in earlier years, or the months before"),
+    periods: int = Query(1, ge=1, le=36, description="Number of earlier periods to compare against"),
+    start_hour: int = Query(0, ge=0, le=23),
+    end_hour: int = Query(24, ge=1, le=24),
+    weighted: bool = Query(False),
+    aggregate: Aggregate = Query(Aggregate.AVG),
+    day_type: DayType = Query(DayType.ALL, description="Only aggregate weekdays, weekends or holidays"),
+    exclude_holidays: bool = Query(False, description="Skip days in the holiday calendar"),
+    db: Session = Depends(analytics_db),
+) -> ORJSONResponse:
+    _validate_hours(start_hour, end_hour)
+    if day_type == DayType.HOLIDAY and exclude_holidays:
+        raise HTTPException(status_code=400, detail="day_type=holiday cannot be combined with exclude_holidays")
+    try:
+        month_range = _parse_month(month_str)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="month must be YYYY-MM")
+    anchor = month_range[0]  # type: ignore[index]
 
-    response = PriceResponse(
-        inputs=PriceInputs(
-            market=market,
-            date=date_value,
-            month=month_str,
-            start_hour=start_hour,
-            end_hour=end_hour,
-            weighted=weighted,
-            aggregate=aggregate,
+    key = ("compare", market, anchor, mode, periods, start_hour, end_hour, weighted, aggregate)
+    key += (day_type, exclude_holidays)
+    days = sum(monthrange(month.year, month.month)[1] for month in _comparison_months(anchor, mode, periods))
+    cost = estimate_cost(market.value, days, start_hour, end_hour)
+    response = _coalesced(
+        key,
+        db,
+        lambda: _compare_payload(
+            db,
+            market,
+            month_str,
+            anchor,
+            mode,
+            periods,
+            start_hour,
+            end_hour,
+            weighted,
+            aggregate,
+            day_type,
+            exclude_holidays,
         ),
-        price_rs_per_mwh=overall.price_rs_per_mwh,
-        price_rs_per_kwh=overall.price_rs_per_kwh,
-        count=overall.count,
-        daily=daily_stats if not date_value else None,
+        cost,
     )
-    return response
+    with timed("serialize"):
+        return ORJSONResponse(response)
 
 
-__all__ = ["router"]
+__all__ = [
+    "Aggregate",
+    "CompareMode",
+    "DayType",
+    "Market",
+    "NDJSON_MEDIA_TYPE",
+    "price_stream_events",
+    "query_prices",
+    "router",
+]
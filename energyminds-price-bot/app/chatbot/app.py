@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-import os
+import asyncio
+from typing import Any, AsyncIterator, Dict, List
 
 import chainlit as cl
-import httpx
+from chainlit.server import app as chainlit_server
 
-from app.chatbot.nlp import parse_message
-from app.core.config import get_settings
+from app.chatbot.cache import canonical_key, get_answer_cache, query_scope
+from app.chatbot.client import close_backend_client_on_shutdown
+from app.chatbot.formatting import format_comparison_reply, stream_price_reply
+from app.chatbot.nlp import parse_queries
+from app.chatbot.service import get_price_service
 
-settings = get_settings()
-BACKEND_URL = os.getenv("BACKEND_URL", "http://backend:8000")
+# Chainlit loads this module before serving, so the pooled backend client closes with the server.
+close_backend_client_on_shutdown(chainlit_server)
 
 
 @cl.on_chat_start
@@ -19,31 +23,43 @@ async def start() -> None:
 
 @cl.on_message
 async def handle_message(message: cl.Message) -> None:
-    params = parse_message(message.content)
-    if "date" not in params and "month" not in params:
+    queries = parse_queries(message.content)
+    if not queries:
         await cl.Message(content="I couldn't find a date or month in your request. Try 'DAM 2024-08-01 0-8'.").send()
         return
 
-    async with httpx.AsyncClient(base_url=BACKEND_URL, timeout=30.0) as client:
-        response = await client.get("/api/prices", params=params)
+    service = get_price_service()
+    cache = get_answer_cache()
+    await cache.sync(service)
+    key = canonical_key(queries)
+    cached = cache.get(key)
+    if cached is not None:
+        await cl.Message(content=cached).send()
+        return
 
-    if response.status_code != 200:
-        detail = response.json().get("detail", "Unknown error")
-        await cl.Message(content=f"Backend error: {detail}").send()
+    if len(queries) > 1:
+        # Fan out concurrently so the reply takes as long as the slowest query, not the sum.
+        results = await asyncio.gather(*(service.get_prices(query) for query in queries))
+        content = format_comparison_reply(list(zip(queries, results)))
+        await cl.Message(content=content).send()
+        if all(result.ok for result in results):
+            cache.put(key, content, query_scope(queries))
         return
 
-    data = response.json()
-    lines = [
-        f"Market: {data['inputs']['market']}",
-        f"Window: {data['inputs'].get('date') or data['inputs'].get('month')} {data['inputs']['start_hour']}–{data['inputs']['end_hour']}",
-        f"Average price: {data['price_rs_per_mwh']:.2f} Rs/MWh ({data['price_rs_per_kwh']:.4f} Rs/kWh)",
-        f"Data points: {data['count']}",
-    ]
-    if data.get("daily"):
-        lines.append("Daily breakdown:")
-        for stat in data["daily"]:
-            lines.append(
-                f" - {stat['trade_date']}: {stat['price_rs_per_mwh']:.2f} Rs/MWh over {stat['count']} blocks"
-            )
-
-    await cl.Message(content="\n".join(lines)).send()
+    failed = False
+
+    async def events() -> AsyncIterator[Dict[str, Any]]:
+        nonlocal failed
+        async for event in service.stream_prices(queries[0]):
+            failed = failed or event["type"] == "error"
+            yield event
+
+    # Stream so month questions show the headline before the daily breakdown has arrived.
+    reply = cl.Message(content="")
+    chunks: List[str] = []
+    async for chunk in stream_price_reply(events()):
+        chunks.append(chunk)
+        await reply.stream_token(chunk)
+    await reply.send()
+    if not failed:
+        cache.put(key, "".join(chunks), query_scope(queries))
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Mapping, Optional, Sequence, Tuple
+
+from app.chatbot.service import PriceService
+from app.core.config import Settings, get_settings
+from app.core.data_version import changed_keys, version_key
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[Tuple[Tuple[str, Any], ...], ...]
+
+
+def _canonical_value(name: str, value: Any) -> Any:
+    if name == "market":
+        return str(value).upper()
+    if name == "aggregate":
+        return str(value).lower()
+    if name in ("start_hour", "end_hour"):
+        return int(value)
+    if name == "weighted":
+        return bool(value)
+    return str(value)
+
+
+def canonical_key(queries: Sequence[Mapping[str, Any]]) -> CacheKey:
+    """Key a parsed message by its query params only, so rewordings share one entry.
+
+    ``parse_queries`` has already resolved "today"/"yesterday" to ISO dates, so relative
+    questions roll over to a new key at midnight.
+    """
+    return tuple(tuple(sorted((name, _canonical_value(name, value)) for name, value in query.items())) for query in queries)
+
+
+def query_scope(queries: Sequence[Mapping[str, Any]]) -> FrozenSet[str]:
+    """``data_version`` keys (``"DAM:2024-08"``) whose data a reply to ``queries`` depends on."""
+    return frozenset(
+        version_key(str(query["market"]), str(query.get("month") or query.get("date"))[:7]) for query in queries
+    )
+
+
+class AnswerCache:
+    """Bounded LRU of formatted replies with a TTL, invalidated as backend data versions move.
+
+    The version is polled at most every ``version_check_seconds``, so repeat questions inside
+    that interval are answered without any backend call. Entries stored with a scope are only
+    dropped when one of their market/months changes; unscoped entries go on any change.
+
+    Without a live version signal (no check yet, the last one failed, or the backend reports
+    ``watched: false``) an ingest would stay invisible until the TTL, so entries stored then
+    live at most ``unversioned_ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl_seconds: float = 300.0,
+        version_check_seconds: float = 10.0,
+        unversioned_ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self.unversioned_ttl_seconds = unversioned_ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, Tuple[float, str, FrozenSet[str]]] = OrderedDict()
+        self._version: Optional[str] = None
+        self._keys: Optional[Dict[str, int]] = None
+        self._checked_at: Optional[float] = None
+        self._versioned = False
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> AnswerCache:
+        return cls(
+            maxsize=settings.chat_cache_size,
+            ttl_seconds=settings.chat_cache_ttl_seconds,
+            version_check_seconds=settings.chat_cache_version_check_seconds,
+            unversioned_ttl_seconds=settings.chat_cache_unversioned_ttl_seconds,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, reply: str, scope: Iterable[str] = ()) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl_seconds if self._versioned else min(self.ttl_seconds, self.unversioned_ttl_seconds)
+        self._entries[key] = (self._clock() + ttl, reply, frozenset(scope))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def invalidate(self, keys: Iterable[str]) -> int:
+        """Drop entries whose scope touches ``keys`` (and all unscoped ones); returns how many."""
+        changed = set(keys)
+        stale = [key for key, (_, _, scope) in self._entries.items() if not scope or scope & changed]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def observe_version(self, payload: Optional[Mapping[str, Any]]) -> None:
+        """Apply a ``data_version`` payload; ``None`` means no signal.
+
+        With per-key versions on both sides only the changed market/months are invalidated,
+        otherwise a different ``version`` token clears everything.
+        """
+        if payload is None:
+            self._versioned = False
+            return
+        # Backends that predate ``watched`` ran their watcher unconditionally.
+        self._versioned = bool(payload.get("watched", True))
+        version, keys = payload["version"], payload.get("keys")
+        if self._version is not None and version != self._version:
+            if self._keys is not None and keys is not None:
+                changed = changed_keys(self._keys, keys)
+                dropped = self.invalidate(changed)
+                logger.info("Data changed for %s; dropped %d cached replies", ", ".join(sorted(changed)), dropped)
+            else:
+                logger.info("Backend data version changed (%s -> %s); clearing %d cached replies", self._version, version, len(self))
+                self.clear()
+        self._version = version
+        self._keys = dict(keys) if keys is not None else None
+
+    async def sync(self, service: PriceService) -> None:
+        """Poll the data version if the check interval has elapsed."""
+        now = self._clock()
+        if self._checked_at is not None and now - self._checked_at < self.version_check_seconds:
+            return
+        self._checked_at = now
+        try:
+            version = await service.data_version()
+        except Exception as exc:  # keep serving cached replies until their TTL runs out
+            logger.warning("Data version check failed: %s", exc)
+            self._versioned = False
+            return
+        self.observe_version(version)
+
+
+_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> AnswerCache:
+    global _cache
+    if _cache is None:
+        _cache = AnswerCache.from_settings(get_settings())
+    return _cache
+
+
+__all__ = ["AnswerCache", "canonical_key", "get_answer_cache", "query_scope"]
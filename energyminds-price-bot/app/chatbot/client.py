@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Mapping, Optional
+
+import httpx
+
+from app.core.config import Settings, get_settings
+
+# The Chainlit image does not ship loguru, so the bot logs through the stdlib.
+logger = logging.getLogger(__name__)
+
+# 504 is left out: the backend returns it when it cancelled a query for running too long,
+# and repeating that query would only add the load the timeout is there to shed.
+RETRY_STATUSES = {502, 503}
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Seconds from a ``Retry-After: <seconds>`` header, or 0 when absent or an HTTP date."""
+    try:
+        return max(float(response.headers.get("retry-after", 0)), 0.0)
+    except ValueError:
+        return 0.0
+
+
+class BackendClient:
+    """Long-lived pooled client for the FastAPI backend with retry and exponential backoff.
+
+    Only idempotent GETs go through here, so transport errors and ``RETRY_STATUSES`` are
+    retried ``retries`` times, sleeping ``backoff * 2**attempt`` between attempts, or longer
+    when the response asks for it with ``Retry-After``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout: httpx.Timeout,
+        limits: httpx.Limits,
+        retries: int = 2,
+        backoff: float = 0.2,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self._client = httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits, transport=transport)
+
+    @classmethod
+    def from_settings(cls, settings: Settings, transport: Optional[httpx.AsyncBaseTransport] = None) -> BackendClient:
+        return cls(
+            settings.backend_url,
+            timeout=httpx.Timeout(settings.backend_timeout_seconds, connect=settings.backend_connect_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=settings.backend_max_connections,
+                max_keepalive_connections=settings.backend_max_keepalive,
+                keepalive_expiry=settings.backend_keepalive_expiry_seconds,
+            ),
+            retries=settings.backend_retries,
+            backoff=settings.backend_retry_backoff_seconds,
+            transport=transport,
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    async def _send(self, path: str, params: Optional[Mapping[str, Any]], stream: bool) -> httpx.Response:
+        attempt = 0
+        while True:
+            delay = self.backoff * 2**attempt
+            try:
+                request = self._client.build_request("GET", path, params=params)
+                response = await self._client.send(request, stream=stream)
+            except httpx.TransportError as exc:
+                if attempt >= self.retries:
+                    raise
+                logger.warning("Backend request %s failed (%s); retrying", path, exc)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    return response
+                await response.aclose()
+                delay = max(delay, _retry_after(response))
+                logger.warning("Backend request %s returned %s; retrying in %.1fs", path, response.status_code, delay)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, path: str, params: Optional[Mapping[str, Any]] = None) -> httpx.Response:
+        return await self._send(path, params, stream=False)
+
+    @asynccontextmanager
+    async def stream(self, path: str, params: Optional[Mapping[str, Any]] = None) -> AsyncIterator[httpx.Response]:
+        """Open a streaming GET; retries only apply until the response headers arrive."""
+        response = await self._send(path, params, stream=True)
+        try:
+            yield response
+        finally:
+            await response.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_client: Optional[BackendClient] = None
+
+
+def get_backend_client() -> BackendClient:
+    """Return the process-wide client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = BackendClient.from_settings(get_settings())
+    return _client
+
+
+async def close_backend_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def close_backend_client_on_shutdown(app: Any) -> None:
+    """Close the pooled client when the ASGI ``app`` shuts down.
+
+    Chainlit 1.0 has no shutdown hook, so this wraps the server's lifespan instead of using
+    ``on_shutdown`` handlers, which Starlette ignores once a lifespan is set.
+    """
+    lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def closing(app_: Any) -> AsyncIterator[Any]:
+        try:
+            async with lifespan(app_) as state:
+                yield state
+        finally:
+            await close_backend_client()
+
+    app.router.lifespan_context = closing
+
+
+__all__ = ["BackendClient", "close_backend_client", "close_backend_client_on_shutdown", "get_backend_client"]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Mapping, Sequence, Tuple
+
+from app.chatbot.service import PriceResult
+
+
+def _headline(data: Mapping[str, Any]) -> str:
+    inputs = data["inputs"]
+    return "\n".join(
+        [
+            f"Market: {inputs['market']}",
+            f"Window: {inputs.get('date') or inputs.get('month')} {inputs['start_hour']}–{inputs['end_hour']}",
+            f"Average price: {data['price_rs_per_mwh']:.2f} Rs/MWh ({data['price_rs_per_kwh']:.4f} Rs/kWh)",
+            _points_line(data),
+        ]
+    )
+
+
+def _points_line(data: Mapping[str, Any]) -> str:
+    # Summary answers have no slot count behind them.
+    if data.get("count") is None:
+        return "Data points: exchange-published window average"
+    return f"Data points: {data['count']}"
+
+
+def _blocks(data: Mapping[str, Any]) -> str:
+    return "" if data.get("count") is None else f" over {data['count']} blocks"
+
+
+def _daily_line(stat: Mapping[str, Any]) -> str:
+    return f" - {stat['trade_date']}: {stat['price_rs_per_mwh']:.2f} Rs/MWh{_blocks(stat)}"
+
+
+def format_price_reply(data: Mapping[str, Any]) -> str:
+    lines = [_headline(data)]
+    if data.get("daily"):
+        lines.append("Daily breakdown:")
+        lines.extend(_daily_line(stat) for stat in data["daily"])
+    return "\n".join(lines)
+
+
+async def stream_price_reply(events: AsyncIterable[Mapping[str, Any]]) -> AsyncIterator[str]:
+    """Turn ``PriceService.stream_prices`` events into text chunks for token streaming.
+
+    The headline is emitted as soon as the ``summary`` event arrives; the chunks joined
+    together equal ``format_price_reply`` for the same answer.
+    """
+    breakdown_started = False
+    async for event in events:
+        kind = event["type"]
+        if kind == "error":
+            yield f"Backend error: {event['detail']}"
+            return
+        if kind == "summary":
+            yield _headline(event)
+        elif kind == "daily":
+            if not breakdown_started:
+                breakdown_started = True
+                yield "\nDaily breakdown:"
+            yield "\n" + _daily_line(event)
+
+
+def format_comparison_reply(answers: Sequence[Tuple[Mapping[str, Any], PriceResult]]) -> str:
+    """One line per (market, window) query, in the order the user asked for them."""
+    first = answers[0][0]
+    lines: List[str] = [f"Comparison for {first.get('date') or first.get('month')} ({first.get('aggregate', 'avg')}):"]
+    for params, result in answers:
+        label = f"{params['market']} {params['start_hour']:02d}–{params['end_hour']:02d}"
+        if result.ok:
+            data: Dict[str, Any] = result.data
+            lines.append(
+                f" - {label}: {data['price_rs_per_mwh']:.2f} Rs/MWh ({data['price_rs_per_kwh']:.4f} Rs/kWh){_blocks(data)}"
+            )
+        else:
+            lines.append(f" - {label}: {result.data.get('detail', 'Unknown error')}")
+    return "\n".join(lines)
+
+
+__all__ = ["format_comparison_reply", "format_price_reply", "stream_price_reply"]
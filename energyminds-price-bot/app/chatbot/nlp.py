@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass, field
 from datetime import date, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 MONTH_LOOKUP = {
     "jan": 1,
@@ -20,76 +21,138 @@ MONTH_LOOKUP = {
     "dec": 12,
 }
 
-ISO_DATE_RE = re.compile(r"(20\d{2})-(\d{2})-(\d{2})")
-ISO_MONTH_RE = re.compile(r"(20\d{2})-(\d{2})")
-HOUR_RANGE_RE = re.compile(r"(\d{1,2})\s*(?:-|to|–)\s*(\d{1,2})")
-
-
-def _normalise_hours(text: str) -> Optional[Dict[str, int]]:
-    match = HOUR_RANGE_RE.search(text)
-    if not match:
-        return None
-    start = int(match.group(1))
-    end = int(match.group(2))
-    if end <= start:
-        end = start + 1
-    return {"start_hour": start, "end_hour": end}
-
-
-def _normalise_date(text: str, today: Optional[date]) -> Dict[str, str]:
-    if today is None:
-        today = date.today()
-    lower = text.lower()
-    if "yesterday" in lower:
-        return {"date": (today - timedelta(days=1)).isoformat()}
-    if "today" in lower:
-        return {"date": today.isoformat()}
-
-    match = ISO_DATE_RE.search(text)
-    if match:
-        return {"date": f"{match.group(1)}-{match.group(2)}-{match.group(3)}"}
-
-    match_month = ISO_MONTH_RE.search(text)
-    if match_month:
-        return {"month": f"{match_month.group(1)}-{match_month.group(2)}"}
-
-    for name, month_index in MONTH_LOOKUP.items():
-        if name in lower:
-            year_match = re.search(r"20\d{2}", lower)
-            if year_match:
-                month = month_index
-                return {"month": f"{year_match.group(0)}-{month:02d}"}
+AGGREGATE_LOOKUP = {
+    "min": "min",
+    "minimum": "min",
+    "lowest": "min",
+    "max": "max",
+    "maximum": "max",
+    "highest": "max",
+    "avg": "avg",
+    "average": "avg",
+    "mean": "avg",
+}
 
-    return {}
+# One alternation scanned left to right over the lowercased message. Each branch is guarded by
+# its first character class so most positions fail after a single check. Order matters where
+# alternatives can start at the same position: full ISO dates beat ISO months, which beat bare
+# years, so "2024-08-01" is never read as a year or as the 24-08 hour window. Words only match
+# whole, so "mar" inside "market" and "min" inside "admin" are ignored.
+TOKEN_RE = re.compile(
+    r"""
+    (?=\d)(?:
+        (?P<date>\b20\d{2}-\d{2}-\d{2}\b)
+        | (?P<iso_month>\b20\d{2}-\d{2}\b)
+        | (?P<year>\b20\d{2}\b)
+        | (?P<hours>(?<![\d.])(?P<start>\d{1,2})\s*(?:-|–|to)\s*(?P<end>\d{1,2})(?![\d.]))
+    )
+    | \b(?=[a-z])(?:
+        (?P<market>(?:gdam|dam|rtm)\b)
+        | (?P<month_name>(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?
+            |sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b)
+        | (?P<relative>(?:today|yesterday)\b)
+        | (?P<weighted>(?:weight\w*|volume\w*)\b)
+        | (?P<aggregate>(?:min(?:imum)?|max(?:imum)?|lowest|highest|avg|average|mean)\b)
+    )
+    """,
+    re.VERBOSE,
+)
+MAX_QUERIES = 9
+
+
+@dataclass
+class _Scan:
+    """Everything one pass over a message found, in order of first mention.
+
+    Single-query callers take the first market named, so "rtm or gdam" asks about RTM.
+    """
+
+    markets: List[str] = field(default_factory=list)
+    windows: List[Dict[str, int]] = field(default_factory=list)
+    relative: Optional[str] = None
+    date: Optional[str] = None
+    iso_month: Optional[str] = None
+    month_name: Optional[int] = None
+    year: Optional[str] = None
+    weighted: bool = False
+    aggregate: Optional[str] = None
+
+    def period(self, today: Optional[date]) -> Dict[str, str]:
+        if self.relative is not None:
+            today = today or date.today()
+            day = today - timedelta(days=1) if self.relative == "yesterday" else today
+            return {"date": day.isoformat()}
+        if self.date is not None:
+            return {"date": self.date}
+        if self.iso_month is not None:
+            return {"month": self.iso_month}
+        if self.month_name is not None and self.year is not None:
+            return {"month": f"{self.year}-{self.month_name:02d}"}
+        return {}
+
+
+def _scan(message: str) -> _Scan:
+    scan = _Scan()
+    # Branches are ordered by how often each token kind shows up in chat logs.
+    for match in TOKEN_RE.finditer(message.lower()):
+        kind = match.lastgroup
+        if kind == "market":
+            market = match.group().upper()
+            if market not in scan.markets:
+                scan.markets.append(market)
+        elif kind == "hours":
+            start, end = int(match.group("start")), int(match.group("end"))
+            window = {"start_hour": start, "end_hour": end if end > start else start + 1}
+            # Out-of-day ranges ("25-27") are dropped here, so they never reach the base params.
+            if window["start_hour"] <= 23 and window["end_hour"] <= 24 and window not in scan.windows:
+                scan.windows.append(window)
+        elif kind == "date":
+            scan.date = scan.date or match.group()
+        elif kind == "aggregate":
+            scan.aggregate = scan.aggregate or AGGREGATE_LOOKUP[match.group()]
+        elif kind == "weighted":
+            scan.weighted = True
+        elif kind == "month_name":
+            if scan.month_name is None:
+                scan.month_name = MONTH_LOOKUP[match.group()[:3]]
+        elif kind == "year":
+            scan.year = scan.year or match.group()
+        elif kind == "iso_month":
+            scan.iso_month = scan.iso_month or match.group()
+        elif kind == "relative":
+            # "yesterday" wins over "today" regardless of order, as it always has.
+            if scan.relative != "yesterday":
+                scan.relative = match.group()
+    return scan
+
+
+def _base_params(scan: _Scan, today: Optional[date]) -> Dict[str, object]:
+    params: Dict[str, object] = {"market": scan.markets[0] if scan.markets else "DAM", "start_hour": 0, "end_hour": 24}
+    if scan.windows:
+        params.update(scan.windows[0])
+    params["weighted"] = scan.weighted
+    params.update(scan.period(today))
+    params["aggregate"] = scan.aggregate or "avg"
+    return params
 
 
 def parse_message(message: str, *, today: Optional[date] = None) -> Dict[str, object]:
-    lower = message.lower()
-    market = "DAM"
-    if "gdam" in lower:
-        market = "GDAM"
-    elif "rtm" in lower:
-        market = "RTM"
-
-    params: Dict[str, object] = {"market": market, "start_hour": 0, "end_hour": 24, "weighted": False}
+    return _base_params(_scan(message), today)
 
-    hours = _normalise_hours(lower)
-    if hours:
-        params.update(hours)
 
-    params.update(_normalise_date(message, today))
+def parse_queries(message: str, *, today: Optional[date] = None) -> List[Dict[str, object]]:
+    """Expand a message into one params dict per (market, hour window) it mentions.
 
-    if "weight" in lower or "volume" in lower:
-        params["weighted"] = True
-
-    if "min" in lower:
-        params["aggregate"] = "min"
-    elif "max" in lower:
-        params["aggregate"] = "max"
-    else:
-        params["aggregate"] = "avg"
-
-    return params
+    "compare DAM, GDAM and RTM for Aug 2024 7-10" yields three queries sharing the date,
+    weighting and aggregate. Returns an empty list when no date or month is found.
+    """
+    scan = _scan(message)
+    base = _base_params(scan, today)
+    if "date" not in base and "month" not in base:
+        return []
+    markets = scan.markets or [base["market"]]
+    windows = scan.windows or [{"start_hour": base["start_hour"], "end_hour": base["end_hour"]}]
+    return [{**base, "market": market, **window} for market in markets for window in windows][:MAX_QUERIES]
 
 
-__all__ = ["parse_message"]
+__all__ = ["parse_message", "parse_queries"]
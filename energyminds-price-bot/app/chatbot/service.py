@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Mapping, Optional, Protocol
+
+from app.chatbot.client import BackendClient, get_backend_client
+from app.core.config import get_settings
+
+
+@dataclass
+class PriceResult:
+    """Backend answer in wire form: ``data`` is the JSON body, including ``detail`` on errors."""
+
+    status_code: int
+    data: Dict[str, Any]
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code == 200
+
+
+def error_event(status_code: int, data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Stream event standing in for a non-200 answer."""
+    return {"type": "error", "status_code": status_code, "detail": data.get("detail", "Unknown error")}
+
+
+class PriceService(Protocol):
+    async def get_prices(self, params: Mapping[str, Any]) -> PriceResult: ...
+
+    def stream_prices(self, params: Mapping[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ``summary`` then ``daily`` events (see ``GET /api/prices/stream``), or one ``error``."""
+        ...
+
+    async def data_version(self) -> Optional[Dict[str, Any]]:
+        """``{"version": token, "keys": {"DAM:2024-08": 3, ...}}`` (see ``GET /api/data-version``), or ``None``."""
+        ...
+
+
+class RemotePriceService:
+    """Calls ``GET /api/prices`` on the FastAPI backend over HTTP."""
+
+    def __init__(self, client: Optional[BackendClient] = None) -> None:
+        self._client = client
+
+    async def get_prices(self, params: Mapping[str, Any]) -> PriceResult:
+        client = self._client or get_backend_client()
+        response = await client.get("/api/prices", params=params)
+        return PriceResult(status_code=response.status_code, data=response.json())
+
+    async def stream_prices(self, params: Mapping[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        client = self._client or get_backend_client()
+        async with client.stream("/api/prices/stream", params=params) as response:
+            if response.status_code != 200:
+                yield error_event(response.status_code, json.loads(await response.aread()))
+                return
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+    async def data_version(self) -> Optional[Dict[str, Any]]:
+        client = self._client or get_backend_client()
+        response = await client.get("/api/data-version")
+        response.raise_for_status()
+        return response.json()
+
+
+def _to_wire(value: Any) -> Any:
+    """Match the JSON the HTTP API would return without an encode/decode round-trip."""
+    if isinstance(value, dict):
+        return {key: _to_wire(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_to_wire(item) for item in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _flag(value: Any) -> bool:
+    """Read a boolean query param the way FastAPI does, so ``"false"`` is not truthy."""
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return bool(value)
+
+
+class InProcessPriceService:
+    """Runs the router's query code directly against a dedicated read-only session pool.
+
+    Needs the backend stack (SQLAlchemy, the DB driver, orjson, loguru) installed next to Chainlit;
+    see ``requirements.inprocess.txt``.
+    """
+
+    def __init__(self, session_factory: Any = None) -> None:
+        if session_factory is None:
+            from app.db.session import create_readonly_sessionmaker
+
+            session_factory = create_readonly_sessionmaker()
+        self._session_factory = session_factory
+
+    def _query(self, params: Mapping[str, Any]) -> PriceResult:
+        from fastapi import HTTPException
+
+        from app.api.routers.prices import Aggregate, DayType, Market, query_prices
+        from app.db.session import set_statement_timeout
+
+        try:
+            market = Market(str(params["market"]).upper())
+            aggregate = Aggregate(str(params.get("aggregate", Aggregate.AVG.value)))
+            day_type = DayType(str(params.get("day_type", DayType.ALL.value)))
+        except (KeyError, ValueError) as exc:
+            return PriceResult(status_code=400, data={"detail": f"Invalid query: {exc}"})
+
+        session = self._session_factory()
+        try:
+            set_statement_timeout(session, get_settings().statement_timeout_ms)
+            payload = query_prices(
+                session,
+                market,
+                params.get("date"),
+                params.get("month"),
+                int(params.get("start_hour", 0)),
+                int(params.get("end_hour", 24)),
+                _flag(params.get("weighted", False)),
+                aggregate,
+                day_type,
+                _flag(params.get("exclude_holidays", False)),
+            )
+        except HTTPException as exc:
+            return PriceResult(status_code=exc.status_code, data={"detail": exc.detail})
+        except ValueError as exc:
+            return PriceResult(status_code=400, data={"detail": str(exc)})
+        finally:
+            session.close()
+        return PriceResult(status_code=200, data=_to_wire(payload))
+
+    async def get_prices(self, params: Mapping[str, Any]) -> PriceResult:
+        return await asyncio.to_thread(self._query, params)
+
+    async def stream_prices(self, params: Mapping[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        from app.api.routers.prices import price_stream_events
+
+        result = await self.get_prices(params)
+        if not result.ok:
+            yield error_event(result.status_code, result.data)
+            return
+        for event in price_stream_events(result.data):
+            yield event
+
+    def _data_version(self) -> Dict[str, Any]:
+        from app.core.data_version import version_token
+        from app.db.data_version import read_data_versions
+
+        session = self._session_factory()
+        try:
+            versions = read_data_versions(session)
+        finally:
+            session.close()
+        return {"version": version_token(versions), "keys": versions}
+
+    async def data_version(self) -> Optional[Dict[str, Any]]:
+        # Ingest bumps the shared data_version table, so this process sees it without the API.
+        return await asyncio.to_thread(self._data_version)
+
+
+_service: Optional[PriceService] = None
+
+
+def get_price_service() -> PriceService:
+    """Return the configured service; ``PRICE_SERVICE_MODE=inprocess`` skips HTTP entirely."""
+    global _service
+    if _service is None:
+        mode = get_settings().price_service_mode.lower()
+        if mode == "inprocess":
+            try:
+                _service = InProcessPriceService()
+            except ImportError as exc:
+                raise RuntimeError(
+                    f"PRICE_SERVICE_MODE=inprocess needs the backend dependencies ({exc.name} is missing); "
+                    "build the Chainlit image with INPROCESS=1 or install requirements.inprocess.txt"
+                ) from exc
+        elif mode == "remote":
+            _service = RemotePriceService()
+        else:
+            raise ValueError(f"Unknown PRICE_SERVICE_MODE {mode!r}; expected 'remote' or 'inprocess'")
+    return _service
+
+
+__all__ = [
+    "InProcessPriceService",
+    "PriceResult",
+    "PriceService",
+    "RemotePriceService",
+    "error_event",
+    "get_price_service",
+]
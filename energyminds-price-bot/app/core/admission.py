@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import QUERY_ADMISSIONS
+from app.core.timing import timed
+
+# Stored price slots per hour of window; a query's cost is roughly the rows it aggregates.
+SLOTS_PER_HOUR = {"DAM": 1, "GDAM": 4, "RTM": 4}
+
+
+def estimate_cost(market: str, days: int, start_hour: int, end_hour: int) -> int:
+    """Price rows a query over ``days`` trading days and the ``[start_hour, end_hour)`` window reads."""
+    return max(days, 0) * (end_hour - start_hour) * SLOTS_PER_HOUR[market]
+
+
+class QueryTooExpensive(Exception):
+    def __init__(self, cost: int, limit: int) -> None:
+        super().__init__(f"estimated {cost} price rows exceeds the limit of {limit}")
+        self.cost = cost
+        self.limit = limit
+
+
+class AdmissionTimeout(Exception):
+    def __init__(self, waited_seconds: float) -> None:
+        super().__init__(f"no heavy-query slot freed up within {waited_seconds:g}s")
+        self.waited_seconds = waited_seconds
+
+
+class AdmissionController:
+    """Reject queries over ``cost_limit`` and queue those over ``heavy_cost`` behind a few slots.
+
+    Cheap queries (every chatbot day or month question) never wait, so a handful of multi-year
+    requests can hold at most ``heavy_concurrency`` DB connections and workers between them.
+    """
+
+    def __init__(self, cost_limit: int, heavy_cost: int, heavy_concurrency: int, queue_seconds: float) -> None:
+        self.cost_limit = cost_limit
+        self.heavy_cost = heavy_cost
+        self.queue_seconds = queue_seconds
+        self._heavy: Optional[threading.BoundedSemaphore] = None
+        if heavy_cost > 0 and heavy_concurrency > 0:
+            self._heavy = threading.BoundedSemaphore(heavy_concurrency)
+
+    @contextmanager
+    def admit(self, route: str, cost: int) -> Iterator[None]:
+        if self.cost_limit > 0 and cost > self.cost_limit:
+            QUERY_ADMISSIONS.inc(route=route, decision="rejected")
+            raise QueryTooExpensive(cost, self.cost_limit)
+        if self._heavy is None or cost < self.heavy_cost:
+            QUERY_ADMISSIONS.inc(route=route, decision="admitted")
+            yield
+            return
+
+        with timed("queue"):
+            acquired = self._heavy.acquire(timeout=self.queue_seconds)
+        if not acquired:
+            QUERY_ADMISSIONS.inc(route=route, decision="timed_out")
+            raise AdmissionTimeout(self.queue_seconds)
+        QUERY_ADMISSIONS.inc(route=route, decision="queued")
+        try:
+            yield
+        finally:
+            self._heavy.release()
+
+
+@lru_cache(maxsize=1)
+def get_admission_controller() -> AdmissionController:
+    settings = get_settings()
+    return AdmissionController(
+        settings.query_cost_limit,
+        settings.query_heavy_cost,
+        settings.query_heavy_concurrency,
+        settings.query_queue_seconds,
+    )
+
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionTimeout",
+    "QueryTooExpensive",
+    "estimate_cost",
+    "get_admission_controller",
+]
@@ -23,7 +23,44 @@ class Settings(BaseSettings):
     openai_api_key: Optional[str] = Field(default=None, alias="OPENAI_API_KEY")
     allowed_origins: List[str] = Field(default_factory=lambda: ["http://localhost:3000", "http://localhost:8000"], alias="ALLOWED_ORIGINS")
 
+    backend_url: str = Field(default="http://backend:8000", alias="BACKEND_URL")
+    backend_timeout_seconds: float = Field(default=30.0, alias="BACKEND_TIMEOUT_SECONDS")
+    backend_connect_timeout_seconds: float = Field(default=5.0, alias="BACKEND_CONNECT_TIMEOUT_SECONDS")
+    backend_max_connections: int = Field(default=20, alias="BACKEND_MAX_CONNECTIONS")
+    backend_max_keepalive: int = Field(default=10, alias="BACKEND_MAX_KEEPALIVE")
+    backend_keepalive_expiry_seconds: float = Field(default=30.0, alias="BACKEND_KEEPALIVE_EXPIRY_SECONDS")
+    backend_retries: int = Field(default=2, alias="BACKEND_RETRIES")
+    backend_retry_backoff_seconds: float = Field(default=0.2, alias="BACKEND_RETRY_BACKOFF_SECONDS")
+
+    api_role: str = Field(default="all", alias="API_ROLE")
+
+    price_service_mode: str = Field(default="remote", alias="PRICE_SERVICE_MODE")
+    readonly_pool_size: int = Field(default=5, alias="READONLY_POOL_SIZE")
+    data_version_poll_seconds: float = Field(default=2.0, alias="DATA_VERSION_POLL_SECONDS")
+    price_cube_dir: Optional[str] = Field(default=None, alias="PRICE_CUBE_DIR")
+    price_cube_days: int = Field(default=731, alias="PRICE_CUBE_DAYS")
+    query_cost_limit: int = Field(default=200000, alias="QUERY_COST_LIMIT")
+    query_heavy_cost: int = Field(default=20000, alias="QUERY_HEAVY_COST")
+    query_heavy_concurrency: int = Field(default=2, alias="QUERY_HEAVY_CONCURRENCY")
+    query_queue_seconds: float = Field(default=10.0, alias="QUERY_QUEUE_SECONDS")
+    statement_timeout_ms: int = Field(default=5000, alias="STATEMENT_TIMEOUT_MS")
+    analytics_statement_timeout_ms: int = Field(default=30000, alias="ANALYTICS_STATEMENT_TIMEOUT_MS")
+
+    chat_cache_size: int = Field(default=1024, alias="CHAT_CACHE_SIZE")
+    chat_cache_ttl_seconds: float = Field(default=300.0, alias="CHAT_CACHE_TTL_SECONDS")
+    chat_cache_version_check_seconds: float = Field(default=10.0, alias="CHAT_CACHE_VERSION_CHECK_SECONDS")
+    chat_cache_unversioned_ttl_seconds: float = Field(default=30.0, alias="CHAT_CACHE_UNVERSIONED_TTL_SECONDS")
+
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    log_json: bool = Field(default=False, alias="LOG_JSON")
+    log_queue_size: int = Field(default=10000, alias="LOG_QUEUE_SIZE")
+    etl_warning_sample_first: int = Field(default=5, alias="ETL_WARNING_SAMPLE_FIRST")
+    etl_warning_sample_every: int = Field(default=1000, alias="ETL_WARNING_SAMPLE_EVERY")
+    gdam_hourly_storage: bool = Field(default=False, alias="GDAM_HOURLY_STORAGE")
+
+    profile_token: Optional[str] = Field(default=None, alias="PROFILE_TOKEN")
+    profile_sample_every: int = Field(default=0, alias="PROFILE_SAMPLE_EVERY")
+    profile_dir: str = Field(default="profiles", alias="PROFILE_DIR")
     cors: CorsSettings = Field(default_factory=CorsSettings)
 
     def model_post_init(self, __context: Dict[str, Any]) -> None:
@@ -41,6 +78,7 @@ class Settings(BaseSettings):
         data.pop("db_password", None)
         data.pop("openai_api_key", None)
         data.pop("database_url_override", None)
+        data.pop("profile_token", None)
         return data
 
 
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, Set
+
+# Process-side view of the ``data_version`` table. ``app.db.data_version`` feeds it from the
+# ETL-maintained rows (poll or LISTEN/NOTIFY), so per-process caches can check just the
+# market/month keys they depend on instead of flushing everything on any ingest.
+_lock = threading.Lock()
+_versions: Dict[str, int] = {}
+_watched = False
+
+
+def version_key(market: str, month: str) -> str:
+    """``"DAM:2024-08"``: the granularity at which ingest bumps versions."""
+    return f"{market.upper()}:{month}"
+
+
+def month_keys(market: str, start: date, end: date) -> List[str]:
+    """Version keys for every calendar month ``start..end`` touches."""
+    keys = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        keys.append(version_key(market, f"{year:04d}-{month:02d}"))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return keys
+
+
+def version_token(versions: Mapping[str, int]) -> str:
+    # Versions only grow, so the count and sum change on every bump.
+    return f"{len(versions)}-{sum(versions.values())}"
+
+
+def current_data_version() -> str:
+    """Opaque token that changes whenever any market/month version moves; equal across workers."""
+    with _lock:
+        return version_token(_versions)
+
+
+def data_versions() -> Dict[str, int]:
+    with _lock:
+        return dict(_versions)
+
+
+def changed_keys(old: Mapping[str, int], new: Mapping[str, int]) -> Set[str]:
+    return {key for key in set(old) | set(new) if old.get(key) != new.get(key)}
+
+
+def apply_data_versions(versions: Mapping[str, int]) -> Set[str]:
+    """Replace the known versions; returns the keys whose version changed."""
+    with _lock:
+        changed = changed_keys(_versions, versions)
+        _versions.clear()
+        _versions.update(versions)
+    return changed
+
+
+def set_versions_watched(watched: bool) -> None:
+    """Record whether a watcher keeps this process's versions in step with the table."""
+    global _watched
+    _watched = watched
+
+
+def versions_watched() -> bool:
+    """False when only this process's own ingests move its versions (watcher disabled or stopped)."""
+    return _watched
+
+
+def newer_than(known: Mapping[str, int], keys: Iterable[str]) -> bool:
+    """True if any of ``keys`` has moved past the version recorded in ``known``."""
+    with _lock:
+        return any(_versions.get(key, 0) > known.get(key, 0) for key in keys)
+
+
+__all__ = [
+    "apply_data_versions",
+    "changed_keys",
+    "current_data_version",
+    "data_versions",
+    "month_keys",
+    "newer_than",
+    "set_versions_watched",
+    "version_key",
+    "version_token",
+    "versions_watched",
+]
@@ -1,37 +1,196 @@
+import atexit
+import json
 import logging
+import queue
+import sys
+import threading
+import traceback
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from loguru import logger
 
 from .config import get_settings
+from .metrics import LOG_RECORDS_DROPPED
+from .security import get_correlation_id
 
 _LOGGER_INITIALISED = False
+_STOP = object()
+_sink: Optional["QueueSink"] = None
 
+Writer = Callable[[str], None]
 
-def _configure_loguru(log_level: str, log_dir: Optional[Path] = None) -> None:
-    logger.remove()
-    level = log_level.upper()
-    logger.add(lambda msg: logging.getLogger("energyminds").handle(msg), level=level)
 
-    if log_dir:
-        log_dir.mkdir(parents=True, exist_ok=True)
-        file_handler = RotatingFileHandler(log_dir / "app.log", maxBytes=10 * 1024 * 1024, backupCount=5)
-        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
-        file_handler.setFormatter(formatter)
-        logging.getLogger("energyminds").addHandler(file_handler)
+def _json_line(record: Dict[str, Any]) -> str:
+    payload: Dict[str, Any] = {
+        "ts": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "message": record["message"],
+    }
+    payload.update(record["extra"])
+    exception = record["exception"]
+    if exception is not None:
+        payload["exception"] = "".join(traceback.format_exception(exception.type, exception.value, exception.traceback))
+    return json.dumps(payload, default=str)
+
+
+def _text_line(record: Dict[str, Any]) -> str:
+    fields = " ".join(f"{key}={value}" for key, value in record["extra"].items())
+    line = f"{record['time']:%Y-%m-%d %H:%M:%S.%f} {record['level'].name:<8} {record['name']} {record['message']}"
+    if fields:
+        line = f"{line} {fields}"
+    exception = record["exception"]
+    if exception is not None:
+        line += "\n" + "".join(traceback.format_exception(exception.type, exception.value, exception.traceback)).rstrip()
+    return line
+
+
+class QueueSink:
+    """Loguru sink that hands records to a background writer thread.
+
+    The caller only does a ``put_nowait`` on a bounded queue, so logging never waits on a
+    terminal or disk. Formatting happens on the writer thread; if it falls behind, records
+    are dropped and counted in ``energyminds_log_records_dropped_total``.
+    """
+
+    def __init__(self, writers: List[Writer], *, json_output: bool, maxsize: int = 10000) -> None:
+        self._writers = writers
+        self._format = _json_line if json_output else _text_line
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message: Any) -> None:
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is _STOP:
+                return
+            try:
+                line = self._format(record)
+                for write in self._writers:
+                    write(line)
+            except Exception:  # pragma: no cover - never let a bad record kill the writer
+                traceback.print_exc(file=sys.__stderr__)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Drain queued records and stop the writer thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:  # pragma: no cover - writer wedged; give up rather than hang shutdown
+            return
+        self._thread.join(timeout)
+
+
+def _stream_writer(stream: Any) -> Writer:
+    def write(line: str) -> None:
+        stream.write(line + "\n")
+        stream.flush()
+
+    return write
+
+
+def _file_writer(log_dir: Path) -> Writer:
+    log_dir.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(log_dir / "app.log", maxBytes=10 * 1024 * 1024, backupCount=5)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def write(line: str) -> None:
+        # Only the writer thread touches the handler, so rotation never runs on a request.
+        handler.handle(logging.makeLogRecord({"msg": line}))
+
+    return write
 
 
-def configure_logging(log_dir: Optional[str] = None) -> None:
-    global _LOGGER_INITIALISED
-    if _LOGGER_INITIALISED:
+class InterceptHandler(logging.Handler):
+    """Route stdlib records (uvicorn, SQLAlchemy, the bot client) through loguru's sink."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            level: Any = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        origin = {"name": record.name, "function": record.funcName, "line": record.lineno}
+        logger.patch(lambda r: r.update(origin)).opt(exception=record.exc_info).log(level, record.getMessage())  # type: ignore[call-arg]
+
+
+def _add_correlation_id(record: Dict[str, Any]) -> None:
+    correlation_id = get_correlation_id()
+    if correlation_id is not None:
+        record["extra"].setdefault("correlation_id", correlation_id)
+
+
+def configure_logging(log_dir: Optional[str] = None, *, writers: Optional[List[Writer]] = None, force: bool = False) -> None:
+    """Install the queued sink; ``writers`` replaces stderr/file output (used by benchmarks)."""
+    global _LOGGER_INITIALISED, _sink
+    if _LOGGER_INITIALISED and not force:
         return
 
     settings = get_settings()
-    logging.basicConfig(level=settings.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s %(message)s")
-    _configure_loguru(settings.log_level, Path(log_dir) if log_dir else None)
+    shutdown_logging()
+    if writers is None:
+        writers = [_stream_writer(sys.stderr)]
+        if log_dir:
+            writers.append(_file_writer(Path(log_dir)))
+
+    logger.remove()
+    logger.configure(patcher=_add_correlation_id)
+    _sink = QueueSink(writers, json_output=settings.log_json, maxsize=settings.log_queue_size)
+    logger.add(_sink, level=settings.log_level.upper(), format="{message}", catch=True)
+    logging.basicConfig(handlers=[InterceptHandler()], level=settings.log_level.upper(), force=True)
     _LOGGER_INITIALISED = True
 
 
-__all__ = ["configure_logging", "logger"]
+def shutdown_logging() -> None:
+    global _LOGGER_INITIALISED, _sink
+    if _sink is not None:
+        _sink.stop()
+        _sink = None
+    _LOGGER_INITIALISED = False
+
+
+atexit.register(shutdown_logging)
+
+
+class SampledWarnings:
+    """Per-row warning sampler for loaders.
+
+    The first ``first`` occurrences of each key are logged, then one in every ``every``;
+    ``flush`` logs how many were suppressed so a bad file cannot flood the log pipeline.
+    """
+
+    def __init__(self, source: str, first: Optional[int] = None, every: Optional[int] = None) -> None:
+        settings = get_settings()
+        self.source = source
+        self.first = settings.etl_warning_sample_first if first is None else first
+        self.every = settings.etl_warning_sample_every if every is None else every
+        self.counts: Dict[str, int] = {}
+
+    def warn(self, key: str, message: str, **fields: Any) -> None:
+        count = self.counts[key] = self.counts.get(key, 0) + 1
+        if count <= self.first or (self.every > 0 and (count - self.first) % self.every == 0):
+            logger.bind(source=self.source, warning=key, occurrence=count).warning(message, **fields)
+
+    def flush(self) -> None:
+        for key, count in self.counts.items():
+            suppressed = count - self.first - (max(count - self.first, 0) // self.every if self.every > 0 else 0)
+            if suppressed > 0:
+                logger.warning(
+                    "{source}: {total} '{warning}' warnings, {suppressed} not logged individually",
+                    source=self.source,
+                    warning=key,
+                    total=count,
+                    suppressed=suppressed,
+                )
+
+
+__all__ = ["InterceptHandler", "QueueSink", "SampledWarnings", "configure_logging", "logger", "shutdown_logging"]
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+INGEST_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    """One metric family held in this process's memory.
+
+    Values are per process: with several uvicorn workers each keeps its own registry, and
+    ``/api/metrics`` returns whichever worker served the scrape. Nothing aggregates them.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines for every series, without the ``HELP``/``TYPE`` header."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        # Unlabelled series are exported as zero before their first update.
+        self._values: Dict[LabelValues, float] = {} if self.labelnames else {(): 0.0}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+@dataclass
+class _HistogramState:
+    buckets: List[int]
+    count: int = 0
+    total: float = 0.0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.bounds = tuple(sorted(buckets)) + (float("inf"),)
+        self._states: Dict[LabelValues, _HistogramState] = {}
+        if not self.labelnames:
+            self._states[()] = _HistogramState(buckets=[0] * len(self.bounds))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _HistogramState(buckets=[0] * len(self.bounds))
+            state.buckets[index] += 1
+            state.count += 1
+            state.total += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        state = self._states.get(self._key(labels))
+        return state.count if state else 0
+
+    def samples(self) -> List[str]:
+        lines: List[str] = []
+        with self._lock:
+            items = sorted((key, list(s.buckets), s.count, s.total) for key, s in self._states.items())
+        for key, buckets, count, total in items:
+            cumulative = 0
+            for bound, hits in zip(self.bounds, buckets):
+                cumulative += hits
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+@dataclass
+class Registry:
+    metrics: Dict[str, _Metric] = field(default_factory=dict)
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+
+HTTP_REQUEST_SECONDS = histogram(
+    "energyminds_http_request_duration_seconds",
+    "HTTP request latency by route template, market and status.",
+    ("method", "route", "market", "status"),
+)
+PRICE_QUERIES = counter(
+    "energyminds_price_queries_total",
+    "Price queries by market and the source that answered them (summary|raw).",
+    ("market", "source"),
+)
+PRICE_CUBE_LOOKUPS = counter(
+    "energyminds_price_cube_lookups_total",
+    "Price cube lookups by result (hit|uncovered|stale|missing); all but hit fall back to the DB.",
+    ("result",),
+)
+COALESCED_REQUESTS = counter(
+    "energyminds_coalesced_requests_total",
+    "Requests answered by joining an identical in-flight query instead of running their own.",
+    ("endpoint",),
+)
+QUERY_ADMISSIONS = counter(
+    "energyminds_query_admissions_total",
+    "Price queries by route and admission decision (admitted|queued|rejected|timed_out).",
+    ("route", "decision"),
+)
+STATEMENT_TIMEOUTS = counter(
+    "energyminds_statement_timeouts_total",
+    "Price queries cancelled by the database statement_timeout.",
+)
+DB_POOL_CHECKOUT_SECONDS = histogram(
+    "energyminds_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled DB connection.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_CONNECTIONS = gauge(
+    "energyminds_db_pool_connections",
+    "Pooled DB connections by state (checked_out|checked_in|overflow|size).",
+    ("state",),
+)
+INGEST_ROWS = counter("energyminds_ingest_rows_total", "Rows written by ingest file type.", ("file_type",))
+INGEST_SECONDS = counter(
+    "energyminds_ingest_seconds_total", "Wall time spent ingesting by file type.", ("file_type",)
+)
+INGEST_ROWS_PER_SECOND = gauge(
+    "energyminds_ingest_rows_per_second", "Throughput of the most recent ingest run.", ("file_type",)
+)
+INGEST_STAGE_SECONDS = histogram(
+    "energyminds_ingest_stage_duration_seconds",
+    "Duration of each loader stage.",
+    ("file_type", "stage"),
+    buckets=INGEST_BUCKETS,
+)
+INGEST_FAILURES = counter("energyminds_ingest_failures_total", "Failed ingest runs by file type.", ("file_type",))
+LOG_RECORDS_DROPPED = counter(
+    "energyminds_log_records_dropped_total", "Log records dropped because the background writer fell behind."
+)
+
+
+@dataclass
+class IngestRun:
+    file_type: str
+    rows: int = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        with INGEST_STAGE_SECONDS.time(file_type=self.file_type, stage=name):
+            yield
+
+
+@contextmanager
+def track_ingest(file_type: str) -> Iterator[IngestRun]:
+    """Record rows, throughput and failures for one loader invocation."""
+    run = IngestRun(file_type=file_type)
+    start = perf_counter()
+    try:
+        yield run
+    except Exception:
+        INGEST_FAILURES.inc(file_type=file_type)
+        raise
+    finally:
+        elapsed = perf_counter() - start
+        INGEST_ROWS.inc(run.rows, file_type=file_type)
+        INGEST_SECONDS.inc(elapsed, file_type=file_type)
+        if elapsed > 0:
+            INGEST_ROWS_PER_SECOND.set(run.rows / elapsed, file_type=file_type)
+
+
+def update_pool_gauges(pool: object) -> None:
+    """Snapshot ``QueuePool`` occupancy; pools without these counters (e.g. SQLite) are skipped."""
+    for state, attr in (("checked_out", "checkedout"), ("checked_in", "checkedin"), ("overflow", "overflow"), ("size", "size")):
+        reader = getattr(pool, attr, None)
+        if callable(reader):
+            value = float(reader())
+            if state == "overflow":
+                # QueuePool.overflow() counts down from -pool_size until the pool is full.
+                value = max(value, 0.0)
+            DB_POOL_CONNECTIONS.set(value, state=state)
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "IngestRun",
+    "REGISTRY",
+    "Registry",
+    "counter",
+    "gauge",
+    "histogram",
+    "track_ingest",
+    "update_pool_gauges",
+]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import functools
+import io
+import itertools
+import pstats
+import re
+import secrets
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Optional
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.routing import APIRoute
+
+from app.core.config import Settings
+from app.core.logging import logger
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_NAME_RE = re.compile(r"^[\w.-]+$")
+STATS_LIMIT = 60
+
+
+@dataclass
+class ProfileCapture:
+    """Profiles collected for one request; endpoints may run on a worker thread."""
+
+    reason: str
+    profiles: List[cProfile.Profile] = field(default_factory=list)
+
+
+_active: ContextVar[Optional[ProfileCapture]] = ContextVar("profile_capture", default=None)
+
+
+def _profiled(call: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an endpoint so it runs under cProfile when the request asked for it.
+
+    cProfile only sees the thread that enables it, so the profiler starts inside the
+    endpoint call, which for sync handlers is the threadpool worker doing the work.
+    """
+    if asyncio.iscoroutinefunction(call):
+
+        @functools.wraps(call)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            capture = _active.get()
+            if capture is None:
+                return await call(*args, **kwargs)
+            profiler = cProfile.Profile()
+            capture.profiles.append(profiler)
+            profiler.enable()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                profiler.disable()
+
+        return async_wrapper
+
+    @functools.wraps(call)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        capture = _active.get()
+        if capture is None:
+            return call(*args, **kwargs)
+        profiler = cProfile.Profile()
+        capture.profiles.append(profiler)
+        profiler.enable()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            profiler.disable()
+
+    return wrapper
+
+
+class RequestProfiler:
+    """Decides which requests to profile and stores the results under ``directory``.
+
+    A request is profiled when it sends ``X-Profile: <PROFILE_TOKEN>``, or when it is the
+    N-th request since the last sample (``PROFILE_SAMPLE_EVERY``).
+    """
+
+    def __init__(self, directory: Path, token: Optional[str] = None, sample_every: int = 0) -> None:
+        self.directory = directory
+        self.token = token
+        self.sample_every = sample_every
+        self._counter = itertools.count(1)
+
+    def authorised(self, request: Request) -> bool:
+        supplied = request.headers.get(PROFILE_HEADER)
+        return bool(self.token and supplied and secrets.compare_digest(supplied, self.token))
+
+    def reason(self, request: Request) -> Optional[str]:
+        if self.authorised(request):
+            return "header"
+        if self.sample_every > 0 and next(self._counter) % self.sample_every == 0:
+            return "sampled"
+        return None
+
+    def save(self, capture: ProfileCapture, correlation_id: str, request: Request) -> str:
+        """Write ``<name>.prof`` (for snakeviz/pstats) and a ``<name>.txt`` summary; return ``name``."""
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        name = f"{stamp}-{capture.reason}-{re.sub(r'[^A-Za-z0-9_-]', '', correlation_id)[:64]}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(*capture.profiles)
+        stats.dump_stats(str(self.directory / f"{name}.prof"))
+        summary = io.StringIO()
+        summary.write(f"{request.method} {request.url.path}?{request.url.query} correlation_id={correlation_id}\n")
+        pstats.Stats(*capture.profiles, stream=summary).sort_stats("cumulative").print_stats(STATS_LIMIT)
+        (self.directory / f"{name}.txt").write_text(summary.getvalue())
+        return name
+
+
+def install_profiling(app: FastAPI, settings: Settings) -> Optional[RequestProfiler]:
+    """Enable profiling hooks when configured; otherwise leave the app untouched.
+
+    Call after every router is included. With neither ``PROFILE_TOKEN`` nor
+    ``PROFILE_SAMPLE_EVERY`` set no middleware or wrapper is installed, so there is no cost.
+    """
+    if not settings.profile_token and settings.profile_sample_every <= 0:
+        return None
+
+    profiler = RequestProfiler(Path(settings.profile_dir), settings.profile_token, settings.profile_sample_every)
+
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            route.dependant.call = _profiled(route.dependant.call)
+
+    # Registered after the wrapping loop so fetching a profile does not produce another one.
+    if settings.profile_token:
+
+        @app.get("/api/debug/profiles/{name}", include_in_schema=False)
+        def get_profile(name: str, request: Request, format: str = "txt") -> Response:
+            if not profiler.authorised(request):
+                raise HTTPException(status_code=403, detail="Profile access requires a valid X-Profile token")
+            if not PROFILE_NAME_RE.match(name) or format not in ("txt", "prof"):
+                raise HTTPException(status_code=400, detail="Invalid profile name or format")
+            path = profiler.directory / f"{name}.{format}"
+            if not path.is_file():
+                raise HTTPException(status_code=404, detail="Profile not found")
+            if format == "txt":
+                return PlainTextResponse(path.read_text())
+            return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+
+    @app.middleware("http")
+    async def profile_requests(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        reason = profiler.reason(request)
+        if reason is None:
+            return await call_next(request)
+        capture = ProfileCapture(reason=reason)
+        token = _active.set(capture)
+        try:
+            response = await call_next(request)
+        finally:
+            _active.reset(token)
+        if capture.profiles:
+            correlation_id = (
+                response.headers.get("X-Correlation-ID") or request.headers.get("X-Correlation-ID") or "unknown"
+            )
+            name = await asyncio.to_thread(profiler.save, capture, correlation_id, request)
+            response.headers[PROFILE_HEADER] = name
+            logger.bind(profile=name, reason=reason).info("Stored request profile {}", name)
+        return response
+
+    return profiler
+
+
+__all__ = ["PROFILE_HEADER", "ProfileCapture", "RequestProfiler", "install_profiling"]
@@ -1,22 +1,30 @@
 import secrets
 from contextlib import contextmanager
-from typing import Iterator
+from contextvars import ContextVar
+from typing import Iterator, Optional
 
 from starlette.requests import Request
 
+_correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+
 
 def generate_correlation_id() -> str:
     return secrets.token_hex(8)
 
 
+def get_correlation_id() -> Optional[str]:
+    return _correlation_id.get()
+
+
 @contextmanager
 def correlation_context(request: Request) -> Iterator[str]:
     header = request.headers.get("x-correlation-id")
     correlation_id = header or generate_correlation_id()
+    token = _correlation_id.set(correlation_id)
     try:
         yield correlation_id
     finally:
-        pass
+        _correlation_id.reset(token)
 
 
-__all__ = ["generate_correlation_id", "correlation_context"]
+__all__ = ["generate_correlation_id", "get_correlation_id", "correlation_context"]
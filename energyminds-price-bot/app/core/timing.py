@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_DB_HOOKS_INSTALLED = False
+
+
+@dataclass
+class RequestTimings:
+    """Per-request phase durations in milliseconds plus DB query and row counters."""
+
+    phases: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    queries: int = 0
+    rows: int = 0
+
+    def add(self, phase: str, duration_ms: float) -> None:
+        self.phases[phase] += duration_ms
+
+    def server_timing(self, total_ms: float) -> str:
+        parts = []
+        for name, duration in self.phases.items():
+            entry = f"{name};dur={duration:.2f}"
+            if name == "db":
+                entry += f';desc="{self.queries} queries"'
+            elif name == "fetch":
+                entry += f';desc="{self.rows} rows"'
+            parts.append(entry)
+        parts.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(parts)
+
+    def as_log_fields(self) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {f"{name}_ms": round(value, 2) for name, value in self.phases.items()}
+        fields.update(queries=self.queries, rows=self.rows)
+        return fields
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def track_request() -> Iterator[RequestTimings]:
+    """Collect timings for everything that runs in this context, including threadpool work."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, (perf_counter() - start) * 1000)
+
+
+def record_rows(count: int) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.rows += count
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # type: ignore[no-untyped-def]
+    timings = _current.get()
+    starts = conn.info.get("query_start")
+    if timings is None or not starts:
+        return
+    timings.add("db", (perf_counter() - starts.pop()) * 1000)
+    timings.queries += 1
+
+
+def install_db_timing() -> None:
+    """Attach cursor execute listeners to every engine; safe to call more than once."""
+    global _DB_HOOKS_INSTALLED
+    if _DB_HOOKS_INSTALLED:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _DB_HOOKS_INSTALLED = True
+
+
+__all__ = [
+    "RequestTimings",
+    "current_timings",
+    "install_db_timing",
+    "record_rows",
+    "timed",
+    "track_request",
+]
@@ -0,0 +1,159 @@
+"""The ``data_version`` table: ETL-side bumps and the API-side watcher.
+
+Loaders record every market/month they touch on the session and call ``bump_data_versions``
+in their flush stage, so version rows commit or roll back with the price rows. On Postgres the
+bump also sends ``NOTIFY data_version`` (delivered on commit) and the watcher ``LISTEN``s; it
+re-reads the table on every notification and every ``DATA_VERSION_POLL_SECONDS`` regardless,
+which is also the whole mechanism on SQLite.
+"""
+from __future__ import annotations
+
+import select
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import func
+from sqlalchemy import select as sql_select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.data_version import apply_data_versions, set_versions_watched, version_key
+from app.core.logging import logger
+from app.db import models
+
+CHANNEL = "data_version"
+_PENDING = "data_version_keys"
+
+
+def touch_data_version(session: Session, market: str, trade_date: date) -> None:
+    """Remember that this session wrote ``market`` data for ``trade_date``'s month."""
+    session.info.setdefault(_PENDING, set()).add((market, f"{trade_date:%Y-%m}"))
+
+
+def bump_data_versions(session: Session) -> List[str]:
+    """Increment the version of every market/month touched since the last bump, in the session's transaction."""
+    pending = session.info.pop(_PENDING, set())
+    if not pending:
+        return []
+    # Sorted so concurrent ingests lock rows in the same order.
+    rows = [{"market": market, "month": month, "version": 1} for market, month in sorted(pending)]
+    table = models.DataVersion
+    dialect = session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.market, table.month],
+            set_={"version": table.version + 1, "updated_at": func.now()},
+        )
+        session.execute(stmt)
+    else:  # pragma: no cover - other backends are not deployed
+        for row in rows:
+            existing = session.get(table, (row["market"], row["month"]))
+            if existing:
+                existing.version += 1
+            else:
+                session.add(table(**row))
+        session.flush()
+
+    keys = [version_key(row["market"], row["month"]) for row in rows]
+    if dialect == "postgresql":
+        session.execute(sql_select(func.pg_notify(CHANNEL, ",".join(keys))))
+    return keys
+
+
+def read_data_versions(bind: Any) -> Dict[str, int]:
+    """All versions as ``{"DAM:2024-08": 3}``; ``bind`` is a ``Session`` or ``Connection``."""
+    table = models.DataVersion
+    rows = bind.execute(sql_select(table.market, table.month, table.version))
+    return {version_key(market, month): int(version) for market, month, version in rows}
+
+
+def sync_data_versions(session: Session) -> Set[str]:
+    """Refresh this process's view right away, e.g. after the ingest route commits."""
+    return apply_data_versions(read_data_versions(session))
+
+
+class DataVersionWatcher:
+    """Background thread keeping ``app.core.data_version`` in step with the table."""
+
+    def __init__(self, engine: Engine, poll_seconds: float) -> None:
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> Set[str]:
+        with self.engine.connect() as connection:
+            changed = apply_data_versions(read_data_versions(connection))
+        if changed:
+            logger.bind(keys=sorted(changed)).info("Data versions changed for {} market/month keys", len(changed))
+        return changed
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="data-version-watcher", daemon=True)
+        self._thread.start()
+        set_versions_watched(True)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        set_versions_watched(False)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                if self.engine.dialect.name == "postgresql":
+                    self._listen()
+                else:
+                    self.refresh()
+                    self._stop.wait(self.poll_seconds)
+                failures = 0
+            except Exception as exc:
+                failures += 1
+                # Keep serving with the last known versions; say so once, not every poll.
+                if failures == 1:
+                    logger.warning("Data version watcher failed, retrying: {}", exc)
+                self._stop.wait(self.poll_seconds)
+
+    def _listen(self) -> None:
+        raw = self.engine.raw_connection()
+        try:
+            connection = raw.driver_connection
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            while not self._stop.is_set():
+                self.refresh()
+                readable, _, _ = select.select([connection], [], [], self.poll_seconds)
+                if readable:
+                    connection.poll()
+                    connection.notifies.clear()
+        finally:
+            raw.invalidate()
+
+
+def start_data_version_watcher(engine: Engine) -> Optional[DataVersionWatcher]:
+    """Start the watcher unless ``DATA_VERSION_POLL_SECONDS`` is 0."""
+    poll_seconds = get_settings().data_version_poll_seconds
+    if poll_seconds <= 0:
+        return None
+    watcher = DataVersionWatcher(engine, poll_seconds)
+    watcher.start()
+    return watcher
+
+
+__all__ = [
+    "DataVersionWatcher",
+    "bump_data_versions",
+    "read_data_versions",
+    "start_data_version_watcher",
+    "sync_data_versions",
+    "touch_data_version",
+]
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import CheckConstraint, Date, ForeignKey, Index, Numeric, SmallInteger, String, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    SmallInteger,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
+from .types import Paise, RoundedFloat
 
 
 class MarketDay(Base):
@@ -15,8 +27,13 @@ class MarketDay(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     market: Mapped[str] = mapped_column(String(16), nullable=False)
     trade_date: Mapped[date] = mapped_column(Date, nullable=False)
+    # Minutes per stored price row; 60 for GDAM days kept at their hourly source resolution.
+    resolution_minutes: Mapped[int] = mapped_column(SmallInteger, nullable=False, server_default="15")
 
-    __table_args__ = (UniqueConstraint("market", "trade_date", name="uq_market_trade_date"),)
+    __table_args__ = (
+        UniqueConstraint("market", "trade_date", name="uq_market_trade_date"),
+        CheckConstraint("resolution_minutes IN (15, 60)", name="ck_market_day_resolution"),
+    )
 
     dam_prices: Mapped[list[DamPrice]] = relationship(back_populates="market_day", cascade="all, delete-orphan")
     gdam_prices: Mapped[list[GdamPrice]] = relationship(back_populates="market_day", cascade="all, delete-orphan")
@@ -30,7 +47,7 @@ class DamPrice(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     market_day_id: Mapped[int] = mapped_column(ForeignKey("market_day.id", ondelete="CASCADE"), nullable=False)
     hour_block: Mapped[int] = mapped_column(SmallInteger, nullable=False)
-    mcp_rs_per_mwh: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    mcp_rs_per_mwh: Mapped[float] = mapped_column("mcp_paise_per_mwh", Paise, nullable=False)
 
     __table_args__ = (
         CheckConstraint("hour_block BETWEEN 0 AND 23", name="ck_dam_hour_block"),
@@ -47,9 +64,9 @@ class GdamPrice(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     market_day_id: Mapped[int] = mapped_column(ForeignKey("market_day.id", ondelete="CASCADE"), nullable=False)
     quarter_index: Mapped[int] = mapped_column(SmallInteger, nullable=False)
-    mcp_rs_per_mwh: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
-    hydro_fsv_mw: Mapped[Optional[float]] = mapped_column(Numeric(12, 2), nullable=True)
-    scheduled_volume_mw: Mapped[Optional[float]] = mapped_column(Numeric(12, 2), nullable=True)
+    mcp_rs_per_mwh: Mapped[float] = mapped_column("mcp_paise_per_mwh", Paise, nullable=False)
+    hydro_fsv_mw: Mapped[Optional[float]] = mapped_column(RoundedFloat(2), nullable=True)
+    scheduled_volume_mw: Mapped[Optional[float]] = mapped_column(RoundedFloat(2), nullable=True)
 
     __table_args__ = (
         CheckConstraint("quarter_index BETWEEN 0 AND 95", name="ck_gdam_quarter"),
@@ -68,9 +85,9 @@ class RtmPrice(Base):
     hour: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     session_id: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
     quarter_index: Mapped[int] = mapped_column(SmallInteger, nullable=False)
-    mcv_mw: Mapped[Optional[float]] = mapped_column(Numeric(12, 2), nullable=True)
-    fsv_mw: Mapped[Optional[float]] = mapped_column(Numeric(12, 2), nullable=True)
-    mcp_rs_per_mwh: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    mcv_mw: Mapped[Optional[float]] = mapped_column(RoundedFloat(2), nullable=True)
+    fsv_mw: Mapped[Optional[float]] = mapped_column(RoundedFloat(2), nullable=True)
+    mcp_rs_per_mwh: Mapped[float] = mapped_column("mcp_paise_per_mwh", Paise, nullable=False)
 
     __table_args__ = (
         CheckConstraint("hour BETWEEN 1 AND 24", name="ck_rtm_hour"),
@@ -88,14 +105,36 @@ class MarketSummary(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     market_day_id: Mapped[int] = mapped_column(ForeignKey("market_day.id", ondelete="CASCADE"), nullable=False)
     label: Mapped[str] = mapped_column(String(64), nullable=False)
-    value: Mapped[float] = mapped_column(Numeric(12, 4), nullable=False)
+    value: Mapped[float] = mapped_column(RoundedFloat(4), nullable=False)
 
     __table_args__ = (UniqueConstraint("market_day_id", "label", name="uq_summary_label"),)
 
     market_day: Mapped[MarketDay] = relationship(back_populates="summaries")
 
 
+class DataVersion(Base):
+    """Per market/month change counter, bumped in the same transaction as the ingest upserts."""
+
+    __tablename__ = "data_version"
+
+    market: Mapped[str] = mapped_column(String(16), primary_key=True)
+    month: Mapped[str] = mapped_column(String(7), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=1)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class Holiday(Base):
+    """Exchange holiday calendar used by the ``day_type``/``exclude_holidays`` price filters."""
+
+    __tablename__ = "holiday"
+
+    holiday_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    name: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+
+
 __all__ = [
+    "DataVersion",
+    "Holiday",
     "MarketDay",
     "DamPrice",
     "GdamPrice",
@@ -0,0 +1,324 @@
+"""Memory-mapped per-market price grids for recent data.
+
+Every market is a dense ``days x slots`` grid (24 hourly DAM blocks, 96 GDAM/RTM quarters),
+so two years of all three markets is a few MB of float64. ``write_price_cube`` dumps the
+grids as ``.npy`` files plus a ``manifest.json``; API workers map them read-only with
+``np.load(mmap_mode="r")`` and share the pages through the OS cache.
+
+The manifest is replaced atomically. Ingest marks it invalid before committing and rewrites it
+once the new cube is on disk, so readers that see an invalid, missing or unreadable manifest
+fall back to the database instead of serving stale prices. The manifest also records the
+``data_version`` of every market/month it holds; a query touching a month whose version has
+since moved (e.g. an ETL job run outside the API) goes to the database as well.
+"""
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import shutil
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.metrics import PRICE_CUBE_LOOKUPS
+from app.db import models
+from app.db.data_version import read_data_versions
+from app.db.resolution import expand_quarters, quarter_slot
+from app.db.types import rupees
+
+MANIFEST = "manifest.json"
+SLOTS_PER_DAY = {"DAM": 24, "GDAM": 96, "RTM": 96}
+
+
+@dataclass
+class CubeWindow:
+    """Per-day results for one query, in trade-date order."""
+
+    dates: List[date]
+    values: List[float]
+    # ``None`` per day when ``summary``: published averages carry no slot count.
+    counts: List[Optional[int]]
+    summary: bool
+
+
+@dataclass
+class MarketGrid:
+    start: date
+    covers_all: bool
+    values: np.ndarray
+    weights: Optional[np.ndarray]
+    days: np.ndarray
+    labels: Dict[str, int]
+    summaries: np.ndarray
+
+    def bounds(self, start: date, end: date) -> Optional[Tuple[int, int]]:
+        """Row slice for ``start..end``; ``None`` when the grid cannot answer for the whole range.
+
+        Days after the grid are empty in the database too while the cube is valid, so only the
+        lower bound has to be inside the grid unless it already holds the market's full history.
+        """
+        first = (start - self.start).days
+        last = min((end - self.start).days + 1, len(self.days))
+        if first < 0:
+            if not self.covers_all:
+                return None
+            first = 0
+        return first, max(first, last)
+
+
+class PriceCube:
+    def __init__(self, build: str, markets: Dict[str, MarketGrid], versions: Dict[str, int]) -> None:
+        self.build = build
+        self.markets = markets
+        self.versions = versions
+
+    @classmethod
+    def load(cls, directory: Path, manifest: Dict[str, Any]) -> "PriceCube":
+        build_dir = directory / manifest["build"]
+        markets: Dict[str, MarketGrid] = {}
+        for market, meta in manifest["markets"].items():
+            weights_path = build_dir / f"{market}-weights.npy"
+            markets[market] = MarketGrid(
+                start=date.fromisoformat(meta["start"]),
+                covers_all=meta["covers_all"],
+                values=np.load(build_dir / f"{market}-values.npy", mmap_mode="r"),
+                weights=np.load(weights_path, mmap_mode="r") if weights_path.exists() else None,
+                days=np.load(build_dir / f"{market}-days.npy", mmap_mode="r"),
+                labels={label: index for index, label in enumerate(meta["labels"])},
+                summaries=np.load(build_dir / f"{market}-summaries.npy", mmap_mode="r"),
+            )
+        return cls(manifest["build"], markets, manifest.get("versions", {}))
+
+    def window(
+        self,
+        market: str,
+        start: date,
+        end: date,
+        start_hour: int,
+        end_hour: int,
+        weighted: bool,
+        aggregate: str,
+        summary_label: Optional[str] = None,
+    ) -> Optional[CubeWindow]:
+        """Aggregate one query with the same rules as the SQL path; ``None`` if not covered.
+
+        ``summary_label`` is passed for plain averages on markets with exchange-published
+        window averages; they are used only when every trading day in range carries one.
+        """
+        grid = self.markets.get(market)
+        bounds = grid.bounds(start, end) if grid is not None else None
+        if grid is None or bounds is None:
+            return None
+        first, last = bounds
+        per_hour = SLOTS_PER_DAY[market] // 24
+
+        trading = np.flatnonzero(grid.days[first:last])
+        label_index = grid.labels.get(summary_label) if summary_label is not None else None
+        if label_index is not None and trading.size:
+            published = grid.summaries[label_index, first:last][trading]
+            if not np.isnan(published).any():
+                return CubeWindow(
+                    dates=[grid.start + timedelta(days=int(first + day)) for day in trading],
+                    values=published.tolist(),
+                    counts=[None] * len(trading),
+                    summary=True,
+                )
+
+        values = grid.values[first:last, start_hour * per_hour : end_hour * per_hour]
+        present = ~np.isnan(values)
+        counts = present.sum(axis=1)
+        rows = np.flatnonzero(counts)
+        if not rows.size:
+            return CubeWindow(dates=[], values=[], counts=[], summary=False)
+        values, present, counts = values[rows], present[rows], counts[rows]
+        filled = np.where(present, values, 0.0)
+
+        if aggregate == "min":
+            result = np.where(present, values, np.inf).min(axis=1)
+        elif aggregate == "max":
+            result = np.where(present, values, -np.inf).max(axis=1)
+        else:
+            result = filled.sum(axis=1) / counts
+            if weighted and grid.weights is not None:
+                # Missing weights count as zero; a day without any weight keeps its plain mean.
+                raw = grid.weights[first:last, start_hour * per_hour : end_hour * per_hour][rows]
+                weights = np.where(present & ~np.isnan(raw), raw, 0.0)
+                total = weights.sum(axis=1)
+                weighted_mean = (filled * weights).sum(axis=1) / np.where(total == 0, 1.0, total)
+                result = np.where(total == 0, result, weighted_mean)
+
+        return CubeWindow(
+            dates=[grid.start + timedelta(days=int(first + day)) for day in rows],
+            values=result.tolist(),
+            counts=counts.tolist(),
+            summary=False,
+        )
+
+
+class PriceCubeStore:
+    """Keeps the mapped cube for one directory, reloading when the manifest file changes.
+
+    The check is one ``os.stat`` per lookup; ``os.replace`` gives every manifest a new inode.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._cube: Optional[PriceCube] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[PriceCube]:
+        try:
+            info = os.stat(self.directory / MANIFEST)
+        except FileNotFoundError:
+            PRICE_CUBE_LOOKUPS.inc(result="missing")
+            return None
+        stamp = (info.st_ino, info.st_mtime_ns, info.st_size)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._cube = self._load()
+                    self._stamp = stamp
+        if self._cube is None:
+            PRICE_CUBE_LOOKUPS.inc(result="stale")
+        return self._cube
+
+    def _load(self) -> Optional[PriceCube]:
+        try:
+            manifest = json.loads((self.directory / MANIFEST).read_text())
+            if not manifest.get("valid"):
+                return None
+            return PriceCube.load(self.directory, manifest)
+        except (OSError, ValueError, KeyError):
+            # A half-pruned or corrupt build is treated like a stale one: the DB answers.
+            return None
+
+
+@lru_cache(maxsize=None)
+def get_price_cube_store(directory: str) -> PriceCubeStore:
+    return PriceCubeStore(Path(directory))
+
+
+def _write_manifest(directory: Path, manifest: Dict[str, Any]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / f".{MANIFEST}.{secrets.token_hex(4)}"
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, directory / MANIFEST)
+
+
+def invalidate_price_cube(directory: str) -> None:
+    """Send readers to the database until the next ``write_price_cube``; call before committing."""
+    _write_manifest(Path(directory), {"valid": False, "invalidated_at": datetime.now(timezone.utc).isoformat()})
+
+
+def _market_rows(session: Session, market: str, since: date) -> List[Any]:
+    table: Any
+    if market == "DAM":
+        table = models.DamPrice
+        stmt = select(models.MarketDay.trade_date, table.hour_block, rupees(table.mcp_rs_per_mwh))
+    elif market == "GDAM":
+        table = models.GdamPrice
+        weight = func.coalesce(table.scheduled_volume_mw, table.hydro_fsv_mw)
+        stmt = select(models.MarketDay.trade_date, quarter_slot(table), rupees(table.mcp_rs_per_mwh), weight)
+    else:
+        table = models.RtmPrice
+        stmt = select(models.MarketDay.trade_date, table.quarter_index, rupees(table.mcp_rs_per_mwh), table.fsv_mw)
+    stmt = stmt.join(table)
+    if market == "GDAM":
+        # Hourly-stored days expand to their four quarters.
+        stmt = expand_quarters(stmt)
+    stmt = stmt.where(models.MarketDay.market == market, models.MarketDay.trade_date >= since)
+    return list(session.execute(stmt).all())
+
+
+def _build_market(session: Session, build_dir: Path, market: str, days: int) -> Optional[Dict[str, Any]]:
+    first, latest = session.execute(
+        select(func.min(models.MarketDay.trade_date), func.max(models.MarketDay.trade_date)).where(
+            models.MarketDay.market == market
+        )
+    ).one()
+    if latest is None:
+        return None
+    start = max(first, latest - timedelta(days=days - 1))
+    length = (latest - start).days + 1
+    slots = SLOTS_PER_DAY[market]
+
+    trading = np.zeros(length, dtype=bool)
+    day_rows = session.execute(
+        select(models.MarketDay.trade_date).where(models.MarketDay.market == market, models.MarketDay.trade_date >= start)
+    ).scalars()
+    trading[[(trade_date - start).days for trade_date in day_rows]] = True
+
+    values = np.full((length, slots), np.nan)
+    weights = np.full((length, slots), np.nan) if market != "DAM" else None
+    rows = _market_rows(session, market, start)
+    if rows:
+        day_index = np.fromiter(((row[0] - start).days for row in rows), dtype=np.int64, count=len(rows))
+        slot_index = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+        values[day_index, slot_index] = [row[2] for row in rows]
+        if weights is not None:
+            weights[day_index, slot_index] = [np.nan if row[3] is None else row[3] for row in rows]
+
+    summary_rows = session.execute(
+        select(models.MarketDay.trade_date, models.MarketSummary.label, models.MarketSummary.value)
+        .join(models.MarketSummary)
+        .where(models.MarketDay.market == market, models.MarketDay.trade_date >= start)
+    ).all()
+    labels = sorted({label for _, label, _ in summary_rows})
+    label_index = {label: index for index, label in enumerate(labels)}
+    summaries = np.full((len(labels), length), np.nan)
+    for trade_date, label, value in summary_rows:
+        summaries[label_index[label], (trade_date - start).days] = value
+
+    np.save(build_dir / f"{market}-values.npy", values)
+    if weights is not None:
+        np.save(build_dir / f"{market}-weights.npy", weights)
+    np.save(build_dir / f"{market}-days.npy", trading)
+    np.save(build_dir / f"{market}-summaries.npy", summaries)
+    return {"start": start.isoformat(), "days": length, "slots": slots, "covers_all": start == first, "labels": labels}
+
+
+def write_price_cube(session: Session, directory: str, days: int = 731) -> Dict[str, Any]:
+    """Build the cube for the last ``days`` trading-calendar days of every market and publish it."""
+    root = Path(directory)
+    build = f"cube-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{secrets.token_hex(3)}"
+    build_dir = root / build
+    build_dir.mkdir(parents=True)
+    markets: Dict[str, Any] = {}
+    for market in SLOTS_PER_DAY:
+        meta = _build_market(session, build_dir, market, days)
+        if meta is not None:
+            markets[market] = meta
+    manifest = {
+        "valid": True,
+        "build": build,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "markets": markets,
+        "versions": read_data_versions(session),
+    }
+    _write_manifest(root, manifest)
+
+    # Keep the previous build so a worker mid-reload can still open it; mapped files stay
+    # readable after unlinking, so older builds are safe to drop.
+    older = [path for path in root.glob("cube-*") if path.is_dir() and path != build_dir]
+    for stale in sorted(older, key=lambda path: path.stat().st_mtime_ns)[:-1]:
+        shutil.rmtree(stale, ignore_errors=True)
+    return manifest
+
+
+__all__ = [
+    "CubeWindow",
+    "PriceCube",
+    "PriceCubeStore",
+    "get_price_cube_store",
+    "invalidate_price_cube",
+    "write_price_cube",
+]
@@ -0,0 +1,45 @@
+"""Slot resolution of stored market days.
+
+GDAM days from the hourly DAMGDAM workbook can be stored once per hour instead of once per
+quarter: a single ``gdam_price`` row at the hour's first quarter (``quarter_index = hour * 4``)
+on a ``market_day`` with ``resolution_minutes = 60``. Readers join ``QUARTER_STEPS`` to expand
+each such row back into its four quarters, so every aggregate sees the same rows as before.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from sqlalchemy import Select, literal_column, select, union_all
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db import models
+
+QUARTER_MINUTES = 15
+HOUR_MINUTES = 60
+
+# Stored slot length per market when a loader doesn't say otherwise.
+DEFAULT_RESOLUTION: Dict[str, int] = {"DAM": HOUR_MINUTES, "GDAM": QUARTER_MINUTES, "RTM": QUARTER_MINUTES}
+
+QUARTER_STEPS = union_all(
+    *(select(literal_column(str(step)).label("step")) for step in range(HOUR_MINUTES // QUARTER_MINUTES))
+).subquery("quarter_step")
+
+
+def expand_quarters(stmt: Select) -> Select:
+    """Repeat each row of ``stmt`` once per quarter its day stores it for; ``stmt`` must join ``market_day``."""
+    return stmt.join(QUARTER_STEPS, QUARTER_STEPS.c.step * QUARTER_MINUTES < models.MarketDay.resolution_minutes)
+
+
+def quarter_slot(table: Any) -> ColumnElement[int]:
+    """Quarter index of an expanded row (``table.quarter_index`` plus its step)."""
+    return table.quarter_index + QUARTER_STEPS.c.step
+
+
+__all__ = [
+    "DEFAULT_RESOLUTION",
+    "HOUR_MINUTES",
+    "QUARTER_MINUTES",
+    "QUARTER_STEPS",
+    "expand_quarters",
+    "quarter_slot",
+]
@@ -2,6 +2,7 @@ CREATE TABLE IF NOT EXISTS market_day (
   id BIGSERIAL PRIMARY KEY,
   market TEXT NOT NULL CHECK (market IN ('DAM','GDAM','RTM')),
   trade_date DATE NOT NULL,
+  resolution_minutes SMALLINT NOT NULL DEFAULT 15 CHECK (resolution_minutes IN (15, 60)),
   UNIQUE (market, trade_date)
 );
 
@@ -9,7 +10,9 @@ CREATE TABLE IF NOT EXISTS dam_price (
   id BIGSERIAL PRIMARY KEY,
   market_day_id BIGINT NOT NULL REFERENCES market_day(id) ON DELETE CASCADE,
   hour_block SMALLINT NOT NULL CHECK (hour_block BETWEEN 0 AND 23),
-  mcp_rs_per_mwh NUMERIC(10,2) NOT NULL,
+  mcp_paise_per_mwh INTEGER NOT NULL,
+  -- Deprecated 2026-10-19 rupee view for direct SQL readers; dropped in the first release after 2027-01-31.
+  mcp_rs_per_mwh NUMERIC(10,2) GENERATED ALWAYS AS (mcp_paise_per_mwh / 100.0) STORED,
   CONSTRAINT dam_uniq UNIQUE (market_day_id, hour_block)
 );
 
@@ -19,9 +22,11 @@ CREATE TABLE IF NOT EXISTS gdam_price (
   id BIGSERIAL PRIMARY KEY,
   market_day_id BIGINT NOT NULL REFERENCES market_day(id) ON DELETE CASCADE,
   quarter_index SMALLINT NOT NULL CHECK (quarter_index BETWEEN 0 AND 95),
-  mcp_rs_per_mwh NUMERIC(10,2) NOT NULL,
-  hydro_fsv_mw NUMERIC(12,2),
-  scheduled_volume_mw NUMERIC(12,2),
+  mcp_paise_per_mwh INTEGER NOT NULL,
+  -- Deprecated 2026-10-19 rupee view for direct SQL readers; dropped in the first release after 2027-01-31.
+  mcp_rs_per_mwh NUMERIC(10,2) GENERATED ALWAYS AS (mcp_paise_per_mwh / 100.0) STORED,
+  hydro_fsv_mw DOUBLE PRECISION,
+  scheduled_volume_mw DOUBLE PRECISION,
   CONSTRAINT gdam_uniq UNIQUE (market_day_id, quarter_index)
 );
 
@@ -33,9 +38,11 @@ CREATE TABLE IF NOT EXISTS rtm_price (
   hour SMALLINT NOT NULL CHECK (hour BETWEEN 1 AND 24),
   session_id SMALLINT,
   quarter_index SMALLINT NOT NULL CHECK (quarter_index BETWEEN 0 AND 95),
-  mcv_mw NUMERIC(12,2),
-  fsv_mw NUMERIC(12,2),
-  mcp_rs_per_mwh NUMERIC(10,2) NOT NULL,
+  mcv_mw DOUBLE PRECISION,
+  fsv_mw DOUBLE PRECISION,
+  mcp_paise_per_mwh INTEGER NOT NULL,
+  -- Deprecated 2026-10-19 rupee view for direct SQL readers; dropped in the first release after 2027-01-31.
+  mcp_rs_per_mwh NUMERIC(10,2) GENERATED ALWAYS AS (mcp_paise_per_mwh / 100.0) STORED,
   CONSTRAINT rtm_uniq UNIQUE (market_day_id, quarter_index)
 );
 
@@ -45,10 +52,23 @@ CREATE TABLE IF NOT EXISTS market_summary (
   id BIGSERIAL PRIMARY KEY,
   market_day_id BIGINT NOT NULL REFERENCES market_day(id) ON DELETE CASCADE,
   label TEXT NOT NULL,
-  value NUMERIC(12,4) NOT NULL,
+  value DOUBLE PRECISION NOT NULL,
   UNIQUE (market_day_id, label)
 );
 
+CREATE TABLE IF NOT EXISTS data_version (
+  market TEXT NOT NULL,
+  month CHAR(7) NOT NULL,
+  version BIGINT NOT NULL DEFAULT 1,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (market, month)
+);
+
+CREATE TABLE IF NOT EXISTS holiday (
+  holiday_date DATE PRIMARY KEY,
+  name TEXT
+);
+
 CREATE ROLE IF NOT EXISTS power_reader LOGIN PASSWORD 'power_reader';
 GRANT CONNECT ON DATABASE power_exchange TO power_reader;
 GRANT USAGE ON SCHEMA public TO power_reader;
@@ -1,18 +1,44 @@
+import threading
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Any, Dict, Iterator, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import get_settings
 
-_settings = get_settings()
-_engine = create_engine(_settings.database_url, echo=False, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine, expire_on_commit=False)
+# Bound to the engine by ``get_engine``; nothing connects or builds a pool at import time.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+
+_engine: Optional[Engine] = None
+_STATEMENT_TIMEOUT_KEY = "statement_timeout_ms"
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """Return the application engine, creating it on first use (the API does so in its lifespan)."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(get_settings().database_url, echo=False, pool_pre_ping=True)
+                SessionLocal.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+
+def dispose_engine() -> None:
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
 
 
 @contextmanager
 def get_session() -> Iterator[Session]:
+    get_engine()
     session = SessionLocal()
     try:
         yield session
@@ -24,4 +50,52 @@ def get_session() -> Iterator[Session]:
         session.close()
 
 
-__all__ = ["SessionLocal", "get_session", "_engine"]
+def create_readonly_sessionmaker(database_url: Optional[str] = None, pool_size: Optional[int] = None) -> sessionmaker[Session]:
+    """Build a separate pool for query-only callers; Postgres connections are opened read-only."""
+    settings = get_settings()
+    url = database_url or settings.database_url
+    kwargs: Dict[str, Any] = {}
+    if url.startswith("postgresql"):
+        kwargs = {"pool_size": pool_size or settings.readonly_pool_size, "execution_options": {"postgresql_readonly": True}}
+    engine = create_engine(url, echo=False, pool_pre_ping=True, **kwargs)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+
+def apply_statement_timeout(session: Session, milliseconds: int) -> None:
+    """Cap each statement in the session's current transaction (Postgres ``SET LOCAL``); 0 keeps the server default."""
+    if milliseconds <= 0 or session.get_bind().dialect.name != "postgresql":
+        return
+    session.execute(text(f"SET LOCAL statement_timeout = {int(milliseconds)}"))
+
+
+def set_statement_timeout(session: Session, milliseconds: int) -> None:
+    """Like ``apply_statement_timeout`` for every transaction the session begins from now on.
+
+    Nothing is sent until the session first connects, so a request can configure its session
+    and still hold no pool connection while it waits for admission.
+    """
+    session.info[_STATEMENT_TIMEOUT_KEY] = milliseconds
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_session_statement_timeout(session: Session, transaction: Any, connection: Any) -> None:
+    milliseconds = session.info.get(_STATEMENT_TIMEOUT_KEY, 0)
+    if milliseconds > 0 and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(milliseconds)}")
+
+
+def is_statement_timeout(exc: BaseException) -> bool:
+    """True for the ``query_canceled`` error Postgres raises when ``statement_timeout`` fires."""
+    return getattr(getattr(exc, "orig", None), "pgcode", None) == "57014"
+
+
+__all__ = [
+    "SessionLocal",
+    "apply_statement_timeout",
+    "create_readonly_sessionmaker",
+    "dispose_engine",
+    "get_engine",
+    "get_session",
+    "is_statement_timeout",
+    "set_statement_timeout",
+]
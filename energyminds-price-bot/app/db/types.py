@@ -0,0 +1,58 @@
+"""Column types that convert between storage units and the floats the app works in.
+
+Prices are stored as integer paise per MWh. The exchange publishes two decimals, so this is
+lossless, and an ``INTEGER`` is half the size of a ``NUMERIC(10,2)`` and decodes without
+building a ``Decimal``. Volumes and published averages are ``DOUBLE PRECISION`` rounded on
+write to the decimals the old ``NUMERIC`` columns kept.
+
+Aggregate prices in SQL through ``rupees()``: ``MIN``/``AVG`` over a ``Paise`` column would
+return paise, since result conversion only applies to plain column loads.
+"""
+from __future__ import annotations
+
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Any, Optional
+
+from sqlalchemy import Double, Integer, cast
+from sqlalchemy.engine import Dialect
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.types import TypeDecorator
+
+
+class Paise(TypeDecorator[float]):
+    """Rs/MWh in Python, integer paise/MWh in the database; rounded to the nearest paisa, ties to even."""
+
+    impl = Integer
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[Any], dialect: Dialect) -> Optional[int]:
+        if value is None:
+            return None
+        if isinstance(value, Decimal):
+            return int((value * 100).quantize(Decimal(1), rounding=ROUND_HALF_EVEN))
+        return round(float(value) * 100)
+
+    def process_result_value(self, value: Optional[int], dialect: Dialect) -> Optional[float]:
+        return None if value is None else value / 100
+
+
+class RoundedFloat(TypeDecorator[float]):
+    """``DOUBLE PRECISION`` rounded to ``places`` decimals on write."""
+
+    impl = Double
+    cache_ok = True
+
+    def __init__(self, places: int) -> None:
+        super().__init__()
+        self.places = places
+
+    def process_bind_param(self, value: Optional[Any], dialect: Dialect) -> Optional[float]:
+        return None if value is None else round(float(value), self.places)
+
+
+def rupees(column: Any) -> ColumnElement[float]:
+    """SQL expression for a ``Paise`` column in Rs/MWh, as a float the driver decodes natively."""
+    return cast(column, Double) / 100.0
+
+
+__all__ = ["Paise", "RoundedFloat", "rupees"]
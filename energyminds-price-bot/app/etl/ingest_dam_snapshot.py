@@ -3,9 +3,12 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
-from loguru import logger
 from sqlalchemy.orm import Session
 
+from app.core.logging import SampledWarnings, logger
+from app.core.metrics import track_ingest
+from app.db.data_version import bump_data_versions
+
 from .parse_common import clean_numeric, get_or_create_market_day, normalise_date, upsert_dam_price
 from .validators import ensure_hour_range, ensure_numeric
 
@@ -15,30 +18,41 @@ def ingest_dam_snapshot(session: Session, file_path: str | Path) -> None:
     if not path.exists():
         raise FileNotFoundError(path)
 
-    logger.info("Loading DAM snapshot from %s", path)
-    df = pd.read_excel(path)
-    df.columns = [str(col).strip().lower() for col in df.columns]
-
-    if "date" not in df.columns or "hour" not in df.columns:
-        raise ValueError("DAM snapshot must contain 'Date' and 'Hour' columns")
-
-    mcp_col = next((col for col in df.columns if "mcp" in col), None)
-    if not mcp_col:
-        raise ValueError("DAM snapshot missing MCP column")
-
-    for _, row in df.iterrows():
-        trade_date = normalise_date(row["date"])
-        hour = int(row["hour"])
-        hour_block = hour - 1
-        ensure_hour_range(hour_block)
-        mcp = clean_numeric(row[mcp_col])
-        if mcp is None:
-            continue
-        ensure_numeric(mcp, min_value=0)
-        market_day_id = get_or_create_market_day(session, "DAM", trade_date)
-        upsert_dam_price(session, market_day_id, hour_block, mcp)
-
-    logger.info("Completed DAM snapshot ingestion from %s", path)
+    skipped = SampledWarnings("dam_snapshot")
+    with track_ingest("dam_snapshot") as run:
+        logger.info("Loading DAM snapshot from {}", path)
+        with run.stage("read"):
+            df = pd.read_excel(path)
+        df.columns = [str(col).strip().lower() for col in df.columns]
+
+        if "date" not in df.columns or "hour" not in df.columns:
+            raise ValueError("DAM snapshot must contain 'Date' and 'Hour' columns")
+
+        mcp_col = next((col for col in df.columns if "mcp" in col), None)
+        if not mcp_col:
+            raise ValueError("DAM snapshot missing MCP column")
+
+        with run.stage("upsert"):
+            # Row numbers match the spreadsheet, whose header is row 1.
+            for row_number, (_, row) in enumerate(df.iterrows(), start=2):
+                trade_date = normalise_date(row["date"])
+                hour = int(row["hour"])
+                hour_block = hour - 1
+                ensure_hour_range(hour_block)
+                mcp = clean_numeric(row[mcp_col])
+                if mcp is None:
+                    skipped.warn("missing_mcp", "Skipping {file} row {row}: no MCP value", file=path.name, row=row_number)
+                    continue
+                ensure_numeric(mcp, min_value=0)
+                market_day_id = get_or_create_market_day(session, "DAM", trade_date)
+                upsert_dam_price(session, market_day_id, hour_block, mcp)
+                run.rows += 1
+
+        with run.stage("flush"):
+            session.flush()
+            bump_data_versions(session)
+        skipped.flush()
+    logger.info("Completed DAM snapshot ingestion from {}", path)
 
 
 __all__ = ["ingest_dam_snapshot"]
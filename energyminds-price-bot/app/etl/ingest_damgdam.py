@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+from datetime import date
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
-from loguru import logger
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+from app.core.logging import SampledWarnings, logger
+from app.core.metrics import track_ingest
+from app.db.data_version import bump_data_versions
+from app.db.resolution import HOUR_MINUTES, QUARTER_MINUTES
+
 from .parse_common import (
     clean_numeric,
+    get_or_create_gdam_day,
     get_or_create_market_day,
     normalise_date,
     parse_hour_block,
@@ -33,14 +40,15 @@ def _extract_dates(df: pd.DataFrame) -> Dict[int, pd.Timestamp]:
         try:
             dates[col] = normalise_date(value)
         except Exception as exc:  # pragma: no cover - logged for visibility
-            logger.warning("Skipping column %s due to invalid date header: %s", col, exc)
+            logger.warning("Skipping column {} due to invalid date header: {}", col, exc)
     return dates
 
 
-def _process_summary_row(session: Session, market: str, label: str, df: pd.DataFrame, row_index: int, dates: Dict[int, pd.Timestamp]) -> None:
+def _process_summary_row(session: Session, market: str, label: str, df: pd.DataFrame, row_index: int, dates: Dict[int, pd.Timestamp]) -> int:
     summary_label = parse_summary_label(label)
     if not summary_label:
-        return
+        return 0
+    written = 0
     for col_idx, trade_date in dates.items():
         raw_value = df.iat[row_index, col_idx]
         value = clean_numeric(raw_value)
@@ -48,10 +56,13 @@ def _process_summary_row(session: Session, market: str, label: str, df: pd.DataF
             continue
         market_day_id = get_or_create_market_day(session, market, trade_date)
         upsert_summary(session, market_day_id, summary_label, value)
+        written += 1
+    return written
 
 
-def _process_dam_sheet(session: Session, df: pd.DataFrame) -> None:
+def _process_dam_sheet(session: Session, df: pd.DataFrame, skipped: SampledWarnings) -> int:
     dates = _extract_dates(df)
+    written = 0
     for row_index in range(1, df.shape[0]):
         label = df.iat[row_index, 0]
         if pd.isna(label):
@@ -61,21 +72,29 @@ def _process_dam_sheet(session: Session, df: pd.DataFrame) -> None:
             hour_block = parse_hour_block(label_str)
             ensure_hour_range(hour_block)
         except Exception:
-            _process_summary_row(session, "DAM", label_str, df, row_index, dates)
+            written += _process_summary_row(session, "DAM", label_str, df, row_index, dates)
             continue
 
         for col_idx, trade_date in dates.items():
             raw_value = df.iat[row_index, col_idx]
             mcp = clean_numeric(raw_value)
             if mcp is None:
+                skipped.warn("missing_mcp", "Skipping {sheet} {label} on {day}: no MCP value", sheet=DAM_SHEET, label=label_str, day=trade_date)
                 continue
             ensure_numeric(mcp, min_value=0)
             market_day_id = get_or_create_market_day(session, "DAM", trade_date)
             upsert_dam_price(session, market_day_id, hour_block, mcp)
+            written += 1
+    return written
 
 
-def _process_gdam_sheet(session: Session, df: pd.DataFrame) -> None:
+def _process_gdam_sheet(session: Session, df: pd.DataFrame, skipped: SampledWarnings) -> int:
     dates = _extract_dates(df)
+    # The sheet is hourly: GDAM_HOURLY_STORAGE stores one row per hour, else four quarter rows.
+    resolution = HOUR_MINUTES if get_settings().gdam_hourly_storage else QUARTER_MINUTES
+    # Resolved once per day: a day holding distinct 15-minute prices stays at quarters.
+    days: Dict[date, Tuple[int, int]] = {}
+    written = 0
     for row_index in range(1, df.shape[0]):
         label = df.iat[row_index, 0]
         if pd.isna(label):
@@ -85,20 +104,25 @@ def _process_gdam_sheet(session: Session, df: pd.DataFrame) -> None:
             hour_block = parse_hour_block(label_str)
             ensure_hour_range(hour_block)
         except Exception:
-            _process_summary_row(session, "GDAM", label_str, df, row_index, dates)
+            written += _process_summary_row(session, "GDAM", label_str, df, row_index, dates)
             continue
 
         for col_idx, trade_date in dates.items():
             raw_value = df.iat[row_index, col_idx]
             mcp = clean_numeric(raw_value)
             if mcp is None:
+                skipped.warn("missing_mcp", "Skipping {sheet} {label} on {day}: no MCP value", sheet=GDAM_SHEET, label=label_str, day=trade_date)
                 continue
             ensure_numeric(mcp, min_value=0)
-            market_day_id = get_or_create_market_day(session, "GDAM", trade_date)
-            for quarter_offset in range(4):
+            if trade_date not in days:
+                days[trade_date] = get_or_create_gdam_day(session, trade_date, resolution)
+            market_day_id, stored = days[trade_date]
+            for quarter_offset in range(HOUR_MINUTES // stored):
                 quarter_index = parse_quarter_index_from_hour(hour_block, quarter_offset)
                 ensure_quarter_range(quarter_index)
                 upsert_gdam_price(session, market_day_id, quarter_index, mcp)
+                written += 1
+    return written
 
 
 def ingest_damgdam(session: Session, file_path: str | Path) -> None:
@@ -106,19 +130,30 @@ def ingest_damgdam(session: Session, file_path: str | Path) -> None:
     if not path.exists():
         raise FileNotFoundError(path)
 
-    workbook = pd.ExcelFile(path)
-    if DAM_SHEET not in workbook.sheet_names or GDAM_SHEET not in workbook.sheet_names:
-        raise ValidationError("DAMGDAM workbook must contain DAM and GDAM sheets")
-
-    logger.info("Starting DAM sheet ingestion from %s", path)
-    df_dam = workbook.parse(DAM_SHEET, header=None)
-    _process_dam_sheet(session, df_dam)
-
-    logger.info("Starting GDAM sheet ingestion from %s", path)
-    df_gdam = workbook.parse(GDAM_SHEET, header=None)
-    _process_gdam_sheet(session, df_gdam)
-
-    logger.info("Completed ingestion for %s", path)
+    skipped = SampledWarnings("damgdam")
+    with track_ingest("damgdam") as run:
+        with run.stage("read"):
+            workbook = pd.ExcelFile(path)
+        if DAM_SHEET not in workbook.sheet_names or GDAM_SHEET not in workbook.sheet_names:
+            raise ValidationError("DAMGDAM workbook must contain DAM and GDAM sheets")
+
+        logger.info("Starting DAM sheet ingestion from {}", path)
+        with run.stage("read"):
+            df_dam = workbook.parse(DAM_SHEET, header=None)
+        with run.stage("dam"):
+            run.rows += _process_dam_sheet(session, df_dam, skipped)
+
+        logger.info("Starting GDAM sheet ingestion from {}", path)
+        with run.stage("read"):
+            df_gdam = workbook.parse(GDAM_SHEET, header=None)
+        with run.stage("gdam"):
+            run.rows += _process_gdam_sheet(session, df_gdam, skipped)
+
+        with run.stage("flush"):
+            session.flush()
+            bump_data_versions(session)
+        skipped.flush()
+    logger.info("Completed ingestion for {}", path)
 
 
 __all__ = ["ingest_damgdam"]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+from sqlalchemy import delete, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.logging import logger
+from app.core.metrics import track_ingest
+from app.db import models
+from app.db.data_version import bump_data_versions, touch_data_version
+
+from .parse_common import normalise_date
+
+# The calendar filters apply to every market, so a changed holiday moves each market's month.
+CALENDAR_MARKETS = ("DAM", "GDAM", "RTM")
+
+
+def read_holidays(path: Path) -> Dict[date, Optional[str]]:
+    """``{date: name}`` from a CSV or Excel file with a ``Date`` column and an optional name column."""
+    df = pd.read_csv(path) if path.suffix.lower() == ".csv" else pd.read_excel(path)
+    df.columns = [str(col).strip().lower() for col in df.columns]
+    date_col = next((col for col in df.columns if "date" in col), None)
+    if date_col is None:
+        raise ValueError("Holiday file must contain a Date column")
+    name_col = next((col for col in df.columns if col in ("name", "holiday", "description", "occasion")), None)
+
+    holidays: Dict[date, Optional[str]] = {}
+    for _, row in df.iterrows():
+        if pd.isna(row[date_col]):
+            continue
+        name = row[name_col] if name_col and not pd.isna(row[name_col]) else None
+        holidays[normalise_date(row[date_col])] = str(name).strip() if name is not None else None
+    return holidays
+
+
+def ingest_holidays(session: Session, file_path: str | Path) -> int:
+    """Load a holiday calendar file; it replaces the stored holidays for every year it covers."""
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(path)
+
+    with track_ingest("holidays") as run:
+        logger.info("Loading holiday calendar from {}", path)
+        with run.stage("read"):
+            holidays = read_holidays(path)
+        if not holidays:
+            raise ValueError("Holiday file contains no dates")
+
+        with run.stage("upsert"):
+            # A corrected calendar for a year drops dates that are no longer holidays.
+            years = sorted({holiday.year for holiday in holidays})
+            in_years = or_(*(models.Holiday.holiday_date.between(date(year, 1, 1), date(year, 12, 31)) for year in years))
+            previous = set(session.execute(select(models.Holiday.holiday_date).where(in_years)).scalars())
+            session.execute(delete(models.Holiday).where(in_years))
+            session.add_all(models.Holiday(holiday_date=day, name=name) for day, name in sorted(holidays.items()))
+            run.rows += len(holidays)
+            # Renames leave day_type results alone; added or dropped dates change their months.
+            for day in previous.symmetric_difference(holidays):
+                for market in CALENDAR_MARKETS:
+                    touch_data_version(session, market, day)
+
+        with run.stage("flush"):
+            session.flush()
+            bump_data_versions(session)
+    logger.info("Loaded {} holidays for {} from {}", len(holidays), ", ".join(map(str, years)), path)
+    return len(holidays)
+
+
+__all__ = ["ingest_holidays", "read_holidays"]
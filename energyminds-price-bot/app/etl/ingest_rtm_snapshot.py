@@ -3,9 +3,12 @@ from __future__ import annotations
 from pathlib import Path
 
 import pandas as pd
-from loguru import logger
 from sqlalchemy.orm import Session
 
+from app.core.logging import SampledWarnings, logger
+from app.core.metrics import track_ingest
+from app.db.data_version import bump_data_versions
+
 from .parse_common import (
     clean_numeric,
     get_or_create_market_day,
@@ -21,43 +24,54 @@ def ingest_rtm_snapshot(session: Session, file_path: str | Path) -> None:
     if not path.exists():
         raise FileNotFoundError(path)
 
-    logger.info("Loading RTM snapshot from %s", path)
-    df = pd.read_excel(path)
-    df.columns = [str(col).strip().lower() for col in df.columns]
-
-    required = {"date", "hour"}
-    if not required.issubset(df.columns):
-        raise ValueError("RTM snapshot must contain Date and Hour columns")
-
-    time_block_col = next((col for col in df.columns if "time" in col and "block" in col), None)
-    if not time_block_col:
-        raise ValueError("RTM snapshot missing time block column")
-
-    mcp_col = next((col for col in df.columns if "mcp" in col), None)
-    if not mcp_col:
-        raise ValueError("RTM snapshot missing MCP column")
-
-    session_col = next((col for col in df.columns if "session" in col and "id" in col), None)
-    mcv_col = next((col for col in df.columns if "mcv" in col), None)
-    fsv_col = next((col for col in df.columns if "fsv" in col or "final scheduled" in col), None)
-
-    for _, row in df.iterrows():
-        trade_date = normalise_date(row["date"])
-        hour = int(row["hour"])
-        time_label = row[time_block_col]
-        quarter_index = parse_time_block(str(time_label))
-        ensure_quarter_range(quarter_index)
-        mcp = clean_numeric(row[mcp_col])
-        if mcp is None:
-            continue
-        ensure_numeric(mcp, min_value=0)
-        session_id = int(row[session_col]) if session_col and not pd.isna(row[session_col]) else None
-        mcv = clean_numeric(row[mcv_col]) if mcv_col else None
-        fsv = clean_numeric(row[fsv_col]) if fsv_col else None
-        market_day_id = get_or_create_market_day(session, "RTM", trade_date)
-        upsert_rtm_price(session, market_day_id, hour, session_id, quarter_index, mcp, mcv_mw=mcv, fsv_mw=fsv)
-
-    logger.info("Completed RTM snapshot ingestion from %s", path)
+    skipped = SampledWarnings("rtm_snapshot")
+    with track_ingest("rtm_snapshot") as run:
+        logger.info("Loading RTM snapshot from {}", path)
+        with run.stage("read"):
+            df = pd.read_excel(path)
+        df.columns = [str(col).strip().lower() for col in df.columns]
+
+        required = {"date", "hour"}
+        if not required.issubset(df.columns):
+            raise ValueError("RTM snapshot must contain Date and Hour columns")
+
+        time_block_col = next((col for col in df.columns if "time" in col and "block" in col), None)
+        if not time_block_col:
+            raise ValueError("RTM snapshot missing time block column")
+
+        mcp_col = next((col for col in df.columns if "mcp" in col), None)
+        if not mcp_col:
+            raise ValueError("RTM snapshot missing MCP column")
+
+        session_col = next((col for col in df.columns if "session" in col and "id" in col), None)
+        mcv_col = next((col for col in df.columns if "mcv" in col), None)
+        fsv_col = next((col for col in df.columns if "fsv" in col or "final scheduled" in col), None)
+
+        with run.stage("upsert"):
+            # Row numbers match the spreadsheet, whose header is row 1.
+            for row_number, (_, row) in enumerate(df.iterrows(), start=2):
+                trade_date = normalise_date(row["date"])
+                hour = int(row["hour"])
+                time_label = row[time_block_col]
+                quarter_index = parse_time_block(str(time_label))
+                ensure_quarter_range(quarter_index)
+                mcp = clean_numeric(row[mcp_col])
+                if mcp is None:
+                    skipped.warn("missing_mcp", "Skipping {file} row {row}: no MCP value", file=path.name, row=row_number)
+                    continue
+                ensure_numeric(mcp, min_value=0)
+                session_id = int(row[session_col]) if session_col and not pd.isna(row[session_col]) else None
+                mcv = clean_numeric(row[mcv_col]) if mcv_col else None
+                fsv = clean_numeric(row[fsv_col]) if fsv_col else None
+                market_day_id = get_or_create_market_day(session, "RTM", trade_date)
+                upsert_rtm_price(session, market_day_id, hour, session_id, quarter_index, mcp, mcv_mw=mcv, fsv_mw=fsv)
+                run.rows += 1
+
+        with run.stage("flush"):
+            session.flush()
+            bump_data_versions(session)
+        skipped.flush()
+    logger.info("Completed RTM snapshot ingestion from {}", path)
 
 
 __all__ = ["ingest_rtm_snapshot"]
@@ -3,14 +3,17 @@ from __future__ import annotations
 import re
 from datetime import date, datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.core.logging import logger
 from app.db import models
+from app.db.data_version import touch_data_version
+from app.db.resolution import DEFAULT_RESOLUTION, HOUR_MINUTES, QUARTER_STEPS, expand_quarters, quarter_slot
 
 HOUR_BLOCK_RE = re.compile(r"^(?P<start>\d{2})\s*-\s*(?P<end>\d{2})$")
 AVG_LABEL_RE = re.compile(r"^Avg\.\s*\((?P<start>\d{2})-(?P<end>\d{2})\s*Hrs\)", re.IGNORECASE)
@@ -77,15 +80,74 @@ def parse_summary_label(label: str) -> Optional[str]:
     return None
 
 
-def get_or_create_market_day(session: Session, market: str, trade_date: date) -> int:
+def _market_day(session: Session, market: str, trade_date: date, resolution_minutes: Optional[int]) -> models.MarketDay:
+    touch_data_version(session, market, trade_date)
     stmt = select(models.MarketDay).where(models.MarketDay.market == market, models.MarketDay.trade_date == trade_date)
     existing = session.execute(stmt).scalar_one_or_none()
     if existing:
-        return existing.id
-    obj = models.MarketDay(market=market, trade_date=trade_date)
+        if resolution_minutes is not None and existing.resolution_minutes != resolution_minutes:
+            _convert_gdam_day(session, existing, resolution_minutes)
+        return existing
+    resolution = resolution_minutes or DEFAULT_RESOLUTION[market]
+    obj = models.MarketDay(market=market, trade_date=trade_date, resolution_minutes=resolution)
     session.add(obj)
     session.flush()
-    return obj.id
+    return obj
+
+
+def get_or_create_market_day(
+    session: Session, market: str, trade_date: date, resolution_minutes: Optional[int] = None
+) -> int:
+    """Id of the market day; with ``resolution_minutes``, its stored rows are converted to match first."""
+    return _market_day(session, market, trade_date, resolution_minutes).id
+
+
+def get_or_create_gdam_day(session: Session, trade_date: date, resolution_minutes: int) -> Tuple[int, int]:
+    """``(id, resolution_minutes)`` of a GDAM day, converted towards ``resolution_minutes`` where lossless.
+
+    A day whose quarters differ within an hour stays at 15 minutes, so callers asking for hourly
+    storage must write quarter rows when the returned resolution says so.
+    """
+    market_day = _market_day(session, "GDAM", trade_date, resolution_minutes)
+    return market_day.id, market_day.resolution_minutes
+
+
+def _hourly_collapsible(session: Session, market_day_id: int) -> bool:
+    """True when every stored hour has four identical quarters, so one row per hour loses nothing."""
+    table = models.GdamPrice
+    stmt = select(table.quarter_index, table.mcp_rs_per_mwh, table.hydro_fsv_mw, table.scheduled_volume_mw).where(
+        table.market_day_id == market_day_id
+    )
+    hours: Dict[int, List[Tuple[object, ...]]] = {}
+    for quarter_index, *values in session.execute(stmt):
+        hours.setdefault(quarter_index // 4, []).append(tuple(values))
+    return all(len(quarters) == 4 and len(set(quarters)) == 1 for quarters in hours.values())
+
+
+def _convert_gdam_day(session: Session, market_day: models.MarketDay, resolution_minutes: int) -> None:
+    """Switch a GDAM day between hourly and quarter storage without changing what readers see."""
+    table = models.GdamPrice
+    if resolution_minutes == HOUR_MINUTES:
+        if not _hourly_collapsible(session, market_day.id):
+            # Real 15-minute prices (e.g. from a snapshot) would be lost; keep the day in quarters.
+            logger.info("Keeping GDAM {} at 15-minute resolution: its quarters differ within an hour", market_day.trade_date)
+            return
+        # The hour's first quarter stands for the whole hour from here on.
+        session.execute(delete(table).where(table.market_day_id == market_day.id, table.quarter_index % 4 != 0))
+    else:
+        # Materialise the quarters the hourly rows stood for, so a partial 15-minute load keeps the rest.
+        expanded = select(
+            table.market_day_id,
+            quarter_slot(table),
+            table.mcp_rs_per_mwh,
+            table.hydro_fsv_mw,
+            table.scheduled_volume_mw,
+        ).where(table.market_day_id == market_day.id)
+        expanded = expand_quarters(expanded.join(models.MarketDay)).where(QUARTER_STEPS.c.step > 0)
+        columns = [table.market_day_id, table.quarter_index, table.mcp_rs_per_mwh, table.hydro_fsv_mw, table.scheduled_volume_mw]
+        session.execute(insert(table).from_select(columns, expanded))
+    market_day.resolution_minutes = resolution_minutes
+    session.flush()
 
 
 def _is_postgres(session: Session) -> bool:
@@ -102,7 +164,7 @@ def upsert_dam_price(session: Session, market_day_id: int, hour_block: int, mcp:
         stmt = pg_insert(models.DamPrice).values(**values)
         stmt = stmt.on_conflict_do_update(
             index_elements=[models.DamPrice.market_day_id, models.DamPrice.hour_block],
-            set_={"mcp_rs_per_mwh": mcp},
+            set_={models.DamPrice.mcp_rs_per_mwh: mcp},
         )
         session.execute(stmt)
     else:
@@ -133,7 +195,7 @@ def upsert_gdam_price(
         stmt = stmt.on_conflict_do_update(
             index_elements=[models.GdamPrice.market_day_id, models.GdamPrice.quarter_index],
             set_={
-                "mcp_rs_per_mwh": mcp,
+                models.GdamPrice.mcp_rs_per_mwh: mcp,
                 "hydro_fsv_mw": hydro_fsv_mw,
                 "scheduled_volume_mw": scheduled_volume_mw,
             },
@@ -179,7 +241,7 @@ def upsert_rtm_price(
             set_={
                 "hour": hour,
                 "session_id": session_id,
-                "mcp_rs_per_mwh": mcp,
+                models.RtmPrice.mcp_rs_per_mwh: mcp,
                 "mcv_mw": mcv_mw,
                 "fsv_mw": fsv_mw,
             },
@@ -229,6 +291,7 @@ __all__ = [
     "parse_time_block",
     "clean_numeric",
     "parse_summary_label",
+    "get_or_create_gdam_day",
     "get_or_create_market_day",
     "upsert_dam_price",
     "upsert_gdam_price",
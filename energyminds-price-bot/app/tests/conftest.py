@@ -9,6 +9,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.core.data_version import apply_data_versions
 from app.db.base import Base
 
 
@@ -32,6 +33,8 @@ def db_session(engine) -> Generator[Session, None, None]:
     for table in reversed(Base.metadata.sorted_tables):
         session.execute(table.delete())
     session.commit()
+    # The process-wide view of data_version would otherwise carry over from earlier tests.
+    apply_data_versions({})
     try:
         yield session
         session.commit()
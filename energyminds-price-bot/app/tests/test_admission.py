@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.api.deps import get_db
+from app.api.main import app
+from app.api.routers import prices
+from app.core.admission import AdmissionController, AdmissionTimeout, QueryTooExpensive, estimate_cost
+from app.db.base import Base
+from app.db.session import apply_statement_timeout, is_statement_timeout
+from app.etl.ingest_damgdam import ingest_damgdam
+
+
+def test_costs_scale_with_days_hours_and_market_resolution():
+    assert estimate_cost("DAM", 31, 0, 24) == 744
+    assert estimate_cost("RTM", 31, 0, 24) == 2976
+    assert estimate_cost("GDAM", 365, 18, 22) == 5840
+
+
+def test_heavy_queries_queue_behind_a_slot_and_cheap_ones_do_not():
+    controller = AdmissionController(cost_limit=1000, heavy_cost=100, heavy_concurrency=1, queue_seconds=0.05)
+    with pytest.raises(QueryTooExpensive):
+        with controller.admit("prices", 1001):
+            pass
+
+    holding, release = threading.Event(), threading.Event()
+
+    def hold_slot() -> None:
+        with controller.admit("prices", 500):
+            holding.set()
+            release.wait(5)
+
+    worker = threading.Thread(target=hold_slot)
+    worker.start()
+    try:
+        assert holding.wait(5)
+        with pytest.raises(AdmissionTimeout):
+            with controller.admit("prices", 500):
+                pass
+        with controller.admit("prices", 10):
+            pass
+    finally:
+        release.set()
+        worker.join()
+    with controller.admit("prices", 500):
+        pass
+
+
+def test_endpoints_reject_queries_over_the_ceiling(db_session, sample_wide_workbook, monkeypatch):
+    ingest_damgdam(db_session, sample_wide_workbook)
+    controller = AdmissionController(cost_limit=100, heavy_cost=0, heavy_concurrency=0, queue_seconds=0)
+    monkeypatch.setattr(prices, "get_admission_controller", lambda: controller)
+
+    def override_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_db
+    try:
+        client = TestClient(app)
+        assert client.get("/api/prices", params={"market": "DAM", "date": "2024-08-01"}).status_code == 200
+        response = client.get("/api/prices", params={"market": "DAM", "month": "2024-08"})
+        assert response.status_code == 400
+        assert "744" in response.json()["detail"]
+        response = client.get("/api/prices/rolling", params={"market": "RTM", "start": "2024-01-01", "end": "2024-08-01"})
+        assert response.status_code == 400
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_statement_timeouts_surface_as_504(db_session):
+    apply_statement_timeout(db_session, 1000)  # SQLite has no statement_timeout; nothing to do
+
+    class Cancelled(Exception):
+        pgcode = "57014"
+
+    class TimingOutSession:
+        def execute(self, stmt):
+            raise OperationalError("SELECT ...", {}, Cancelled())
+
+    assert is_statement_timeout(OperationalError("SELECT ...", {}, Cancelled()))
+    with pytest.raises(HTTPException) as excinfo:
+        prices._fetch_rows(TimingOutSession(), select(1))
+    assert excinfo.value.status_code == 504
+
+
+def test_queued_heavy_requests_hold_no_pool_connection(tmp_path, sample_wide_workbook, monkeypatch):
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'pool.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    with factory() as session:
+        ingest_damgdam(session, sample_wide_workbook)
+        session.commit()
+    queued = threading.Event()
+
+    class WatchedController(AdmissionController):
+        def admit(self, route, cost):
+            queued.set()
+            return super().admit(route, cost)
+
+    controller = WatchedController(cost_limit=0, heavy_cost=100, heavy_concurrency=1, queue_seconds=5)
+    monkeypatch.setattr(prices, "get_admission_controller", lambda: controller)
+
+    def override_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_db
+    responses = []
+    try:
+        client = TestClient(app)
+        with controller.admit("prices", 500):
+            request = threading.Thread(
+                target=lambda: responses.append(client.get("/api/prices", params={"market": "GDAM", "month": "2024-08"}))
+            )
+            request.start()
+            assert queued.wait(5)
+            time.sleep(0.1)
+            assert isinstance(engine.pool, QueuePool)
+            assert engine.pool.checkedout() == 0
+        request.join(5)
+        assert responses[0].status_code == 200
+        assert engine.pool.checkedout() == 0
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
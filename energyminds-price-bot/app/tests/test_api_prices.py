@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+import statistics
+
 import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
@@ -39,10 +42,11 @@ def test_dam_price_window(client):
 
 
 def test_gdam_weighted_average(client, db_session, tmp_path):
+    # A day the wide workbook does not cover, so its volume-less GDAM hours stay out of the average.
     path = tmp_path / "gdam_snapshot.xlsx"
     df = pd.DataFrame(
         {
-            "Date": ["2024-08-01", "2024-08-01", "2024-08-01", "2024-08-01"],
+            "Date": ["2024-08-05", "2024-08-05", "2024-08-05", "2024-08-05"],
             "Hour": [0, 0, 1, 1],
             "Time Block": ["00:00 - 00:15", "00:15 - 00:30", "01:00 - 01:15", "01:15 - 01:30"],
             "MCP (Rs/MWh)": [100, 200, 300, 400],
@@ -56,7 +60,7 @@ def test_gdam_weighted_average(client, db_session, tmp_path):
         "/api/prices",
         params={
             "market": "GDAM",
-            "date": "2024-08-01",
+            "date": "2024-08-05",
             "start_hour": 0,
             "end_hour": 2,
         },
@@ -65,7 +69,7 @@ def test_gdam_weighted_average(client, db_session, tmp_path):
         "/api/prices",
         params={
             "market": "GDAM",
-            "date": "2024-08-01",
+            "date": "2024-08-05",
             "start_hour": 0,
             "end_hour": 2,
             "weighted": True,
@@ -78,8 +82,9 @@ def test_gdam_weighted_average(client, db_session, tmp_path):
     simple_value = simple.json()["price_rs_per_mwh"]
     weighted_value = weighted.json()["price_rs_per_mwh"]
 
-    assert simple_value != weighted_value
-    assert weighted_value == pytest.approx(233.3333, rel=1e-3)
+    assert simple_value == 250.0
+    # (100*10 + 200*10 + 300*5 + 400*15) / (10 + 10 + 5 + 15)
+    assert weighted_value == pytest.approx(262.5)
 
 
 def test_monthly_aggregation(client):
@@ -96,3 +101,258 @@ def test_monthly_aggregation(client):
     data = response.json()
     assert data["daily"]
     assert len(data["daily"]) == 2
+
+
+def test_day_type_and_holiday_filters(client, tmp_path):
+    calendar = tmp_path / "holidays.csv"
+    calendar.write_text("Date,Name\n2024-08-02,Test holiday\n")
+    response = client.post("/api/ingest/holidays", params={"path": str(calendar)})
+    assert response.status_code == 200, response.text
+    assert response.json()["holidays"] == 1
+
+    def daily(**params):
+        response = client.get("/api/prices", params={"market": "DAM", "month": "2024-08", "end_hour": 3, **params})
+        return response.status_code, [day["trade_date"] for day in response.json().get("daily") or []]
+
+    # 2024-08-01 and 2024-08-02 are a Thursday and a Friday.
+    assert daily(day_type="weekday") == (200, ["2024-08-01", "2024-08-02"])
+    assert daily(day_type="weekend")[0] == 404
+    assert daily(exclude_holidays=True) == (200, ["2024-08-01"])
+    assert daily(day_type="holiday", weighted=True) == (200, ["2024-08-02"])
+    assert daily(day_type="holiday", exclude_holidays=True)[0] == 400
+
+
+def _wide_workbook(path, dates, dam, gdam):
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame([["", *dates], *dam]).to_excel(writer, sheet_name="DAM", index=False, header=False)
+        pd.DataFrame([["", *dates], *gdam]).to_excel(writer, sheet_name="GDAM", index=False, header=False)
+    return path
+
+
+def test_compare_matches_month_queries(client, db_session, tmp_path):
+    earlier = _wide_workbook(
+        tmp_path / "earlier.xlsx",
+        ["2023-08-01", "2024-07-31"],
+        [["00 - 01", 80, 95], ["01 - 02", 90, 97], ["RTC", 85, 96]],
+        [["00 - 01", 150, 190], ["01 - 02", 170, 200]],
+    )
+    ingest_damgdam(db_session, earlier)
+
+    def month_price(market, month, **params):
+        response = client.get("/api/prices", params={"market": market, "month": month, **params})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    for market, params in (("DAM", {}), ("DAM", {"end_hour": 2}), ("GDAM", {"end_hour": 2, "aggregate": "max"})):
+        response = client.get("/api/prices/compare", params={"market": market, "month": "2024-08", **params})
+        assert response.status_code == 200, response.text
+        anchor, last_year = response.json()["points"]
+        assert (anchor["month"], last_year["month"], last_year["offset"]) == ("2024-08", "2023-08", -1)
+        for point in (anchor, last_year):
+            expected = month_price(market, point["month"], **params)
+            assert point["price_rs_per_mwh"] == pytest.approx(expected["price_rs_per_mwh"], abs=1e-3)
+            assert (point["count"], point["source"]) == (expected["count"], expected["source"])
+        assert last_year["change_rs_per_mwh"] == pytest.approx(anchor["price_rs_per_mwh"] - last_year["price_rs_per_mwh"])
+
+    response = client.get("/api/prices/compare", params={"market": "DAM", "month": "2024-08", "mode": "previous", "periods": 2})
+    assert [(point["month"], point["days"]) for point in response.json()["points"]] == [
+        ("2024-08", 2),
+        ("2024-07", 1),
+        ("2024-06", 0),
+    ]
+    assert response.json()["points"][2]["price_rs_per_mwh"] is None
+
+    # Published GDAM 07-10 averages have no raw quarters behind them, as in a month query.
+    response = client.get("/api/prices/compare", params={"market": "GDAM", "month": "2024-08", "start_hour": 7, "end_hour": 10})
+    assert response.status_code == 200, response.text
+    anchor, last_year = response.json()["points"]
+    expected = month_price("GDAM", "2024-08", start_hour=7, end_hour=10)
+    assert (anchor["price_rs_per_mwh"], anchor["count"], anchor["source"]) == (217.5, None, "summary")
+    assert (expected["count"], anchor["days"]) == (None, 2)
+    assert last_year["source"] is None
+    assert client.get("/api/prices/compare", params={"market": "DAM", "month": "2019-01"}).status_code == 404
+
+
+def test_resample_expands_hours_and_aggregates_quarters(client):
+    def resample(market, minutes, **params):
+        response = client.get(
+            "/api/prices/resample",
+            params={"market": market, "start": "2024-08-01", "end": "2024-08-01", "minutes": minutes, **params},
+        )
+        assert response.status_code == 200, response.text
+        return [(point["start_time"], point["price_rs_per_mwh"], point["count"]) for point in response.json()["points"]]
+
+    assert resample("DAM", 30, end_hour=2) == [
+        ("00:00", 100.0, 1),
+        ("00:30", 100.0, 1),
+        ("01:00", 110.0, 1),
+        ("01:30", 110.0, 1),
+    ]
+    assert resample("DAM", 120) == [("00:00", 105.0, 2), ("02:00", 120.0, 1)]
+    assert resample("GDAM", 60) == [("00:00", 200.0, 4), ("01:00", 220.0, 4)]
+    assert resample("GDAM", 15, aggregate="max")[:2] == [("00:00", 200.0, 1), ("00:15", 200.0, 1)]
+
+    assert resample("GDAM", 45)[0] == ("00:00", 200.0, 3)
+    for market, minutes, params in (
+        ("DAM", 45, {}),
+        ("GDAM", 50, {}),
+        ("DAM", 120, {"start_hour": 1, "end_hour": 3}),  # would label hour 1 alone as the 00:00 block
+        ("DAM", 60, {"start": "2024-13-01"}),
+    ):
+        response = client.get(
+            "/api/prices/resample",
+            params={"market": market, "start": "2024-08-01", "end": "2024-08-01", "minutes": minutes, **params},
+        )
+        assert response.status_code == 400
+
+
+def test_stream_endpoint_sends_summary_then_daily_lines(client):
+    params = {"market": "DAM", "month": "2024-08", "start_hour": 0, "end_hour": 3}
+    expected = client.get("/api/prices", params=params).json()
+
+    response = client.get("/api/prices/stream", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    summary, *daily = [json.loads(line) for line in response.text.splitlines()]
+    assert summary.pop("type") == "summary"
+    assert summary.pop("days") == 2
+    assert summary == {key: value for key, value in expected.items() if key != "daily"}
+    assert [{k: v for k, v in line.items() if k != "type"} for line in daily] == expected["daily"]
+
+    missing = client.get("/api/prices/stream", params={**params, "market": "RTM"})
+    assert missing.status_code == 404
+    assert missing.json()["detail"] == "No data found for requested window"
+
+
+def test_rolling_statistics(client):
+    response = client.get(
+        "/api/prices/rolling",
+        params={
+            "market": "DAM",
+            "start": "2024-08-01",
+            "end": "2024-08-02",
+            "window": 2,
+            "start_hour": 0,
+            "end_hour": 3,
+        },
+    )
+    assert response.status_code == 200, response.text
+    first, second = response.json()["points"]
+    assert first["rolling_mean_rs_per_mwh"] == 110.0
+    assert first["rolling_std_rs_per_mwh"] == 0.0
+    assert second["observations"] == 2
+    assert second["rolling_mean_rs_per_mwh"] == pytest.approx(103.3333, rel=1e-4)
+    assert second["rolling_min_rs_per_mwh"] == pytest.approx(96.6667, rel=1e-4)
+    assert second["rolling_max_rs_per_mwh"] == 110.0
+    assert second["rolling_std_rs_per_mwh"] == pytest.approx(9.4281, rel=1e-3)
+
+
+def test_rolling_windows_count_trading_days(client, db_session, tmp_path):
+    monday = _wide_workbook(
+        tmp_path / "monday.xlsx",
+        ["2024-08-05"],
+        [["00 - 01", 130], ["01 - 02", 140], ["02 - 03", 150]],
+        [["00 - 01", 230]],
+    )
+    ingest_damgdam(db_session, monday)
+
+    response = client.get(
+        "/api/prices/rolling",
+        params={"market": "DAM", "start": "2024-08-05", "end": "2024-08-05", "window": 3, "end_hour": 3},
+    )
+    assert response.status_code == 200, response.text
+    (point,) = response.json()["points"]
+    # The weekend has no rows, so the window reaches back to Thursday and Friday.
+    daily = [110.0, 96.6667, 140.0]
+    assert point["observations"] == 3
+    assert point["rolling_mean_rs_per_mwh"] == pytest.approx(statistics.mean(daily), rel=1e-5)
+    assert point["rolling_std_rs_per_mwh"] == pytest.approx(statistics.stdev(daily), rel=1e-5)
+
+    for start in ("bad", "2024-13-01"):
+        response = client.get("/api/prices/rolling", params={"market": "DAM", "start": start, "end": "2024-08-05"})
+        assert response.status_code == 400
+
+
+def test_published_windows_served_from_summary(client):
+    rtc = client.get("/api/prices", params={"market": "DAM", "date": "2024-08-01"})
+    assert rtc.status_code == 200, rtc.text
+    assert rtc.json()["source"] == "summary"
+    assert rtc.json()["price_rs_per_mwh"] == 105.0
+
+    gdam = client.get(
+        "/api/prices",
+        params={"market": "GDAM", "month": "2024-08", "start_hour": 7, "end_hour": 10},
+    )
+    assert gdam.status_code == 200, gdam.text
+    data = gdam.json()
+    assert data["source"] == "summary"
+    assert [stat["price_rs_per_mwh"] for stat in data["daily"]] == [215.0, 220.0]
+    assert data["price_rs_per_mwh"] == 217.5
+
+
+def test_unpublished_windows_fall_back_to_raw(client):
+    response = client.get("/api/prices", params={"market": "DAM", "date": "2024-08-01", "weighted": True})
+    assert response.status_code == 200, response.text
+    assert response.json()["source"] == "raw"
+    assert response.json()["price_rs_per_mwh"] == 110.0
+
+
+def test_fast_path_matches_response_schema(client):
+    from app.api.routers.prices import PriceResponse
+
+    response = client.get(
+        "/api/prices",
+        params={"market": "DAM", "month": "2024-08", "start_hour": 0, "end_hour": 3},
+    )
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert PriceResponse.model_validate(data).model_dump(mode="json") == data
+
+
+def test_server_timing_and_correlation_headers(client):
+    response = client.get(
+        "/api/prices",
+        params={"market": "DAM", "date": "2024-08-01", "start_hour": 0, "end_hour": 3, "weighted": True},
+        headers={"X-Correlation-ID": "abc123"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["x-correlation-id"] == "abc123"
+    timing = response.headers["server-timing"]
+    assert 'db;dur=' in timing and 'desc="1 queries"' in timing
+    assert 'fetch;dur=' in timing and 'desc="3 rows"' in timing
+    assert "serialize;dur=" in timing
+    assert "total;dur=" in timing
+
+
+def test_metrics_endpoint_exposes_request_and_ingest_series(client):
+    client.get("/api/prices", params={"market": "DAM", "date": "2024-08-01", "start_hour": 0, "end_hour": 3})
+
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'energyminds_http_request_duration_seconds_count{method="GET",route="/api/prices",market="DAM",status="200"}' in body
+    assert 'energyminds_price_queries_total{market="DAM",source="raw"}' in body
+    assert 'energyminds_ingest_rows_total{file_type="damgdam"}' in body
+    assert 'energyminds_ingest_stage_duration_seconds_count{file_type="damgdam",stage="gdam"}' in body
+    assert "energyminds_db_pool_checkout_seconds_count" in body
+
+
+def test_pool_overflow_gauge_is_never_negative():
+    import sqlite3
+
+    from sqlalchemy.pool import QueuePool
+
+    from app.core.metrics import DB_POOL_CONNECTIONS, update_pool_gauges
+
+    pool = QueuePool(lambda: sqlite3.connect(":memory:"), pool_size=4, max_overflow=2)
+    connections = [pool.connect()]
+    update_pool_gauges(pool)
+    assert DB_POOL_CONNECTIONS.value(state="overflow") == 0.0
+    assert DB_POOL_CONNECTIONS.value(state="checked_out") == 1.0
+
+    connections += [pool.connect() for _ in range(5)]
+    update_pool_gauges(pool)
+    assert DB_POOL_CONNECTIONS.value(state="overflow") == 2.0
+    for connection in connections:
+        connection.close()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import select
+
+from app.db import models
+from app.etl.ingest_damgdam import ingest_damgdam
+from app.etl.ingest_rtm_snapshot import ingest_rtm_snapshot
+from benchmarks.harness import BenchResult, compare_results, environment_metadata, write_results
+from benchmarks.synthetic import write_rtm_snapshot, write_wide_workbook
+
+
+def test_synthetic_workbooks_ingest(tmp_path, db_session):
+    ingest_damgdam(db_session, write_wide_workbook(tmp_path / "wide.xlsx", date(2024, 1, 1), 3))
+    ingest_rtm_snapshot(db_session, write_rtm_snapshot(tmp_path / "rtm.xlsx", date(2024, 1, 1), 3))
+
+    assert len(db_session.execute(select(models.DamPrice)).scalars().all()) == 3 * 24
+    assert len(db_session.execute(select(models.RtmPrice)).scalars().all()) == 3 * 96
+    labels = {summary.label for summary in db_session.execute(select(models.MarketSummary)).scalars()}
+    assert {"RTC", "Avg.(07-10)", "Avg.(18-22)"} <= labels
+
+
+def test_compare_results(tmp_path):
+    baseline, candidate = tmp_path / "a.json", tmp_path / "b.json"
+    write_results(baseline, environment_metadata(), [BenchResult(name="q", seconds=1.0, latency_ms={"p50": 10.0})])
+    write_results(candidate, environment_metadata(), [BenchResult(name="q", seconds=1.0, latency_ms={"p50": 5.0})])
+    (line,) = compare_results(baseline, candidate)
+    assert "-50.0%" in line
+
+
+def test_load_generator_replays_chat_mix(db_session, sample_wide_workbook):
+    import asyncio
+
+    import httpx
+
+    from app.api.deps import get_db
+    from app.api.main import app
+    from benchmarks.load import build_workload, parse_mix, run_load, summarise
+
+    ingest_damgdam(db_session, sample_wide_workbook)
+    workload = build_workload(date(2024, 8, 1), 2)
+    assert all(path == "/api/prices" for path, _ in workload["chat"])
+
+    def override_db():
+        yield db_session
+
+    async def drive():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await run_load(client, workload, parse_mix("day=1"), users=1, duration=0.2)
+
+    app.dependency_overrides[get_db] = override_db
+    try:
+        samples, elapsed = asyncio.run(drive())
+    finally:
+        app.dependency_overrides.clear()
+
+    overall = summarise(samples, elapsed, users=1)[0]
+    assert overall.name == "load_all"
+    assert overall.extra["requests"] == len(samples) > 0
+    assert "p99" in overall.latency_ms
+
+
+def test_nlp_benchmark_reports_throughput():
+    from benchmarks.load import chat_messages
+    from benchmarks.nlp import run_nlp_benchmarks
+
+    messages = chat_messages(date(2024, 8, 1), 2)
+    results = run_nlp_benchmarks(messages, repeat=2)
+    assert [r.name for r in results] == ["nlp_parse_message", "nlp_parse_queries"]
+    assert all(r.rows == len(messages) * 2 and r.rows_per_second for r in results)
+
+
+def test_startup_benchmark_keeps_etl_out_of_api_import():
+    from benchmarks.startup import run_startup_benchmarks
+
+    full, query_only = run_startup_benchmarks(repeat=1, database_url="sqlite+pysqlite:///:memory:")
+    assert full.extra["heavy_modules_loaded"] == query_only.extra["heavy_modules_loaded"] == []
+    assert full.extra["ingest_mounted"] is True
+    assert query_only.extra["ingest_mounted"] is False
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_db
+from app.api.main import app
+from app.chatbot.cache import AnswerCache, canonical_key, query_scope
+from app.chatbot.nlp import parse_queries
+from app.chatbot.service import InProcessPriceService
+from app.etl.ingest_damgdam import ingest_damgdam
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class VersionedService:
+    def __init__(self, version: Optional[str] = "v1") -> None:
+        self.version = version
+        self.calls: List[str] = []
+
+    async def data_version(self) -> Optional[Dict[str, Any]]:
+        self.calls.append("data_version")
+        return {"version": self.version}
+
+
+def test_rewordings_share_one_key():
+    today = date(2024, 8, 2)
+    assert canonical_key(parse_queries("dam today 0-8", today=today)) == canonical_key(
+        parse_queries("DAM price today from 0 to 8", today=today)
+    )
+    assert canonical_key(parse_queries("dam today 0-8", today=today)) != canonical_key(
+        parse_queries("dam today 0-8", today=date(2024, 8, 3))
+    )
+
+
+def test_entries_expire_and_are_bounded():
+    clock = FakeClock()
+    cache = AnswerCache(maxsize=2, ttl_seconds=10, clock=clock)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+    assert cache.get("b") is None  # least recently used was evicted
+    clock.now = 11
+    assert cache.get("a") is None and cache.get("c") is None
+    assert len(cache) == 0
+
+
+def test_version_change_clears_and_checks_are_rate_limited():
+    clock = FakeClock()
+    service = VersionedService()
+    cache = AnswerCache(ttl_seconds=300, version_check_seconds=5, clock=clock)
+
+    asyncio.run(cache.sync(service))
+    cache.put("a", "A")
+    service.version = "v2"
+    asyncio.run(cache.sync(service))
+    assert service.calls == ["data_version"]
+    assert cache.get("a") == "A"
+
+    clock.now = 6
+    asyncio.run(cache.sync(service))
+    assert len(service.calls) == 2
+    assert cache.get("a") is None
+
+    cache.put("a", "A")
+    cache.observe_version(None)
+    assert cache.get("a") == "A"
+
+
+def test_only_replies_for_changed_months_are_dropped():
+    cache = AnswerCache()
+    today = date(2024, 8, 2)
+    august = parse_queries("compare dam and gdam aug 2024", today=today)
+    july = parse_queries("rtm 2024-07-15", today=today)
+    assert query_scope(august) == {"DAM:2024-08", "GDAM:2024-08"}
+    assert query_scope(july) == {"RTM:2024-07"}
+
+    cache.observe_version({"version": "2-2", "keys": {"DAM:2024-08": 1, "RTM:2024-07": 1}})
+    cache.put(canonical_key(august), "August", query_scope(august))
+    cache.put(canonical_key(july), "July", query_scope(july))
+    cache.put("unscoped", "?")
+
+    cache.observe_version({"version": "3-4", "keys": {"DAM:2024-08": 2, "GDAM:2024-08": 1, "RTM:2024-07": 1}})
+    assert cache.get(canonical_key(august)) is None
+    assert cache.get("unscoped") is None
+    assert cache.get(canonical_key(july)) == "July"
+
+
+def test_in_process_service_reads_versions_from_the_table(engine, db_session, sample_wide_workbook):
+    from sqlalchemy.orm import sessionmaker
+
+    service = InProcessPriceService(session_factory=sessionmaker(bind=engine))
+    assert asyncio.run(service.data_version()) == {"version": "0-0", "keys": {}}
+    ingest_damgdam(db_session, sample_wide_workbook)
+    db_session.commit()
+    assert asyncio.run(service.data_version()) == {"version": "2-2", "keys": {"DAM:2024-08": 1, "GDAM:2024-08": 1}}
+
+
+def test_api_ingest_bumps_data_version(db_session, sample_wide_workbook):
+    def override_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_db
+    try:
+        client = TestClient(app)
+        before = client.get("/api/data-version").json()["version"]
+        with Path(sample_wide_workbook).open("rb") as handle:
+            response = client.post("/api/ingest/file", files={"upload": ("DAMGDAM.xlsx", handle)})
+        assert response.status_code == 200, response.text
+        after = client.get("/api/data-version").json()
+        assert after["version"] != before
+        assert after["keys"] == {"DAM:2024-08": 1, "GDAM:2024-08": 1}
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_replies_expire_early_without_a_live_version_signal():
+    clock = FakeClock()
+    cache = AnswerCache(ttl_seconds=300, version_check_seconds=0, unversioned_ttl_seconds=30, clock=clock)
+
+    cache.put("before-check", "A")
+    cache.observe_version({"version": "v1", "keys": {}, "watched": False})
+    cache.put("unwatched", "B")
+    cache.observe_version({"version": "v1", "keys": {}, "watched": True})
+    cache.put("watched", "C")
+
+    class FailingService:
+        async def data_version(self):
+            raise ConnectionError("backend down")
+
+    asyncio.run(cache.sync(FailingService()))
+    cache.put("failed-check", "D")
+
+    clock.now = 31
+    assert [cache.get(key) for key in ("before-check", "unwatched", "watched", "failed-check")] == [None, None, "C", None]
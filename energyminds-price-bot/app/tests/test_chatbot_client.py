@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.chatbot import client as client_module
+from app.chatbot.client import BackendClient, close_backend_client_on_shutdown, get_backend_client
+from app.core.config import Settings
+
+
+def _client(handler, retries: int = 2) -> BackendClient:
+    settings = Settings(BACKEND_URL="http://backend", BACKEND_RETRIES=retries, BACKEND_RETRY_BACKOFF_SECONDS=0)
+    return BackendClient.from_settings(settings, transport=httpx.MockTransport(handler))
+
+
+def test_retries_gateway_errors_then_succeeds():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.url.params["market"])
+        if len(attempts) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    async def run() -> httpx.Response:
+        client = _client(handler)
+        try:
+            return await client.get("/api/prices", params={"market": "DAM"})
+        finally:
+            await client.aclose()
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    assert attempts == ["DAM", "DAM", "DAM"]
+
+
+def test_gives_up_after_configured_retries():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        raise httpx.ConnectError("refused", request=request)
+
+    async def run() -> None:
+        client = _client(handler, retries=1)
+        try:
+            await client.get("/api/prices")
+        finally:
+            await client.aclose()
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(run())
+    assert len(attempts) == 2
+
+
+def test_stream_retries_before_headers_then_yields_lines():
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(502)
+        return httpx.Response(200, content=b'{"type":"summary"}\n{"type":"daily"}\n')
+
+    async def run() -> list:
+        client = _client(handler)
+        try:
+            async with client.stream("/api/prices/stream") as response:
+                return [line async for line in response.aiter_lines()]
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == ['{"type":"summary"}', '{"type":"daily"}']
+    assert len(attempts) == 2
+
+
+def test_honours_retry_after_and_does_not_retry_cancelled_queries(monkeypatch):
+    delays = []
+
+    async def record_sleep(seconds: float) -> None:
+        delays.append(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", record_sleep)
+    statuses = iter([503, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/prices/rolling":
+            return httpx.Response(504, json={"detail": "Query exceeded its time limit"})
+        return httpx.Response(next(statuses), headers={"Retry-After": "3"})
+
+    async def run() -> tuple:
+        client = _client(handler)
+        try:
+            return (await client.get("/api/prices")).status_code, (await client.get("/api/prices/rolling")).status_code
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == (200, 504)
+    assert delays == [3.0]
+
+
+def test_pooled_client_closes_with_the_server():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    server = FastAPI()
+    close_backend_client_on_shutdown(server)
+    with TestClient(server):
+        pooled = get_backend_client()
+        assert not pooled.is_closed
+    assert pooled.is_closed
+    assert client_module._client is None
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from app.chatbot.formatting import format_comparison_reply
+from app.chatbot.nlp import parse_message, parse_queries
+from app.chatbot.service import PriceResult
+
+CORPUS = [json.loads(line) for line in (Path(__file__).parent / "corpus" / "nlp_messages.jsonl").read_text().splitlines()]
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=[case["message"] for case in CORPUS])
+def test_parse_message_regression_corpus(case):
+    today = date.fromisoformat(case["today"])
+    assert parse_message(case["message"], today=today) == case["expected"]
+
+
+def test_iso_dates_are_not_read_as_hour_ranges():
+    params = parse_message("dam 2024-08-01")
+    assert params["date"] == "2024-08-01"
+    assert (params["start_hour"], params["end_hour"]) == (0, 24)
+
+
+def test_out_of_day_windows_are_dropped():
+    assert [(q["start_hour"], q["end_hour"]) for q in parse_queries("dam 2024-08-01 25-27")] == [(0, 24)]
+    assert [(q["start_hour"], q["end_hour"]) for q in parse_queries("dam 2024-08-01 25-27 and 7-10")] == [(7, 10)]
+    params = parse_message("dam 2024-08-01 30-31")
+    assert (params["start_hour"], params["end_hour"]) == (0, 24)
+
+
+def test_first_market_mentioned_wins():
+    # Before multi-market questions, GDAM beat RTM beat DAM wherever they appeared.
+    assert parse_message("rtm or gdam 2024-08-01")["market"] == "RTM"
+    assert parse_message("dam vs gdam 2024-08-01")["market"] == "DAM"
+    assert [q["market"] for q in parse_queries("rtm or gdam 2024-08-01")] == ["RTM", "GDAM"]
+
+
+def test_parse_queries_expands_markets_and_windows():
+    queries = parse_queries("compare DAM, GDAM and RTM for Aug 2024 7-10 and 18-22")
+    assert [(q["market"], q["start_hour"], q["end_hour"]) for q in queries] == [
+        ("DAM", 7, 10),
+        ("DAM", 18, 22),
+        ("GDAM", 7, 10),
+        ("GDAM", 18, 22),
+        ("RTM", 7, 10),
+        ("RTM", 18, 22),
+    ]
+    assert {q["month"] for q in queries} == {"2024-08"}
+
+
+def test_parse_queries_requires_a_date():
+    assert parse_queries("compare dam and rtm") == []
+    assert len(parse_queries("rtm yesterday", today=date(2024, 8, 2))) == 1
+
+
+def test_format_comparison_reply_keeps_order_and_errors():
+    queries = parse_queries("dam and rtm 2024-08-01 0-3")
+    answers = [
+        (queries[0], PriceResult(200, {"price_rs_per_mwh": 110.0, "price_rs_per_kwh": 0.11, "count": 3})),
+        (queries[1], PriceResult(404, {"detail": "No data found for requested window"})),
+    ]
+    reply = format_comparison_reply(answers).splitlines()
+    assert reply[0] == "Comparison for 2024-08-01 (avg):"
+    assert reply[1].startswith(" - DAM 00–03: 110.00 Rs/MWh")
+    assert reply[1].endswith("over 3 blocks")
+    assert reply[2] == " - RTM 00–03: No data found for requested window"
+
+    # Summary answers carry no slot count, so none is claimed.
+    summary = PriceResult(200, {"price_rs_per_mwh": 110.0, "price_rs_per_kwh": 0.11, "count": None, "source": "summary"})
+    assert format_comparison_reply([(queries[0], summary)]).splitlines()[1] == " - DAM 00–03: 110.00 Rs/MWh (0.1100 Rs/kWh)"
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.api.deps import get_db
+from app.api.main import app
+from app.chatbot.nlp import parse_message
+from app.chatbot.client import BackendClient
+from app.chatbot.formatting import format_price_reply, stream_price_reply
+from app.chatbot.service import InProcessPriceService, RemotePriceService
+from app.etl.ingest_damgdam import ingest_damgdam
+
+
+def test_in_process_service_matches_http_api(engine, db_session, sample_wide_workbook):
+    ingest_damgdam(db_session, sample_wide_workbook)
+    db_session.commit()
+    service = InProcessPriceService(sessionmaker(bind=engine))
+
+    def override_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_db
+    try:
+        client = TestClient(app)
+        queries = [parse_message(message) for message in ("dam 0-3 2024-08-01", "gdam 7-10 aug 2024", "dam max 1-3 2024-08-02")]
+        # Calendar filters must reach the router too: August's two sample days are weekdays, so this is a 404.
+        queries.append({**parse_message("dam 0-3 aug 2024"), "day_type": "weekend", "weighted": "false"})
+        queries.append({**parse_message("dam 0-3 aug 2024"), "exclude_holidays": "true"})
+        for params in queries:
+            result = asyncio.run(service.get_prices(params))
+            response = client.get("/api/prices", params=params)
+            assert result.status_code == response.status_code
+            assert result.data == response.json()
+
+        missing = asyncio.run(service.get_prices(parse_message("rtm 0-24 2024-08-01")))
+        assert missing.status_code == 404
+        assert missing.data["detail"] == "No data found for requested window"
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_streamed_reply_matches_buffered_reply(engine, db_session, sample_wide_workbook):
+    ingest_damgdam(db_session, sample_wide_workbook)
+    db_session.commit()
+    in_process = InProcessPriceService(sessionmaker(bind=engine))
+
+    def override_db():
+        yield db_session
+
+    async def replay(events):
+        for event in events:
+            yield event
+
+    async def collect(service, params):
+        events = [event async for event in service.stream_prices(params)]
+        chunks = [chunk async for chunk in stream_price_reply(replay(events))]
+        return events, chunks
+
+    async def run():
+        client = BackendClient(
+            "http://backend",
+            timeout=httpx.Timeout(5.0),
+            limits=httpx.Limits(),
+            transport=httpx.ASGITransport(app=app),  # type: ignore[arg-type]
+        )
+        try:
+            remote = RemotePriceService(client)
+            params = parse_message("gdam 7-10 aug 2024")
+            buffered = await in_process.get_prices(params)
+            local_events, local_chunks = await collect(in_process, params)
+            remote_events, remote_chunks = await collect(remote, params)
+            _, error_chunks = await collect(remote, parse_message("rtm aug 2024"))
+            return buffered, local_events, local_chunks, remote_events, remote_chunks, error_chunks
+        finally:
+            await client.aclose()
+
+    app.dependency_overrides[get_db] = override_db
+    try:
+        buffered, local_events, local_chunks, remote_events, remote_chunks, error_chunks = asyncio.run(run())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert local_events == remote_events
+    assert [event["type"] for event in local_events] == ["summary", "daily", "daily"]
+    assert local_chunks == remote_chunks
+    assert local_chunks[0].startswith("Market: GDAM")
+    assert "".join(local_chunks) == format_price_reply(buffered.data)
+    assert error_chunks == ["Backend error: No data found for requested window"]
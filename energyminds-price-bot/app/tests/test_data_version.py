@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import time
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.data_version import apply_data_versions, current_data_version, data_versions, month_keys, newer_than
+from app.db import models
+from app.db.base import Base
+from app.db.data_version import DataVersionWatcher, bump_data_versions, read_data_versions
+from app.etl.ingest_damgdam import ingest_damgdam
+from app.etl.ingest_holidays import ingest_holidays
+
+
+def test_ingest_bumps_each_touched_month_in_its_transaction(db_session, sample_wide_workbook):
+    ingest_damgdam(db_session, sample_wide_workbook)
+    db_session.rollback()
+    assert read_data_versions(db_session) == {}
+
+    ingest_damgdam(db_session, sample_wide_workbook)
+    db_session.commit()
+    ingest_damgdam(db_session, sample_wide_workbook)
+    db_session.commit()
+    assert read_data_versions(db_session) == {"DAM:2024-08": 2, "GDAM:2024-08": 2}
+    assert bump_data_versions(db_session) == []  # nothing touched since the last bump
+
+
+def test_holiday_changes_bump_every_market_for_their_months(db_session, tmp_path):
+    calendar = tmp_path / "holidays.csv"
+    calendar.write_text("Date,Name\n2024-08-15,Independence Day\n")
+    ingest_holidays(db_session, calendar)
+    db_session.commit()
+    assert read_data_versions(db_session) == {"DAM:2024-08": 1, "GDAM:2024-08": 1, "RTM:2024-08": 1}
+
+    calendar.write_text("Date,Name\n2024-08-15,Renamed\n")
+    ingest_holidays(db_session, calendar)
+    db_session.commit()
+    assert set(read_data_versions(db_session).values()) == {1}
+
+    calendar.write_text("Date,Name\n2024-09-16,Moved\n")
+    ingest_holidays(db_session, calendar)
+    db_session.commit()
+    versions = read_data_versions(db_session)
+    assert versions["RTM:2024-08"] == 2 and versions["RTM:2024-09"] == 1
+
+
+def test_month_keys_and_staleness_checks():
+    assert month_keys("rtm", date(2024, 11, 30), date(2025, 1, 1)) == ["RTM:2024-11", "RTM:2024-12", "RTM:2025-01"]
+    changed = apply_data_versions({"DAM:2024-08": 2, "GDAM:2024-08": 1})
+    assert changed == {"DAM:2024-08", "GDAM:2024-08"}
+    assert current_data_version() == "2-3"
+    assert newer_than({"DAM:2024-08": 1}, ["DAM:2024-08"])
+    assert not newer_than({"DAM:2024-08": 2}, ["DAM:2024-08", "DAM:2024-09"])
+    assert apply_data_versions({"DAM:2024-08": 2, "GDAM:2024-08": 1}) == set()
+
+
+def test_watcher_polls_sqlite_and_sees_other_writers(tmp_path):
+    # A file database, so the watcher and the writer use separate connections; the shared
+    # in-memory test engine would let the watcher's rollback undo the writer's insert.
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'versions.db'}")
+    Base.metadata.create_all(engine)
+    apply_data_versions({})
+    watcher = DataVersionWatcher(engine, poll_seconds=0.05)
+    watcher.start()
+    try:
+        # Another worker or ETL job writing through its own session.
+        with Session(engine) as other:
+            other.add(models.DataVersion(market="RTM", month="2024-08", version=3))
+            other.commit()
+        deadline = time.monotonic() + 5
+        while data_versions() != {"RTM:2024-08": 3} and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert data_versions() == {"RTM:2024-08": 3}
+    finally:
+        watcher.stop()
+        engine.dispose()
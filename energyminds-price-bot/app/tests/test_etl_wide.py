@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from datetime import date
+
+import pandas as pd
 from sqlalchemy import select
 
 from app.db import models
@@ -13,9 +16,103 @@ def test_ingest_wide_workbook(db_session, sample_wide_workbook):
     assert len(dam_count) == 6  # 3 hours * 2 days
 
     gdam_count = db_session.execute(select(models.GdamPrice)).scalars().all()
-    assert len(gdam_count) == 8  # 2 hours * 4 quarters * 2 days
+    assert len(gdam_count) == 16  # 2 hours * 4 quarters * 2 days; hourly storage is opt-in
+    resolutions = db_session.execute(
+        select(models.MarketDay.market, models.MarketDay.resolution_minutes).distinct()
+    ).all()
+    assert sorted(resolutions) == [("DAM", 60), ("GDAM", 15)]
 
     summaries = db_session.execute(select(models.MarketSummary)).scalars().all()
     assert summaries
     labels = {summary.label for summary in summaries}
     assert "RTC" in labels or "Avg.(07-10)" in labels
+
+
+def test_prices_are_stored_as_whole_paise(db_session, sample_wide_workbook):
+    from sqlalchemy import text
+
+    from app.db.types import rupees
+    from app.etl.parse_common import get_or_create_market_day, upsert_dam_price
+
+    ingest_damgdam(db_session, sample_wide_workbook)
+    stored = db_session.execute(text("SELECT mcp_paise_per_mwh FROM dam_price")).scalars().all()
+    assert all(isinstance(value, int) for value in stored)
+
+    day_id = get_or_create_market_day(db_session, "DAM", date(2030, 1, 1))
+    upsert_dam_price(db_session, day_id, 0, 4321.456)
+    db_session.flush()
+    row = db_session.execute(select(models.DamPrice).where(models.DamPrice.market_day_id == day_id)).scalar_one()
+    assert row.mcp_rs_per_mwh == 4321.46
+    assert db_session.execute(
+        select(rupees(models.DamPrice.mcp_rs_per_mwh)).where(models.DamPrice.market_day_id == day_id)
+    ).scalar_one() == 4321.46
+
+
+def test_hourly_gdam_storage_answers_like_quarter_storage(db_session, sample_wide_workbook, monkeypatch, tmp_path):
+    from fastapi.testclient import TestClient
+
+    from app.api.deps import get_db
+    from app.api.main import app
+    from app.core.config import get_settings
+    from app.etl.ingest_gdam_snapshot import ingest_gdam_snapshot
+
+    queries = [
+        {"market": "GDAM", "month": "2024-08", "end_hour": 2},
+        {"market": "GDAM", "month": "2024-08", "start_hour": 1, "end_hour": 2, "aggregate": "max"},
+        {"market": "GDAM", "date": "2024-08-02", "end_hour": 2, "weighted": True},
+    ]
+
+    def override_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_db
+    try:
+        client = TestClient(app)
+
+        def answers():
+            prices = [client.get("/api/prices", params=params).json() for params in queries]
+            resampled = client.get(
+                "/api/prices/resample", params={"market": "GDAM", "start": "2024-08-01", "end": "2024-08-02", "minutes": 15}
+            ).json()["points"]
+            return prices, resampled
+
+        monkeypatch.setattr(get_settings(), "gdam_hourly_storage", False)
+        ingest_damgdam(db_session, sample_wide_workbook)
+        quarter_rows = len(db_session.execute(select(models.GdamPrice)).all())
+        expected = answers()
+
+        monkeypatch.setattr(get_settings(), "gdam_hourly_storage", True)
+        ingest_damgdam(db_session, sample_wide_workbook)
+        assert len(db_session.execute(select(models.GdamPrice)).all()) * 4 == quarter_rows
+        assert answers() == expected
+
+        # A 15-minute snapshot for one quarter converts the day back to quarter rows, keeping the rest.
+        path = tmp_path / "gdam_snapshot.xlsx"
+        pd.DataFrame(
+            {
+                "Date": ["2024-08-01", "2024-08-01"],
+                "Hour": [1, 6],
+                "Time Block": ["00:15 - 00:30", "05:15 - 05:30"],
+                "MCP (Rs/MWh)": [600, 700],
+            }
+        ).to_excel(path, index=False)
+        ingest_gdam_snapshot(db_session, path)
+        day = db_session.execute(
+            select(models.MarketDay).where(models.MarketDay.market == "GDAM", models.MarketDay.trade_date == date(2024, 8, 1))
+        ).scalar_one()
+
+        def stored_prices():
+            rows = db_session.execute(select(models.GdamPrice).where(models.GdamPrice.market_day_id == day.id)).scalars()
+            return {row.quarter_index: row.mcp_rs_per_mwh for row in rows}
+
+        assert day.resolution_minutes == 15
+        assert stored_prices() == {0: 200.0, 1: 600.0, 2: 200.0, 3: 200.0, 4: 220.0, 5: 220.0, 6: 220.0, 7: 220.0, 21: 700.0}
+
+        # Reloading the hourly sheet rewrites the hours it covers, but the day keeps the
+        # snapshot's 05:15 quarter instead of collapsing it away.
+        ingest_damgdam(db_session, sample_wide_workbook)
+        db_session.refresh(day)
+        assert day.resolution_minutes == 15
+        assert stored_prices() == {**{quarter: 200.0 for quarter in range(4)}, **{quarter: 220.0 for quarter in range(4, 8)}, 21: 700.0}
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.main import app
+from app.core.config import get_settings
+from app.core.logging import QueueSink, SampledWarnings, configure_logging, logger, shutdown_logging
+from app.core.metrics import LOG_RECORDS_DROPPED
+
+
+@pytest.fixture()
+def json_lines(monkeypatch) -> List[str]:
+    monkeypatch.setattr(get_settings(), "log_json", True)
+    lines: List[str] = []
+    configure_logging(writers=[lines.append], force=True)
+    yield lines
+    shutdown_logging()
+    logger.remove()
+
+
+def test_request_logs_are_json_with_correlation_id(json_lines):
+    response = TestClient(app).get("/api/health", headers={"X-Correlation-ID": "abc123"})
+    assert response.status_code == 200
+    shutdown_logging()  # drain the writer thread
+
+    (line,) = [record for record in map(json.loads, json_lines) if record["logger"] == "app.api.main"]
+    assert line["correlation_id"] == "abc123"
+    assert line["message"].startswith("GET /api/health -> 200 in ")
+    assert line["level"] == "INFO"
+
+
+def test_etl_warnings_are_sampled_and_interpolated(json_lines):
+    skipped = SampledWarnings("dam_snapshot", first=2, every=3)
+    for row in range(2, 12):
+        skipped.warn("missing_mcp", "Skipping {file} row {row}: no MCP value", file="DAM.xlsx", row=row)
+    skipped.flush()
+    shutdown_logging()
+
+    records = [json.loads(line) for line in json_lines]
+    logged = [r["message"] for r in records if "occurrence" in r]
+    assert logged == [
+        "Skipping DAM.xlsx row 2: no MCP value",
+        "Skipping DAM.xlsx row 3: no MCP value",
+        "Skipping DAM.xlsx row 6: no MCP value",
+        "Skipping DAM.xlsx row 9: no MCP value",
+    ]
+    (summary,) = [r for r in records if "suppressed" in r]
+    assert (summary["total"], summary["suppressed"]) == (10, 6)
+
+
+def test_full_queue_drops_instead_of_blocking():
+    release = threading.Event()
+    sink = QueueSink([lambda line: release.wait(5)], json_output=False, maxsize=1)
+    logger.remove()
+    logger.add(sink, format="{message}")
+    before = LOG_RECORDS_DROPPED.value()
+    try:
+        for index in range(5):
+            logger.info("record {}", index)
+        assert LOG_RECORDS_DROPPED.value() - before >= 3
+    finally:
+        release.set()
+        sink.stop()
+        logger.remove()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_db
+from app.api.main import app
+from app.core.config import get_settings
+from app.core.data_version import apply_data_versions
+from app.core.metrics import PRICE_CUBE_LOOKUPS
+from app.db import models
+from app.db.price_cube import invalidate_price_cube, write_price_cube
+from app.etl.ingest_damgdam import ingest_damgdam
+from app.etl.ingest_gdam_snapshot import ingest_gdam_snapshot
+
+QUERIES = [
+    {"market": "DAM", "date": "2024-08-01", "start_hour": 0, "end_hour": 3},
+    {"market": "DAM", "date": "2024-08-02", "start_hour": 0, "end_hour": 24},
+    {"market": "DAM", "month": "2024-08", "start_hour": 1, "end_hour": 3, "aggregate": "max"},
+    {"market": "DAM", "month": "2024-08", "start_hour": 0, "end_hour": 24},
+    {"market": "GDAM", "date": "2024-08-01", "start_hour": 0, "end_hour": 2},
+    {"market": "GDAM", "date": "2024-08-01", "start_hour": 0, "end_hour": 2, "weighted": True},
+    {"market": "GDAM", "month": "2024-08", "start_hour": 0, "end_hour": 2, "aggregate": "min"},
+]
+
+
+@pytest.fixture()
+def client(db_session, sample_wide_workbook, tmp_path):
+    ingest_damgdam(db_session, sample_wide_workbook)
+    snapshot = tmp_path / "gdam_snapshot.xlsx"
+    pd.DataFrame(
+        {
+            "Date": ["2024-08-03"] * 4,
+            "Hour": [0, 0, 1, 1],
+            "Time Block": ["00:00 - 00:15", "00:15 - 00:30", "01:00 - 01:15", "01:15 - 01:30"],
+            "MCP (Rs/MWh)": [100, 200, 300, 400],
+            "Scheduled Volume (MW)": [10, None, 5, 15],
+        }
+    ).to_excel(snapshot, index=False)
+    ingest_gdam_snapshot(db_session, snapshot)
+    db_session.commit()
+
+    def override_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def cube_dir(tmp_path, monkeypatch):
+    directory = str(tmp_path / "cube")
+    monkeypatch.setattr(get_settings(), "price_cube_dir", directory)
+    return directory
+
+
+@pytest.mark.parametrize("params", QUERIES + [{**QUERIES[5], "date": "2024-08-03"}])
+def test_cube_answers_match_database(client, db_session, cube_dir, monkeypatch, params):
+    write_price_cube(db_session, cube_dir)
+    hits = PRICE_CUBE_LOOKUPS.value(result="hit")
+    from_cube = client.get("/api/prices", params=params)
+    assert PRICE_CUBE_LOOKUPS.value(result="hit") == hits + 1
+    assert "cube;dur=" in from_cube.headers["Server-Timing"]
+
+    monkeypatch.setattr(get_settings(), "price_cube_dir", None)
+    from_db = client.get("/api/prices", params=params)
+    assert (from_cube.status_code, from_cube.json()) == (from_db.status_code, from_db.json())
+
+
+def test_cube_misses_return_404_like_the_database(client, db_session, cube_dir):
+    write_price_cube(db_session, cube_dir)
+    response = client.get("/api/prices", params={"market": "DAM", "date": "2024-08-01", "start_hour": 5, "end_hour": 6})
+    assert response.status_code == 404
+
+
+def test_invalidated_cube_falls_back_to_database(client, db_session, cube_dir):
+    write_price_cube(db_session, cube_dir)
+    params = {"market": "DAM", "date": "2024-08-01", "start_hour": 0, "end_hour": 1}
+    assert client.get("/api/prices", params=params).json()["price_rs_per_mwh"] == 100.0
+
+    day = db_session.query(models.MarketDay).filter_by(market="DAM").order_by(models.MarketDay.trade_date).first()
+    db_session.query(models.DamPrice).filter_by(market_day_id=day.id, hour_block=0).update({"mcp_rs_per_mwh": 150})
+    invalidate_price_cube(cube_dir)
+    stale = PRICE_CUBE_LOOKUPS.value(result="stale")
+    assert client.get("/api/prices", params=params).json()["price_rs_per_mwh"] == 150.0
+    assert PRICE_CUBE_LOOKUPS.value(result="stale") == stale + 1
+
+    manifest = write_price_cube(db_session, cube_dir)
+    assert manifest["markets"]["DAM"]["days"] == 2
+    response = client.get("/api/prices", params=params)
+    assert response.json()["price_rs_per_mwh"] == 150.0
+    assert "cube;dur=" in response.headers["Server-Timing"]
+
+
+def test_ranges_before_the_cube_window_use_the_database(client, db_session, cube_dir):
+    manifest = write_price_cube(db_session, cube_dir, days=1)
+    dam = manifest["markets"]["DAM"]
+    assert (dam["start"], dam["days"], dam["slots"], dam["covers_all"]) == ("2024-08-02", 1, 24, False)
+    uncovered = PRICE_CUBE_LOOKUPS.value(result="uncovered")
+    response = client.get("/api/prices", params={"market": "DAM", "month": "2024-08", "start_hour": 0, "end_hour": 3})
+    assert response.status_code == 200
+    assert len(response.json()["daily"]) == 2
+    assert PRICE_CUBE_LOOKUPS.value(result="uncovered") == uncovered + 1
+
+
+def test_rebuild_endpoint_publishes_a_cube(client, cube_dir):
+    invalidate_price_cube(cube_dir)
+    response = client.post("/api/ingest/price-cube")
+    assert response.status_code == 200, response.text
+    assert sorted(response.json()["markets"]) == ["DAM", "GDAM"]
+    params = {"market": "DAM", "date": "2024-08-02", "start_hour": 0, "end_hour": 24}
+    data = client.get("/api/prices", params=params).json()
+    assert (data["source"], data["count"]) == ("summary", None)
+
+
+def test_months_bumped_after_the_build_use_the_database(client, db_session, cube_dir):
+    manifest = write_price_cube(db_session, cube_dir)
+    assert manifest["versions"] == {"DAM:2024-08": 1, "GDAM:2024-08": 2}
+
+    # An ETL job outside the API bumped DAM; the watcher has picked it up, the cube has not.
+    apply_data_versions({"DAM:2024-08": 2, "GDAM:2024-08": 2})
+    stale, hits = PRICE_CUBE_LOOKUPS.value(result="stale"), PRICE_CUBE_LOOKUPS.value(result="hit")
+    client.get("/api/prices", params={"market": "DAM", "date": "2024-08-01"})
+    client.get("/api/prices", params={"market": "GDAM", "date": "2024-08-01"})
+    assert PRICE_CUBE_LOOKUPS.value(result="stale") == stale + 1
+    assert PRICE_CUBE_LOOKUPS.value(result="hit") == hits + 1
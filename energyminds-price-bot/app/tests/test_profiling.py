@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings
+from app.core.profiling import PROFILE_HEADER, install_profiling
+
+
+def _busy_aggregation() -> int:
+    return sum(i * i for i in range(20000))
+
+
+def _app(tmp_path, **env) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/work")
+    def work() -> dict:
+        # Sync endpoint: runs on a threadpool worker, not the event loop thread.
+        return {"total": _busy_aggregation()}
+
+    install_profiling(app, Settings(PROFILE_DIR=str(tmp_path), **env))
+    return app
+
+
+def test_disabled_profiling_installs_nothing(tmp_path):
+    app = FastAPI()
+    before = list(app.user_middleware)
+    assert install_profiling(app, Settings(PROFILE_DIR=str(tmp_path))) is None
+    assert app.user_middleware == before
+
+
+def test_header_profiles_worker_thread_and_serves_summary(tmp_path):
+    client = TestClient(_app(tmp_path, PROFILE_TOKEN="s3cret"))
+
+    response = client.get("/work", headers={PROFILE_HEADER: "s3cret", "X-Correlation-ID": "req-42"})
+    assert response.status_code == 200
+    name = response.headers[PROFILE_HEADER]
+    assert name.endswith("-header-req-42")
+    assert (tmp_path / f"{name}.prof").is_file()
+
+    summary = client.get(f"/api/debug/profiles/{name}", headers={PROFILE_HEADER: "s3cret"})
+    assert summary.status_code == 200
+    assert "_busy_aggregation" in summary.text
+    assert len(list(tmp_path.glob("*.prof"))) == 1
+
+    assert client.get(f"/api/debug/profiles/{name}").status_code == 403
+    assert client.get("/api/debug/profiles/..%2Fsecret", headers={PROFILE_HEADER: "s3cret"}).status_code in (400, 404)
+
+
+def test_wrong_token_is_not_profiled(tmp_path):
+    client = TestClient(_app(tmp_path, PROFILE_TOKEN="s3cret"))
+
+    response = client.get("/work", headers={PROFILE_HEADER: "guess"})
+    assert response.status_code == 200
+    assert PROFILE_HEADER not in response.headers
+    assert not list(tmp_path.glob("*.prof"))
+
+
+def test_sampling_profiles_one_in_n(tmp_path):
+    client = TestClient(_app(tmp_path, PROFILE_SAMPLE_EVERY=3))
+
+    headers = [client.get("/work").headers.get(PROFILE_HEADER) for _ in range(6)]
+    assert [h is not None for h in headers] == [False, False, True, False, False, True]
+    assert len(list(tmp_path.glob("*-sampled-*.prof"))) == 2
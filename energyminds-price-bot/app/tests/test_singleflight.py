@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_computation():
+    flight: SingleFlight[int] = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def compute() -> int:
+        calls.append(1)
+        release.wait(timeout=5)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flight.do, "key", compute) for _ in range(5)]
+        while flight.in_flight() == 0:
+            pass
+        # Give followers time to join the in-flight call before the leader finishes.
+        threading.Event().wait(0.1)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert {value for value, _ in results} == {42}
+    assert sum(1 for _, shared in results if not shared) == 1
+    assert flight.in_flight() == 0
+
+
+def test_errors_propagate_and_are_not_cached():
+    flight: SingleFlight[int] = SingleFlight()
+
+    def fail() -> int:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: 7) == (7, False)
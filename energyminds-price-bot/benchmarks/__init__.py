@@ -0,0 +1,4 @@
+"""Synthetic-data benchmarks for the ingest and query paths.
+
+Run ``python -m benchmarks run --days 365`` from the project root; see ``benchmarks/__main__.py``.
+"""
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Callable, Generator
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import models  # noqa: F401  # register tables on Base.metadata
+from app.db.base import Base
+
+
+def make_engine(database_url: str) -> Engine:
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    return create_engine(database_url, connect_args=connect_args)
+
+
+def reset_schema(engine: Engine) -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def session_dependency(engine: Engine) -> Callable[[], Generator[Session, None, None]]:
+    """Build a ``get_db`` replacement bound to ``engine``."""
+    factory = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+    def override() -> Generator[Session, None, None]:
+        session = factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    return override
+
+
+__all__ = ["make_engine", "reset_schema", "session_dependency"]
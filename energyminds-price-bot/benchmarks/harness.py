@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class BenchResult:
+    name: str
+    seconds: float
+    rows: Optional[int] = None
+    rows_per_second: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process; ``ru_maxrss`` is KiB on Linux and bytes on macOS."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_summary(samples_ms: Sequence[float]) -> Dict[str, float]:
+    return {
+        "mean": round(statistics.fmean(samples_ms), 3),
+        "p50": round(percentile(samples_ms, 50), 3),
+        "p95": round(percentile(samples_ms, 95), 3),
+        "p99": round(percentile(samples_ms, 99), 3),
+        "min": round(min(samples_ms), 3),
+        "max": round(max(samples_ms), 3),
+    }
+
+
+def time_repeated(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> List[float]:
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = perf_counter()
+        fn()
+        samples.append((perf_counter() - start) * 1000)
+    return samples
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_metadata(**extra: Any) -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **extra,
+    }
+
+
+def write_results(path: Path, metadata: Dict[str, Any], results: Sequence[BenchResult]) -> None:
+    payload = {"metadata": metadata, "results": [asdict(result) for result in results]}
+    path.write_text(json.dumps(payload, indent=2, default=str))
+
+
+def compare_results(baseline_path: Path, candidate_path: Path) -> List[str]:
+    """Render one line per benchmark with the relative change of its headline number."""
+    baseline = {r["name"]: r for r in json.loads(baseline_path.read_text())["results"]}
+    candidate = {r["name"]: r for r in json.loads(candidate_path.read_text())["results"]}
+    lines = []
+    for name in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[name], candidate[name]
+        if old.get("latency_ms") and new.get("latency_ms"):
+            metric, before, after = "p50_ms", old["latency_ms"]["p50"], new["latency_ms"]["p50"]
+        elif old.get("rows_per_second") and new.get("rows_per_second"):
+            metric, before, after = "rows_per_second", old["rows_per_second"], new["rows_per_second"]
+        else:
+            metric, before, after = "seconds", old["seconds"], new["seconds"]
+        change = (after - before) / before * 100 if before else 0.0
+        lines.append(f"{name:<32} {metric:<16} {before:>12.3f} -> {after:>12.3f} ({change:+.1f}%)")
+    return lines
+
+
+__all__ = [
+    "BenchResult",
+    "compare_results",
+    "environment_metadata",
+    "latency_summary",
+    "peak_rss_mb",
+    "percentile",
+    "time_repeated",
+    "write_results",
+]
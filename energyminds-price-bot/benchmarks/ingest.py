@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from datetime import date
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from .harness import BenchResult, peak_rss_mb
+from .synthetic import write_dam_snapshot, write_gdam_snapshot, write_rtm_snapshot, write_wide_workbook
+
+Writer = Callable[[Path, date, int], Path]
+
+CASES: Dict[str, Tuple[Writer, str]] = {
+    "damgdam": (write_wide_workbook, "ingest_damgdam"),
+    "dam_snapshot": (write_dam_snapshot, "ingest_dam_snapshot"),
+    "gdam_snapshot": (write_gdam_snapshot, "ingest_gdam_snapshot"),
+    "rtm_snapshot": (write_rtm_snapshot, "ingest_rtm_snapshot"),
+}
+
+
+def _load_ingester(name: str) -> Callable[[Session, Path], None]:
+    from app.etl import ingest_dam_snapshot, ingest_damgdam, ingest_gdam_snapshot, ingest_rtm_snapshot
+
+    modules = {
+        "ingest_damgdam": ingest_damgdam,
+        "ingest_dam_snapshot": ingest_dam_snapshot,
+        "ingest_gdam_snapshot": ingest_gdam_snapshot,
+        "ingest_rtm_snapshot": ingest_rtm_snapshot,
+    }
+    return getattr(modules[name], name)
+
+
+def _run_case(database_url: str, file_type: str, path: str) -> Dict[str, Any]:
+    """Ingest ``path`` into a fresh schema; runs in a child process so peak RSS is per case."""
+    from app.core.logging import logger
+    from app.core.metrics import INGEST_ROWS
+
+    from .db import make_engine, reset_schema
+
+    logger.remove()
+    engine = make_engine(database_url)
+    reset_schema(engine)
+    ingest = _load_ingester(CASES[file_type][1])
+
+    start = perf_counter()
+    with Session(engine) as session:
+        ingest(session, Path(path))
+        session.commit()
+    elapsed = perf_counter() - start
+    engine.dispose()
+
+    rows = int(INGEST_ROWS.value(file_type=file_type))
+    result = BenchResult(
+        name=f"ingest_{file_type}",
+        seconds=round(elapsed, 4),
+        rows=rows,
+        rows_per_second=round(rows / elapsed, 1) if elapsed else None,
+        peak_rss_mb=peak_rss_mb(),
+        extra={"file_bytes": Path(path).stat().st_size},
+    )
+    return asdict(result)
+
+
+def run_ingest_benchmarks(database_url: str, workdir: Path, start: date, days: int) -> List[BenchResult]:
+    results: List[BenchResult] = []
+    context = multiprocessing.get_context("spawn")
+    for file_type, (writer, _) in CASES.items():
+        path = writer(workdir / f"{file_type}.xlsx", start, days)
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            payload = pool.submit(_run_case, database_url, file_type, str(path)).result()
+        payload["extra"]["days"] = days
+        results.append(BenchResult(**payload))
+    return results
+
+
+__all__ = ["CASES", "run_ingest_benchmarks"]
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from app.chatbot.nlp import parse_message
+
+from .harness import BenchResult, latency_summary
+
+Request = Tuple[str, Dict[str, Any]]
+
+DEFAULT_MIX = {"day": 4, "month": 2, "weighted": 2, "batch": 1, "chat": 3}
+
+# Phrasings seen in the chatbot; ``{date}``/``{month_name}``/``{year}`` are filled from the data range.
+CHAT_TEMPLATES = (
+    "DAM price for {date} 0-8",
+    "gdam 7-10 hrs {date} weighted",
+    "rtm {date} 18 to 22",
+    "What was the DAM price on {date}?",
+    "GDAM average {month_name} {year}",
+    "rtm volume weighted {month_name} {year} 6-9",
+    "DAM max {date} 0-24",
+    "min gdam price {date} 10-14",
+)
+
+
+@dataclass
+class Sample:
+    kind: str
+    latency_ms: float
+    ok: bool
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse ``day=4,month=2`` into a weight mapping; unknown kinds are rejected."""
+    mix: Dict[str, int] = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in DEFAULT_MIX:
+            raise ValueError(f"Unknown query kind {kind!r}; expected one of {sorted(DEFAULT_MIX)}")
+        mix[kind] = int(weight or 1)
+    return mix
+
+
+def chat_messages(start: date, days: int, chat_log: Optional[Path] = None) -> List[str]:
+    """Messages from a chat log (one per line) or the templates filled over ``days`` trading days."""
+    if chat_log is not None:
+        return [line.strip() for line in chat_log.read_text().splitlines() if line.strip()]
+    return [
+        template.format(date=d.isoformat(), month_name=d.strftime("%B"), year=d.year)
+        for d in (start + timedelta(days=offset) for offset in range(days))
+        for template in CHAT_TEMPLATES
+    ]
+
+
+def chat_requests(messages: Sequence[str]) -> List[Request]:
+    """Turn chat messages into the ``/api/prices`` calls the bot would make for them."""
+    requests: List[Request] = []
+    for message in messages:
+        params = parse_message(message)
+        if "date" in params or "month" in params:
+            requests.append(("/api/prices", params))
+    return requests
+
+
+def build_workload(start: date, days: int, chat_log: Optional[Path] = None) -> Dict[str, List[Any]]:
+    """Concrete requests per query kind over the trading days ``start .. start + days``."""
+    calendar = [start + timedelta(days=offset) for offset in range(days)]
+    months = sorted({d.strftime("%Y-%m") for d in calendar})
+    windows = [(0, 24), (0, 8), (7, 10), (18, 22), (6, 9)]
+    markets = ("DAM", "GDAM", "RTM")
+
+    day = [
+        ("/api/prices", {"market": market, "date": d.isoformat(), "start_hour": s, "end_hour": e})
+        for d in calendar
+        for market in markets
+        for s, e in windows
+    ]
+    month = [
+        ("/api/prices", {"market": market, "month": m, "start_hour": s, "end_hour": e})
+        for m in months
+        for market in markets
+        for s, e in windows
+    ]
+    weighted = [
+        ("/api/prices", {"market": market, "date": d.isoformat(), "start_hour": s, "end_hour": e, "weighted": True})
+        for d in calendar
+        for market in ("GDAM", "RTM")
+        for s, e in windows
+    ]
+    # A batch is one user turn that compares every market for the same window.
+    batch = [[(path, {**params, "market": market}) for market in markets] for path, params in day[:: len(markets)]]
+
+    messages = chat_messages(start, days, chat_log)
+    return {"day": day, "month": month, "weighted": weighted, "batch": batch, "chat": chat_requests(messages)}
+
+
+async def _send(client: httpx.AsyncClient, request: Request) -> bool:
+    path, params = request
+    try:
+        response = await client.get(path, params=params)
+    except httpx.HTTPError:
+        return False
+    return response.status_code < 400
+
+
+async def _virtual_user(
+    client: httpx.AsyncClient,
+    workload: Dict[str, List[Any]],
+    kinds: Sequence[str],
+    weights: Sequence[int],
+    deadline: float,
+    rng: random.Random,
+    samples: List[Sample],
+) -> None:
+    # Closed loop: each user waits for its reply before issuing the next query.
+    while perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        item = rng.choice(workload[kind])
+        start = perf_counter()
+        if kind == "batch":
+            ok = all(await asyncio.gather(*(_send(client, request) for request in item)))
+        else:
+            ok = await _send(client, item)
+        samples.append(Sample(kind=kind, latency_ms=(perf_counter() - start) * 1000, ok=ok))
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    workload: Dict[str, List[Any]],
+    mix: Dict[str, int],
+    users: int,
+    duration: float,
+    seed: int = 0,
+) -> Tuple[List[Sample], float]:
+    kinds = [kind for kind in mix if mix[kind] > 0 and workload.get(kind)]
+    if not kinds:
+        raise ValueError("Query mix selects no kinds with available requests")
+    weights = [mix[kind] for kind in kinds]
+    samples: List[Sample] = []
+    start = perf_counter()
+    deadline = start + duration
+    await asyncio.gather(
+        *(
+            _virtual_user(client, workload, kinds, weights, deadline, random.Random(seed + index), samples)
+            for index in range(users)
+        )
+    )
+    return samples, perf_counter() - start
+
+
+def summarise(samples: Sequence[Sample], elapsed: float, users: int) -> List[BenchResult]:
+    by_kind: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_kind[sample.kind].append(sample)
+    results = []
+    for name, group in [("load_all", list(samples))] + sorted((f"load_{k}", v) for k, v in by_kind.items()):
+        if not group:
+            continue
+        errors = sum(1 for sample in group if not sample.ok)
+        results.append(
+            BenchResult(
+                name=name,
+                seconds=round(elapsed, 3),
+                latency_ms=latency_summary([sample.latency_ms for sample in group]),
+                extra={
+                    "users": users,
+                    "requests": len(group),
+                    "throughput_rps": round(len(group) / elapsed, 2) if elapsed else 0.0,
+                    "error_rate": round(errors / len(group), 4),
+                },
+            )
+        )
+    return results
+
+
+__all__ = ["DEFAULT_MIX", "build_workload", "chat_messages", "chat_requests", "parse_mix", "run_load", "summarise"]
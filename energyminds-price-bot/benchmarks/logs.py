@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from .harness import BenchResult, latency_summary, time_repeated
+
+MODES = ("disabled", "sync_file", "queued_text", "queued_json")
+
+
+def _configure(mode: str, path: Path) -> Callable[[], None]:
+    """Install the sink for ``mode`` and return a function that drains and removes it."""
+    from app.core.config import get_settings
+    from app.core.logging import configure_logging, logger, shutdown_logging
+
+    shutdown_logging()
+    logger.remove()
+    if mode == "disabled":
+        return lambda: None
+    if mode == "sync_file":
+        # The previous setup: formatting and the file write both happen on the calling thread.
+        handle = path.open("a")
+        logger.add(handle, format="{time} {level} {name} {message} {extra}", enqueue=False)
+        return lambda: (logger.remove(), handle.close())  # type: ignore[func-returns-value]
+
+    settings = get_settings()
+    handle = path.open("a")
+
+    def write(line: str) -> None:
+        handle.write(line + "\n")
+
+    previous = settings.log_json
+    settings.log_json = mode == "queued_json"
+    try:
+        configure_logging(writers=[write], force=True)
+    finally:
+        settings.log_json = previous
+    return lambda: (shutdown_logging(), logger.remove(), handle.close())  # type: ignore[func-returns-value]
+
+
+def run_logging_benchmarks(workdir: Path, repeat: int) -> List[BenchResult]:
+    """Per-request latency of ``GET /api/health`` and per-call log cost for each sink setup."""
+    from fastapi.testclient import TestClient
+
+    from app.api.main import app
+    from app.core.logging import logger
+
+    client = TestClient(app)
+    results: List[BenchResult] = []
+    baseline_p50: Dict[str, float] = {}
+    for mode in MODES:
+        path = workdir / f"{mode}.log"
+        teardown = _configure(mode, path)
+        try:
+            request_ms = time_repeated(lambda: client.get("/api/health"), repeat, warmup=10)
+            start = perf_counter()
+            for index in range(repeat):
+                logger.bind(correlation_id="bench", db_ms=1.25, rows=index).info("GET {path} -> {status}", path="/api/health", status=200)
+            per_call_us = (perf_counter() - start) * 1e6 / repeat
+        finally:
+            teardown()
+        summary = latency_summary(request_ms)
+        baseline_p50.setdefault("p50", summary["p50"])
+        results.append(
+            BenchResult(
+                name=f"log_{mode}",
+                seconds=round(sum(request_ms) / 1000, 4),
+                latency_ms=summary,
+                extra={
+                    "per_call_us": round(per_call_us, 2),
+                    "overhead_ms_p50": round(summary["p50"] - baseline_p50["p50"], 4),
+                    "log_bytes": path.stat().st_size if path.exists() else 0,
+                    "repeat": repeat,
+                },
+            )
+        )
+    logger.remove()
+    return results
+
+
+__all__ = ["MODES", "run_logging_benchmarks"]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from time import perf_counter
+from typing import List
+
+from app.chatbot.nlp import parse_message, parse_queries
+
+from .harness import BenchResult, latency_summary, peak_rss_mb
+
+
+def run_nlp_benchmarks(messages: List[str], repeat: int) -> List[BenchResult]:
+    """Parse every message ``repeat`` times per parser entry point and report messages per second."""
+    if not messages:
+        raise ValueError("No chat messages to parse")
+    results = []
+    for name, parse in (("nlp_parse_message", parse_message), ("nlp_parse_queries", parse_queries)):
+        for message in messages:
+            parse(message)
+        samples: List[float] = []
+        start = perf_counter()
+        for _ in range(repeat):
+            batch_start = perf_counter()
+            for message in messages:
+                parse(message)
+            samples.append((perf_counter() - batch_start) * 1000 / len(messages))
+        elapsed = perf_counter() - start
+        total = len(messages) * repeat
+        results.append(
+            BenchResult(
+                name=name,
+                seconds=round(elapsed, 3),
+                rows=total,
+                rows_per_second=round(total / elapsed, 1) if elapsed else None,
+                peak_rss_mb=peak_rss_mb(),
+                latency_ms=latency_summary(samples),
+                extra={"messages": len(messages), "repeat": repeat},
+            )
+        )
+    return results
+
+
+__all__ = ["run_nlp_benchmarks"]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from .db import make_engine, reset_schema, session_dependency
+from .harness import BenchResult, latency_summary, peak_rss_mb, time_repeated
+from .synthetic import write_rtm_snapshot, write_wide_workbook
+
+Case = Tuple[str, str, Dict[str, Any]]
+
+
+def _cases(start: date, days: int) -> List[Case]:
+    last_day = start + timedelta(days=days - 1)
+    month = last_day.strftime("%Y-%m")
+    range_start = max(start, last_day - timedelta(days=89))
+    return [
+        ("query_day_dam_summary", "/api/prices", {"market": "DAM", "date": last_day.isoformat(), "start_hour": 7, "end_hour": 10}),
+        ("query_day_dam_raw", "/api/prices", {"market": "DAM", "date": last_day.isoformat(), "start_hour": 6, "end_hour": 9}),
+        ("query_day_rtm_weighted", "/api/prices", {"market": "RTM", "date": last_day.isoformat(), "weighted": True}),
+        ("query_month_gdam", "/api/prices", {"market": "GDAM", "month": month, "start_hour": 6, "end_hour": 9}),
+        ("query_month_rtm", "/api/prices", {"market": "RTM", "month": month}),
+        (
+            "query_range_rtm_rolling",
+            "/api/prices/rolling",
+            {"market": "RTM", "start": range_start.isoformat(), "end": last_day.isoformat(), "window": 7},
+        ),
+    ]
+
+
+def seed_database(database_url: str, workdir: Path, start: date, days: int) -> None:
+    from app.etl.ingest_damgdam import ingest_damgdam
+    from app.etl.ingest_rtm_snapshot import ingest_rtm_snapshot
+
+    engine = make_engine(database_url)
+    reset_schema(engine)
+    with Session(engine) as session:
+        ingest_damgdam(session, write_wide_workbook(workdir / "query_damgdam.xlsx", start, days))
+        ingest_rtm_snapshot(session, write_rtm_snapshot(workdir / "query_rtm.xlsx", start, days))
+        session.commit()
+    engine.dispose()
+
+
+def run_query_benchmarks(
+    database_url: str, workdir: Path, start: date, days: int, repeat: int, price_cube: bool = False
+) -> List[BenchResult]:
+    """Time the REST handlers in-process through ``TestClient`` against a seeded database.
+
+    With ``price_cube`` every case runs a second time (suffixed ``_cube``) with the
+    memory-mapped price cube built from the same data.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.api.deps import get_db
+    from app.api.main import app
+    from app.core.config import get_settings
+    from app.core.logging import logger
+
+    logger.remove()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    seed_database(database_url, workdir, start, days)
+    engine = make_engine(database_url)
+    app.dependency_overrides[get_db] = session_dependency(engine)
+
+    settings = get_settings()
+    modes = [("", None)]
+    if price_cube:
+        from app.db.price_cube import write_price_cube
+
+        cube_dir = workdir / "price_cube"
+        with Session(engine) as session:
+            write_price_cube(session, str(cube_dir), days)
+        modes.append(("_cube", str(cube_dir)))
+
+    results: List[BenchResult] = []
+    previous_cube_dir = settings.price_cube_dir
+    try:
+        with TestClient(app) as client:
+            for suffix, cube_dir_setting in modes:
+                settings.price_cube_dir = cube_dir_setting
+                for name, path, params in _cases(start, days):
+
+                    def call() -> None:
+                        response = client.get(path, params=params)
+                        response.raise_for_status()
+
+                    samples = time_repeated(call, repeat)
+                    results.append(
+                        BenchResult(
+                            name=name + suffix,
+                            seconds=round(sum(samples) / 1000, 4),
+                            peak_rss_mb=peak_rss_mb(),
+                            latency_ms=latency_summary(samples),
+                            extra={"path": path, "params": params, "repeat": repeat, "days": days},
+                        )
+                    )
+    finally:
+        settings.price_cube_dir = previous_cube_dir
+        app.dependency_overrides.pop(get_db, None)
+        engine.dispose()
+    return results
+
+
+__all__ = ["run_query_benchmarks", "seed_database"]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .harness import BenchResult, latency_summary
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "app.etl.ingest_damgdam")
+
+# Runs in a fresh interpreter so nothing the benchmark harness imported is already loaded.
+_PROBE = """
+import asyncio, json, resource, sys, time
+start = time.perf_counter()
+import app.api.main as main
+imported = time.perf_counter()
+
+async def boot():
+    async with main.lifespan(main.app):
+        pass
+
+asyncio.run(boot())
+ready = time.perf_counter()
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "peak_rss_mb": peak / (1024 * 1024 if sys.platform == "darwin" else 1024),
+    "loaded": [name for name in %r if name in sys.modules],
+    "routes": sorted(getattr(route, "path", "") for route in main.app.routes),
+}))
+""" % (HEAVY_MODULES,)
+
+
+def _probe(api_role: str, database_url: Optional[str]) -> Dict[str, Any]:
+    env = {**os.environ, "API_ROLE": api_role}
+    if database_url:
+        env["DATABASE_URL"] = database_url
+    output = subprocess.check_output([sys.executable, "-c", _PROBE], cwd=PROJECT_ROOT, env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_startup_benchmarks(repeat: int, database_url: Optional[str] = None) -> List[BenchResult]:
+    """Cold import + lifespan startup of the API per ``API_ROLE``, one fresh process per sample."""
+    results: List[BenchResult] = []
+    for role in ("all", "query"):
+        samples = [_probe(role, database_url) for _ in range(repeat)]
+        cold_ms = [s["import_ms"] + s["startup_ms"] for s in samples]
+        last = samples[-1]
+        results.append(
+            BenchResult(
+                name=f"startup_api_{role}",
+                seconds=round(statistics.median(cold_ms) / 1000, 4),
+                peak_rss_mb=round(statistics.median(s["peak_rss_mb"] for s in samples), 2),
+                latency_ms=latency_summary(cold_ms),
+                extra={
+                    "import_ms_p50": round(statistics.median(s["import_ms"] for s in samples), 2),
+                    "startup_ms_p50": round(statistics.median(s["startup_ms"] for s in samples), 2),
+                    "heavy_modules_loaded": last["loaded"],
+                    "ingest_mounted": any(path.startswith("/api/ingest") for path in last["routes"]),
+                    "repeat": repeat,
+                },
+            )
+        )
+    return results
+
+
+__all__ = ["HEAVY_MODULES", "run_startup_benchmarks"]
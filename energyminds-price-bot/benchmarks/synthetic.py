@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+SUMMARY_WINDOWS = ((7, 10), (18, 22))
+PRICE_CAP = 10000.0
+
+
+def trading_days(start: date, days: int) -> List[date]:
+    return [start + timedelta(days=offset) for offset in range(days)]
+
+
+def _quarter_prices(rng: np.random.Generator, days: List[date]) -> np.ndarray:
+    """Return a ``days x 96`` grid of MCP values with seasonal, intraday and noise components."""
+    day_of_year = np.array([d.timetuple().tm_yday for d in days], dtype=float)[:, None]
+    quarter = np.arange(96, dtype=float)[None, :]
+    hour = quarter / 4
+    seasonal = 800 * np.sin(2 * np.pi * day_of_year / 365.25)
+    evening_peak = 2500 * np.exp(-((hour - 20) ** 2) / 4)
+    solar_dip = -1500 * np.exp(-((hour - 12.5) ** 2) / 6)
+    noise = rng.normal(0, 300, size=(len(days), 96))
+    return np.clip(4000 + seasonal + evening_peak + solar_dip + noise, 0, PRICE_CAP).round(2)
+
+
+def _volumes(rng: np.random.Generator, shape: tuple[int, int]) -> np.ndarray:
+    return rng.uniform(5000, 12000, size=shape).round(2)
+
+
+def _hourly(prices: np.ndarray) -> np.ndarray:
+    return prices.reshape(prices.shape[0], 24, 4).mean(axis=2).round(2)
+
+
+def _time_block(quarter: int) -> str:
+    start = quarter * 15
+    end = start + 15
+    return f"{start // 60:02d}:{start % 60:02d} - {end // 60 % 24:02d}:{end % 60:02d}"
+
+
+def _wide_sheet(days: List[date], hourly: np.ndarray) -> pd.DataFrame:
+    rows: List[list] = [[""] + [d.isoformat() for d in days]]
+    for hour in range(24):
+        rows.append([f"{hour:02d} - {hour + 1:02d}"] + hourly[:, hour].tolist())
+    rows.append(["RTC"] + hourly.mean(axis=1).round(4).tolist())
+    for start, end in SUMMARY_WINDOWS:
+        label = f"Avg. ({start:02d}-{end:02d} Hrs)"
+        rows.append([label] + hourly[:, start:end].mean(axis=1).round(4).tolist())
+    return pd.DataFrame(rows)
+
+
+def write_wide_workbook(path: Path, start: date, days: int, seed: int = 0) -> Path:
+    """Write a ``DAMGDAM.xlsx`` style workbook: dates as columns, hour blocks and summaries as rows."""
+    rng = np.random.default_rng(seed)
+    calendar = trading_days(start, days)
+    dam = _hourly(_quarter_prices(rng, calendar))
+    gdam = _hourly(_quarter_prices(rng, calendar))
+    with pd.ExcelWriter(path) as writer:
+        _wide_sheet(calendar, dam).to_excel(writer, sheet_name="DAM", index=False, header=False)
+        _wide_sheet(calendar, gdam).to_excel(writer, sheet_name="GDAM", index=False, header=False)
+    return path
+
+
+def write_dam_snapshot(path: Path, start: date, days: int, seed: int = 1) -> Path:
+    rng = np.random.default_rng(seed)
+    calendar = trading_days(start, days)
+    hourly = _hourly(_quarter_prices(rng, calendar))
+    df = pd.DataFrame(
+        {
+            "Date": np.repeat([d.isoformat() for d in calendar], 24),
+            "Hour": np.tile(np.arange(1, 25), len(calendar)),
+            "Weighted MCP (Rs/MWh)": hourly.ravel(),
+        }
+    )
+    df.to_excel(path, index=False)
+    return path
+
+
+def write_gdam_snapshot(path: Path, start: date, days: int, seed: int = 2) -> Path:
+    rng = np.random.default_rng(seed)
+    calendar = trading_days(start, days)
+    prices = _quarter_prices(rng, calendar)
+    quarters = np.tile(np.arange(96), len(calendar))
+    df = pd.DataFrame(
+        {
+            "Date": np.repeat([d.isoformat() for d in calendar], 96),
+            "Hour": quarters // 4,
+            "Time Block": [_time_block(q) for q in quarters],
+            "MCP (Rs/MWh)": prices.ravel(),
+            "Scheduled Volume (MW)": _volumes(rng, prices.shape).ravel(),
+            "Hydro FSV (MW)": _volumes(rng, prices.shape).ravel() / 10,
+        }
+    )
+    df.to_excel(path, index=False)
+    return path
+
+
+def write_rtm_snapshot(path: Path, start: date, days: int, seed: int = 3) -> Path:
+    rng = np.random.default_rng(seed)
+    calendar = trading_days(start, days)
+    prices = _quarter_prices(rng, calendar)
+    quarters = np.tile(np.arange(96), len(calendar))
+    df = pd.DataFrame(
+        {
+            "Date": np.repeat([d.isoformat() for d in calendar], 96),
+            "Hour": quarters // 4 + 1,
+            "Session ID": quarters // 2 + 1,
+            "Time Block": [_time_block(q) for q in quarters],
+            "MCP (Rs/MWh)": prices.ravel(),
+            "MCV (MW)": _volumes(rng, prices.shape).ravel(),
+            "Final Scheduled Volume (MW)": _volumes(rng, prices.shape).ravel(),
+        }
+    )
+    df.to_excel(path, index=False)
+    return path
+
+
+__all__ = [
+    "trading_days",
+    "write_dam_snapshot",
+    "write_gdam_snapshot",
+    "write_rtm_snapshot",
+    "write_wide_workbook",
+]
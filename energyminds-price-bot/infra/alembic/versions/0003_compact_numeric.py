@@ -0,0 +1,55 @@
+"""integer paise prices, float8 volumes
+
+``mcp_rs_per_mwh`` stays for one release as a stored generated column over the paise value, so
+``power_reader`` and other direct SQL consumers keep working while they move to
+``mcp_paise_per_mwh``. The ORM never reads or writes it.
+
+DEPRECATED 2026-10-19: the column gives back part of the row-size saving (a stored NUMERIC per
+price row). A follow-up migration drops it in the first release after 2027-01-31. Direct SQL
+readers must select ``mcp_paise_per_mwh / 100.0`` by then.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_compact_numeric"
+down_revision: Union[str, None] = "0002_data_version"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRICE_TABLES = ("dam_price", "gdam_price", "rtm_price")
+VOLUME_COLUMNS = (
+    ("gdam_price", "hydro_fsv_mw"),
+    ("gdam_price", "scheduled_volume_mw"),
+    ("rtm_price", "mcv_mw"),
+    ("rtm_price", "fsv_mw"),
+)
+
+
+def upgrade() -> None:
+    # NUMERIC(10,2) holds whole paise, so the conversion is exact.
+    for table in PRICE_TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN mcp_rs_per_mwh TYPE integer USING round(mcp_rs_per_mwh * 100)::integer"
+        )
+        op.execute(f"ALTER TABLE {table} RENAME COLUMN mcp_rs_per_mwh TO mcp_paise_per_mwh")
+        op.execute(
+            f"ALTER TABLE {table} ADD COLUMN mcp_rs_per_mwh numeric(10,2) "
+            "GENERATED ALWAYS AS (mcp_paise_per_mwh / 100.0) STORED"
+        )
+    for table, column in VOLUME_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE double precision")
+    op.execute("ALTER TABLE market_summary ALTER COLUMN value TYPE double precision")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE market_summary ALTER COLUMN value TYPE numeric(12,4) USING round(value::numeric, 4)")
+    for table, column in VOLUME_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE numeric(12,2) USING round({column}::numeric, 2)")
+    for table in PRICE_TABLES:
+        op.execute(f"ALTER TABLE {table} DROP COLUMN mcp_rs_per_mwh")
+        op.execute(f"ALTER TABLE {table} RENAME COLUMN mcp_paise_per_mwh TO mcp_rs_per_mwh")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN mcp_rs_per_mwh TYPE numeric(10,2) USING mcp_rs_per_mwh / 100.0"
+        )
@@ -0,0 +1,23 @@
+"""holiday calendar"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_holiday"
+down_revision: Union[str, None] = "0003_compact_numeric"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "holiday",
+        sa.Column("holiday_date", sa.Date(), primary_key=True),
+        sa.Column("name", sa.Text(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("holiday")
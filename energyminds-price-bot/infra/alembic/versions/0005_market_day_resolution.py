@@ -0,0 +1,35 @@
+"""market_day.resolution_minutes"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_market_day_resolution"
+down_revision: Union[str, None] = "0004_holiday"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "market_day",
+        sa.Column("resolution_minutes", sa.SmallInteger(), nullable=False, server_default="15"),
+    )
+    op.create_check_constraint("ck_market_day_resolution", "market_day", "resolution_minutes IN (15, 60)")
+    op.execute("UPDATE market_day SET resolution_minutes = 60 WHERE market = 'DAM'")
+
+
+def downgrade() -> None:
+    # Expand hourly GDAM days back into quarter rows before the marker goes away.
+    op.execute(
+        """
+        INSERT INTO gdam_price (market_day_id, quarter_index, mcp_paise_per_mwh, hydro_fsv_mw, scheduled_volume_mw)
+        SELECT g.market_day_id, g.quarter_index + s.step, g.mcp_paise_per_mwh, g.hydro_fsv_mw, g.scheduled_volume_mw
+        FROM gdam_price g
+        JOIN market_day d ON d.id = g.market_day_id AND d.resolution_minutes = 60
+        CROSS JOIN (VALUES (1), (2), (3)) AS s(step)
+        """
+    )
+    op.drop_constraint("ck_market_day_resolution", "market_day", type_="check")
+    op.drop_column("market_day", "resolution_minutes")